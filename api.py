@@ -0,0 +1,278 @@
+"""
+======================================================
+ API — Servicio HTTP de sólo lectura sobre el dataset
+ WSGI de la librería estándar, ETags por contenido y
+ caché de respuestas en proceso.
+======================================================
+
+    python api.py --port 8502
+    curl -i localhost:8502/series/DIGITAL
+    curl -i localhost:8502/hist?from=2010&to=2020 -H 'If-None-Match: "…"'   # → 304
+
+Rutas (GET/HEAD):
+
+    /                 índice de rutas y versión del dataset
+    /hist             histórico 1995-2025            ?from=&to=
+    /full             histórico + proyección 2031    ?from=&to=
+    /media            medios y columnas disponibles
+    /series/<col>     AÑO, <col> y PROYECCION de una columna
+    /stats            estadística descriptiva         ?from=&to=
+    /projections      sólo los años proyectados
+
+Todas aceptan ?format=json (por defecto, registros); las tabulares,
+también ?format=arrow (stream IPC de Arrow). La ETag combina el hash del
+CSV fuente con la ruta y los parámetros normalizados (los que la ruta no
+usa se ignoran). La ruta, la columna y los parámetros se validan antes
+de comparar ETags: un If-None-Match vigente responde 304 sin tocar el
+dataset, pero nunca tapa un 404 o un 400. Si el CSV cambia, el watcher publica la nueva
+versión y todas las ETags cambian con ella. Para pruebas, request()
+llama a la app en proceso sin abrir sockets.
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import sys
+import threading
+from collections import OrderedDict
+from urllib.parse import parse_qs, unquote
+
+from engine import DATA_PATH, MEDIOS, PROJ_COLS, describe_media, descriptive_stats, year_range
+import store
+from telemetry import count, span
+from watcher import DatasetWatcher
+
+CONTENT_TYPES = {
+    "json":  "application/json; charset=utf-8",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+CACHE_CONTROL = "public, no-cache"        # siempre revalidar: el 304 es casi gratis
+_CACHE_MAX = 512
+
+# Parámetros de query que acepta cada ruta (fuera de format); los demás se
+# descartan antes de la ETag, así que no crean entradas nuevas en la caché
+ROUTE_PARAMS = {
+    "":            (),
+    "hist":        ("from", "to"),
+    "full":        ("from", "to"),
+    "media":       (),
+    "series":      ("from", "to"),
+    "stats":       ("from", "to"),
+    "projections": (),
+}
+TABULAR = {"hist", "full", "series", "stats", "projections"}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# ─────────────────────────────────────────
+# SERIALIZACIÓN
+# ─────────────────────────────────────────
+def _json_bytes(obj):
+    if hasattr(obj, "to_json"):
+        return obj.to_json(orient="records", force_ascii=False, double_precision=10).encode()
+    return json.dumps(obj, ensure_ascii=False).encode()
+
+
+def _arrow_bytes(df):
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+
+def _year_params(query):
+    try:
+        lo = int(query.get("from", -10**9))
+        hi = int(query.get("to", 10**9))
+    except ValueError:
+        raise HTTPError(400, "from/to deben ser años enteros")
+    if lo > hi:
+        raise HTTPError(400, "from debe ser menor o igual que to")
+    return lo, hi
+
+
+# ─────────────────────────────────────────
+# APLICACIÓN WSGI
+# ─────────────────────────────────────────
+class DataAPI:
+    """App WSGI sobre el dataset compartido; watch=True recarga si cambia el CSV."""
+
+    def __init__(self, path=DATA_PATH, cache_dir=store.CACHE_DIR, watch=False):
+        self.watcher = DatasetWatcher(path, cache_dir)
+        if watch:
+            self.watcher.start()
+        self._cache = OrderedDict()          # etag → (content-type, body)
+        self._lock  = threading.Lock()
+        self.routes = {
+            "":            self.index,
+            "hist":        self.hist,
+            "full":        self.full,
+            "media":       self.media,
+            "series":      self.series,
+            "stats":       self.stats,
+            "projections": self.projections,
+        }
+
+    # ── endpoints: reciben el snapshot del request; devuelven un DataFrame o un objeto JSON ──
+    def index(self, snap, query, *_):
+        return {"dataset": snap.version, "rows_hist": len(snap.df_hist), "rows_full": len(snap.df_full),
+                "routes": sorted(f"/{r}" for r in self.routes)}
+
+    def hist(self, snap, query, *_):
+        return year_range(snap.df_hist, _year_params(query))
+
+    def full(self, snap, query, *_):
+        return year_range(snap.df_full, _year_params(query))
+
+    def media(self, snap, query, *_):
+        return {"media": MEDIOS, "projected": PROJ_COLS,
+                "columns": [c for c in snap.df_full.columns if c not in ("AÑO", "PROYECCION")]}
+
+    def series(self, snap, query, column=None):
+        return year_range(snap.df_full, _year_params(query))[["AÑO", column, "PROYECCION"]]
+
+    def stats(self, snap, query, *_):
+        df_stat = year_range(snap.df_hist, _year_params(query))[MEDIOS].dropna()
+        if df_stat.empty:
+            raise HTTPError(404, "Sin datos en el rango pedido")
+        return descriptive_stats(describe_media(df_stat)).rename_axis("MEDIO").reset_index()
+
+    def projections(self, snap, query, *_):
+        df = snap.df_full[snap.df_full["PROYECCION"] == True]
+        return df[["AÑO"] + PROJ_COLS]
+
+    # ── validación: antes de la ETag, así un If-None-Match no tapa un 404/400 ──
+    def validate(self, snap, route, arg, query, fmt):
+        """Query normalizada de la ruta (sólo sus parámetros); HTTPError si el request no es válido."""
+        if route not in self.routes:
+            raise HTTPError(404, f"Ruta desconocida: /{route}")
+        if fmt not in CONTENT_TYPES:
+            raise HTTPError(400, f"format debe ser uno de: {', '.join(CONTENT_TYPES)}")
+        if fmt == "arrow" and route not in TABULAR:
+            raise HTTPError(406, "format=arrow sólo aplica a rutas tabulares")
+        if route == "series":
+            if not arg or arg in ("AÑO", "PROYECCION") or arg not in snap.df_full.columns:
+                raise HTTPError(404, f"Columna desconocida: {arg!r} (ver /media)")
+        elif arg is not None:
+            raise HTTPError(404, f"Ruta desconocida: /{route}/{arg}")
+        query = {k: v for k, v in query.items() if k in ROUTE_PARAMS[route]}
+        if query:
+            lo, hi = _year_params(query)
+            query = {k: str(lo if k == "from" else hi) for k in query}     # "02010" y "2010": misma ETag
+        return query
+
+    # ── caché y ETags ──
+    def etag(self, version, route, arg, query, fmt):
+        key = "\x1f".join([version, route, arg or "", fmt] +
+                          [f"{k}={v}" for k, v in sorted(query.items())])
+        return '"' + hashlib.sha256(key.encode()).hexdigest()[:20] + '"'
+
+    def respond(self, snap, route, arg, query, fmt, tag):
+        """(content-type, body) desde la caché o calculado."""
+        with self._lock:
+            if tag in self._cache:
+                self._cache.move_to_end(tag)
+                count("api_cache_hits", route=route or "index")
+                return self._cache[tag]
+        with span(f"api.{route or 'index'}"):
+            data = self.routes[route](snap, query, arg)
+            body = _arrow_bytes(data) if fmt == "arrow" else _json_bytes(data)
+        count("api_cache_misses", route=route or "index")
+        entry = (CONTENT_TYPES[fmt], body)
+        with self._lock:
+            self._cache[tag] = entry
+            while len(self._cache) > _CACHE_MAX:
+                self._cache.popitem(last=False)
+        return entry
+
+    def __call__(self, environ, start_response):
+        method = environ.get("REQUEST_METHOD", "GET")
+        parts = unquote(environ.get("PATH_INFO", "/")).strip("/").split("/", 1)
+        route, arg = parts[0], (parts[1] if len(parts) > 1 else None)
+        query = {k: v[-1] for k, v in parse_qs(environ.get("QUERY_STRING", "")).items()}
+        fmt = query.pop("format", "json")
+        try:
+            if method not in ("GET", "HEAD"):
+                raise HTTPError(405, "Sólo GET y HEAD")
+            snap = self.watcher.current()
+            query = self.validate(snap, route, arg, query, fmt)
+            tag = self.etag(snap.version, route, arg, query, fmt)
+            headers = [("ETag", tag), ("Cache-Control", CACHE_CONTROL)]
+            # Request ya validado y la ETag no depende de los datos: un 304 no consulta ni la caché
+            if _etag_matches(environ.get("HTTP_IF_NONE_MATCH"), tag):
+                count("api_not_modified", route=route or "index")
+                start_response("304 Not Modified", headers)
+                return []
+            ctype, body = self.respond(snap, route, arg, query, fmt, tag)
+        except HTTPError as e:
+            body = _json_bytes({"error": str(e)})
+            headers = [("Content-Type", CONTENT_TYPES["json"]), ("Content-Length", str(len(body)))]
+            if e.status == 405:
+                headers.append(("Allow", "GET, HEAD"))
+            start_response(f"{e.status} {_REASONS[e.status]}", headers)
+            return [body]
+        headers += [("Content-Type", ctype), ("Content-Length", str(len(body)))]
+        start_response("200 OK", headers)
+        return [] if method == "HEAD" else [body]
+
+
+_REASONS = {400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 406: "Not Acceptable"}
+
+
+def _etag_matches(header, tag):
+    if not header:
+        return False
+    candidates = [t.strip().removeprefix("W/") for t in header.split(",")]
+    return "*" in candidates or tag in candidates
+
+
+# ─────────────────────────────────────────
+# CLIENTE LOCAL Y SERVIDOR
+# ─────────────────────────────────────────
+def request(app, path, headers=None, method="GET"):
+    """Llama a la app en proceso: devuelve (status:int, headers:dict, body:bytes)."""
+    from wsgiref.util import setup_testing_defaults
+
+    path, _, qs = path.partition("?")
+    environ = {"REQUEST_METHOD": method, "PATH_INFO": path, "QUERY_STRING": qs}
+    for k, v in (headers or {}).items():
+        environ["HTTP_" + k.upper().replace("-", "_")] = v
+    setup_testing_defaults(environ)
+    out = {}
+    def start_response(status, hdrs):
+        out["status"], out["headers"] = int(status.split()[0]), dict(hdrs)
+    body = b"".join(app(environ, start_response))
+    return out["status"], out["headers"], body
+
+
+def main(argv=None):
+    from socketserver import ThreadingMixIn
+    from wsgiref.simple_server import WSGIServer, make_server
+
+    class ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+        daemon_threads = True
+
+    p = argparse.ArgumentParser(description="API HTTP de sólo lectura sobre el dataset del dashboard.")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8502)
+    p.add_argument("--data", default=DATA_PATH)
+    args = p.parse_args(argv)
+
+    app = DataAPI(args.data, watch=True)
+    with make_server(args.host, args.port, app, server_class=ThreadingWSGIServer) as httpd:
+        print(f"API en http://{args.host}:{args.port}/  (dataset {app.watcher.current().version})")
+        httpd.serve_forever()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
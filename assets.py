@@ -0,0 +1,144 @@
+"""
+======================================================
+ ASSETS — QR, hoja de estilos y fuentes como archivos
+ estáticos con huella de contenido, publicados una vez
+ por proceso y referenciados desde la página.
+======================================================
+
+    import assets
+    page = assets.get()                  # una vez por proceso (thread-safe)
+    st.markdown(page.head, unsafe_allow_html=True)     # <link rel="stylesheet" href="app/static/app.<hash>.css">
+    content.hero_html(page.qr_src)                      # <img src="app/static/qr_linkedin.<hash>.png">
+
+build() escribe en static/ (la carpeta que Streamlit sirve en app/static/
+con server.enableStaticServing, ver .streamlit/config.toml):
+
+    static/app.<sha[:10]>.css           content.STYLES + @font-face
+    static/qr_linkedin.<sha[:10]>.png   el QR de la firma
+    static/DMSans-Regular.<sha[:10]>.woff2 …   fuentes de fonts/, si están
+
+El nombre cambia con el contenido, así que cada URL es inmutable. La
+página sólo lleva referencias de ~100 bytes en vez del CSS y dos copias
+del QR en base64 en cada rerun, y el PNG ya no se lee del disco en cada
+rerun.
+
+Cabeceras de caché: la ruta app/static de `streamlit run` responde sin
+Cache-Control y no ofrece gancho para agregarlo desde el proceso. Que
+el navegador no revalide los archivos con huella depende del proxy
+delante del servidor, que debe responder app/static/*.<hash>.* con
+`Cache-Control: public, max-age=31536000, immutable` (static_site.py
+publica los mismos nombres para un hosting estático).
+
+Fuentes: los .woff2 de DM Sans y DM Serif Display (licencia OFL) que
+estén en fonts/ se publican con @font-face locales y font-display: swap.
+fonts/ no viene en el repositorio; sin esos archivos la hoja no carga
+fuentes remotas y se usan las de respaldo (sans-serif, serif), sin
+ninguna petición a Google Fonts que bloquee el render. Si static/ no se
+puede escribir, inline() arma la página embebida como antes (con el
+@import de Google Fonts) para no romperla.
+"""
+
+import hashlib
+import os
+import threading
+from typing import NamedTuple
+
+import content
+
+BASE_DIR   = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(BASE_DIR, "static")
+FONTS_DIR  = os.path.join(BASE_DIR, "fonts")
+URL_PREFIX = "app/static"
+
+# (familia, peso, archivo en fonts/)
+FONT_FACES = [
+    ("DM Sans",          300, "DMSans-Light.woff2"),
+    ("DM Sans",          400, "DMSans-Regular.woff2"),
+    ("DM Sans",          500, "DMSans-Medium.woff2"),
+    ("DM Sans",          700, "DMSans-Bold.woff2"),
+    ("DM Serif Display", 400, "DMSerifDisplay-Regular.woff2"),
+]
+
+
+class PageAssets(NamedTuple):
+    head: str           # fragmento para el inicio de la página (referencia a la hoja)
+    css_href: str
+    qr_src: str         # URL o data URI del QR; "" si no hay imagen
+    fonts: tuple        # archivos de fuente publicados
+
+
+def fingerprinted(name, data):
+    """'app.css' + contenido → 'app.<sha256[:10]>.css'."""
+    stem, ext = os.path.splitext(name)
+    return f"{stem}.{hashlib.sha256(data).hexdigest()[:10]}{ext}"
+
+
+def publish(name, data, out_dir=STATIC_DIR):
+    """Escribe data con nombre con huella (atómico, sólo si no existe); devuelve el nombre.
+
+    Con open() y no mkstemp: el archivo respeta el umask (0644 con 0022) y
+    un proxy o CDN con otro usuario puede leerlo.
+    """
+    final = fingerprinted(name, data)
+    path = os.path.join(out_dir, final)
+    if not os.path.exists(path):
+        os.makedirs(out_dir, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    return final
+
+
+def _read(path):
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def font_css(font_urls):
+    """@font-face de las fuentes locales publicadas; sin ninguna, nada (fuentes de respaldo)."""
+    return "".join(
+        f"@font-face {{ font-family: '{family}'; font-weight: {weight}; font-style: normal; "
+        f"font-display: swap; src: url('{font_urls[fname]}') format('woff2'); }}\n"
+        for family, weight, fname in FONT_FACES if fname in font_urls)
+
+
+def build(out_dir=STATIC_DIR, url_prefix=URL_PREFIX):
+    """Publica fuentes, hoja de estilos y QR en out_dir → PageAssets con sus URLs."""
+    fonts = {}
+    for _, _, fname in FONT_FACES:
+        data = _read(os.path.join(FONTS_DIR, fname))
+        if data is not None:
+            fonts[fname] = publish(fname, data, out_dir)      # relativa a la hoja: misma carpeta
+    css = font_css(fonts) + content.STYLES
+    css_href = f"{url_prefix}/{publish('app.css', css.encode(), out_dir)}"
+    qr = _read(content.QR_PATH)
+    qr_src = f"{url_prefix}/{publish(os.path.basename(content.QR_PATH), qr, out_dir)}" if qr else ""
+    head = f'<link rel="stylesheet" href="{css_href}">'
+    return PageAssets(head, css_href, qr_src, tuple(fonts.values()))
+
+
+def inline():
+    """Lo mismo embebido en la página: CSS en <style> y QR en data URI (un solo HTML)."""
+    qr_b64 = content.get_qr_b64()
+    return PageAssets(content.CSS, "", f"data:image/png;base64,{qr_b64}" if qr_b64 else "", ())
+
+
+_assets = None
+_lock   = threading.Lock()
+
+
+def get():
+    """PageAssets del proceso: se construyen en el primer uso y se reutilizan en cada rerun."""
+    global _assets
+    if _assets is None:
+        with _lock:
+            if _assets is None:
+                try:
+                    _assets = build()
+                except OSError:              # disco de sólo lectura: página autocontenida
+                    _assets = inline()
+    return _assets
@@ -0,0 +1,331 @@
+"""
+======================================================
+ LOADTEST — Sesiones concurrentes sobre dashboard.py
+ Un servidor real de Streamlit y N clientes websocket
+ headless: latencia de rerun, throughput y memoria.
+======================================================
+
+Desde la raíz del repo:
+
+    python -m benchmarks.loadtest                              # 8 sesiones, 20 acciones c/u
+    python -m benchmarks.loadtest --sessions 1,4,16 --actions 30
+    python -m benchmarks.loadtest --save benchmarks/results/load.json
+    python -m benchmarks.loadtest --max-p95 500                # sale con 1 si p95 > 500 ms
+    python -m benchmarks.loadtest --url ws://host:8501 --pid 1234   # servidor ya levantado
+
+Sin --url arranca `streamlit run dashboard.py` en un puerto libre y lo
+detiene al final. Cada sesión es una conexión websocket propia que habla
+el protocolo del frontend (BackMsg rerun_script con el estado de los
+widgets, ForwardMsg hasta script_finished), así que las sesiones corren
+como en producción: hilos del mismo servidor que comparten GIL y
+st.cache_resource. AppTest no sirve aquí: cada run instala un Runtime
+global del proceso y dos AppTest concurrentes se pisan.
+
+Tras una primera carga, cada sesión repite acciones al azar (semilla por
+sesión) y mide cada rerun:
+
+    yr_range   mueve el rango de años
+    medios     cambia la selección de medios
+    chapter    salta a otro de los seis capítulos
+    year_snap  va al capítulo 2 y cambia el año del corte
+
+El JSON trae p50/p95/p99 por acción y en total, reruns por segundo y el
+RSS del servidor: antes de abrir sesiones, tras la primera carga de
+todas (→ MB por sesión) y al final (→ crecimiento durante las acciones,
+que debería ser ~0 con las cachés llenas).
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DASHBOARD = os.path.join(ROOT, "dashboard.py")
+PERCENTILES = (50, 95, 99)
+YEAR_MIN, YEAR_MAX = 1995, 2025
+
+
+def rss_mb(pid):
+    """RSS de un proceso en MB (Linux, /proc); None si no se puede leer."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, TypeError):
+        return None
+
+
+def summarize(latencies):
+    if not latencies:
+        return {"n": 0}
+    arr = np.asarray(latencies) * 1e3
+    out = {f"p{p}": float(np.percentile(arr, p)) for p in PERCENTILES}
+    return out | {"mean": float(arr.mean()), "max": float(arr.max()), "n": len(arr)}
+
+
+# ─────────────────────────────────────────
+# SERVIDOR
+# ─────────────────────────────────────────
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(timeout=60):
+    """`streamlit run dashboard.py` headless en un puerto libre → (proceso, url ws)."""
+    port = _free_port()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", DASHBOARD, "--server.headless", "true",
+         "--server.port", str(port), "--server.fileWatcherType", "none",
+         "--browser.gatherUsageStats", "false"],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"streamlit terminó al arrancar (código {proc.returncode})")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1):
+                return proc, f"ws://127.0.0.1:{port}"
+        except OSError:
+            time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError(f"streamlit no respondió en {timeout} s")
+
+
+# ─────────────────────────────────────────
+# CLIENTE DE UNA SESIÓN
+# ─────────────────────────────────────────
+class Session:
+    """Una pestaña del navegador: reruns con el estado de los widgets que ya cambió."""
+
+    def __init__(self, ws):
+        self.ws      = ws
+        self.widgets = {}        # etiqueta → (tipo, proto) del último rerun
+        self.states  = {}        # etiqueta → WidgetState enviado
+
+    async def rerun(self):
+        """Envía rerun_script y espera script_finished → (segundos, error o None)."""
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        msg = BackMsg()
+        msg.rerun_script.query_string = ""
+        msg.rerun_script.page_script_hash = ""
+        msg.rerun_script.widget_states.widgets.extend(self.states.values())
+        t0 = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+        widgets, error = {}, None
+        while True:
+            fm = ForwardMsg()
+            fm.ParseFromString(await self.ws.recv())
+            kind = fm.WhichOneof("type")
+            if kind == "delta" and fm.delta.WhichOneof("type") == "new_element":
+                el = fm.delta.new_element
+                name = el.WhichOneof("type")
+                proto = getattr(el, name)
+                if name == "exception":
+                    error = error or f"{proto.type}: {proto.message}"
+                elif getattr(proto, "label", None) and getattr(proto, "id", None):
+                    widgets[proto.label] = (name, proto)
+            elif kind == "script_finished":
+                self.widgets = widgets
+                return time.perf_counter() - t0, error
+
+    def set(self, label, field, value):
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        state = WidgetState(id=self.widgets[label][1].id)
+        if field.endswith("array_value"):
+            getattr(state, field).data.extend(value)
+        else:
+            setattr(state, field, value)
+        self.states[label] = state
+
+    def options(self, label):
+        return list(self.widgets[label][1].options)
+
+
+# ─────────────────────────────────────────
+# ACCIONES (preparan el estado; el rerun se mide aparte)
+# ─────────────────────────────────────────
+async def act_yr_range(s, rng):
+    lo = rng.randint(YEAR_MIN, YEAR_MAX - 5)
+    s.set("Rango de años", "double_array_value", [lo, rng.randint(lo + 3, YEAR_MAX)])
+    s.states.pop("Seleccione el año", None)          # el corte puede quedar fuera del rango
+
+
+async def act_medios(s, rng):
+    opts = s.options("Medios para gráficas")
+    s.set("Medios para gráficas", "string_array_value", rng.sample(opts, rng.randint(1, len(opts))))
+
+
+async def act_chapter(s, rng):
+    current = s.states.get("Capítulo")
+    opts = [o for o in s.options("Capítulo") if current is None or o != current.string_value]
+    s.set("Capítulo", "string_value", rng.choice(opts))
+
+
+async def act_year_snap(s, rng):
+    if "Seleccione el año" not in s.widgets:            # fuera del capítulo 2: ir primero
+        s.set("Capítulo", "string_value", next(o for o in s.options("Capítulo") if o.startswith("2")))
+        await s.rerun()
+    s.set("Seleccione el año", "string_array_value", [rng.choice(s.options("Seleccione el año"))])
+
+
+ACTIONS = {
+    "yr_range":  act_yr_range,
+    "medios":    act_medios,
+    "chapter":   act_chapter,
+    "year_snap": act_year_snap,
+}
+
+
+async def session(url, idx, args, loaded, go):
+    """Primera carga, espera a las demás sesiones y luego args.actions reruns medidos."""
+    from websockets.asyncio.client import connect
+
+    rng = random.Random(args.seed * 1000 + idx)
+    records = []
+    async with connect(f"{url}/_stcore/stream", max_size=None, open_timeout=args.timeout) as ws:
+        s = Session(ws)
+        lat, err = await asyncio.wait_for(s.rerun(), args.timeout)
+        records.append(("first_load", lat, err))
+        loaded()
+        await go.wait()
+        for _ in range(args.actions):
+            name = rng.choice(list(ACTIONS))
+            try:
+                await ACTIONS[name](s, rng)
+                lat, err = await asyncio.wait_for(s.rerun(), args.timeout)
+            except (KeyError, StopIteration, asyncio.TimeoutError) as e:   # widget ausente, rerun colgado
+                lat, err = float("nan"), f"{type(e).__name__}: {e}"
+            records.append((name, lat, err))
+            if args.think:
+                await asyncio.sleep(rng.uniform(0, 2 * args.think))
+    return records
+
+
+# ─────────────────────────────────────────
+# UN NIVEL DE CONCURRENCIA
+# ─────────────────────────────────────────
+async def run_level(url, pid, n_sessions, args):
+    go, pending = asyncio.Event(), [n_sessions]
+    marks = {"start": rss_mb(pid)}
+
+    def loaded():
+        pending[0] -= 1
+        if pending[0] == 0:
+            marks["after_load"] = rss_mb(pid)
+            marks["t0"] = time.perf_counter()
+            go.set()
+
+    results = await asyncio.gather(*(session(url, i, args, loaded, go) for i in range(n_sessions)))
+    wall = time.perf_counter() - marks["t0"]
+    marks["end"] = rss_mb(pid)
+    records = [r for rs in results for r in rs]
+
+    ok = [(name, lat) for name, lat, err in records if err is None and name != "first_load"]
+    by_action = {name: summarize([lat for n, lat in ok if n == name]) for name in ACTIONS}
+    by_action["first_load"] = summarize([lat for n, lat, err in records if n == "first_load" and err is None])
+    rss = None
+    if None not in (marks["start"], marks["after_load"], marks["end"]):
+        rss = {"start": marks["start"], "after_load": marks["after_load"], "end": marks["end"],
+               "per_session": (marks["after_load"] - marks["start"]) / n_sessions,
+               "growth": marks["end"] - marks["after_load"]}
+    return {
+        "sessions":       n_sessions,
+        "reruns":         len(ok),
+        "errors":         sum(err is not None for _, _, err in records),
+        "error_samples":  sorted({err for _, _, err in records if err})[:5],
+        "wall_s":         wall,
+        "throughput_rps": len(ok) / wall if wall else 0.0,
+        "latency_ms":     summarize([lat for _, lat in ok]),
+        "by_action":      by_action,
+        "rss_mb":         rss,
+    }
+
+
+async def run_async(url, pid, args):
+    levels = [int(n) for n in str(args.sessions).split(",")]
+    rss0 = rss_mb(pid)
+    t0 = time.perf_counter()
+    warm = await run_level(url, pid, 1, argparse.Namespace(**{**vars(args), "actions": 0}))
+    warmup = {"s": time.perf_counter() - t0, "error_samples": warm["error_samples"],
+              "rss_mb": (rss_mb(pid) - rss0) if rss0 is not None else None}
+    results = []
+    for n in levels:
+        results.append(await run_level(url, pid, n, args))
+        if args.verbose:
+            r = results[-1]
+            print(f"  {n:>3} sesiones  p95 {r['latency_ms'].get('p95', float('nan')):8.1f} ms  "
+                  f"{r['throughput_rps']:6.1f} reruns/s  errores {r['errors']}", file=sys.stderr)
+    return warmup, results
+
+
+def run(args):
+    proc = None
+    url, pid = args.url, args.pid
+    if url is None:
+        proc, url = start_server(args.timeout)
+        pid = proc.pid
+    try:
+        warmup, levels = asyncio.run(run_async(url.rstrip("/"), pid, args))
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait(10)
+    return {
+        "meta": {"python": platform.python_version(), "platform": platform.platform(),
+                 "cpus": os.cpu_count(), "url": url, "actions": args.actions,
+                 "think_s": args.think, "seed": args.seed, "time": time.strftime("%Y-%m-%dT%H:%M:%S")},
+        "warmup": warmup,            # primera sesión con cachés frías, fuera de la medición
+        "levels": levels,
+    }
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Prueba de carga headless del dashboard (clientes websocket).")
+    p.add_argument("--sessions", default="8", help="sesiones concurrentes; varias separadas por coma")
+    p.add_argument("--actions", type=int, default=20, help="reruns medidos por sesión")
+    p.add_argument("--think", type=float, default=0.0, help="pausa media entre acciones (s)")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--timeout", type=float, default=120, help="tiempo máximo de un rerun (s)")
+    p.add_argument("--url", help="servidor ya levantado (ws://host:puerto); por defecto arranca uno")
+    p.add_argument("--pid", type=int, help="PID del servidor de --url, para medir su RSS")
+    p.add_argument("--save", help="guardar resultados JSON en esta ruta")
+    p.add_argument("--max-p95", type=float, help="falla (código 1) si el p95 de algún nivel supera estos ms")
+    p.add_argument("-v", "--verbose", action="store_true")
+    args = p.parse_args(argv)
+
+    out = run(args)
+    text = json.dumps(out, ensure_ascii=False, indent=1)
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, "w", encoding="utf-8") as f:
+            f.write(text)
+    print(text)
+
+    errors = sum(lv["errors"] for lv in out["levels"])
+    slow = [lv["sessions"] for lv in out["levels"]
+            if args.max_p95 is not None and lv["latency_ms"].get("p95", 0) > args.max_p95]
+    if errors:
+        print(f"{errors} reruns con error", file=sys.stderr)
+    if slow:
+        print(f"p95 > {args.max_p95} ms con {', '.join(map(str, slow))} sesiones", file=sys.stderr)
+    return 1 if errors or slow else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
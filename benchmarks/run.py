@@ -0,0 +1,251 @@
+"""
+======================================================
+ BENCHMARKS — Tiempos del pipeline y de los capítulos
+ Headless: no arranca Streamlit ni abre navegador.
+======================================================
+
+Desde la raíz del repo:
+
+    python -m benchmarks.run                                  # escala actual (31 años)
+    python -m benchmarks.run --granularity monthly --media 12 --markets 50
+    python -m benchmarks.run --save benchmarks/results/base.json
+    python -m benchmarks.run --baseline benchmarks/results/base.json --fail-on-regression
+
+Etapas medidas:
+
+    import.*      importación en frío de engine y charts (subproceso nuevo)
+    build.*       parseo CSV, build_dataset, caché columnar (fría / mmap) y,
+                  con --markets > 1, build.markets: todos los mercados desde
+                  el formato largo en el pool de procesos (--workers)
+    projections.* ajuste de tendencias por lotes sobre todas las series y
+                  projections.backtest: los modelos de forecast.py con
+                  backtesting con origen móvil (una vez, --workers)
+    prep.*        preparación de datos de cada capítulo (rango, cubo, estadística)
+    figures.*     construcción de cada figura (fig1a … fig6)
+    serialize.*   fig.to_json() de cada figura (y su tamaño en payload_bytes)
+
+build_dataset sigue fijado a un mercado anual 1995-2025, así que se mide
+sobre el agregado anual del primer mercado; los kernels genéricos
+(tendencias, cubo, estadística) y las figuras corren a la escala pedida.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synth import BASE_MEDIA, MACRO_COLS, make_dataset, media_names, series_matrix
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def timeit(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return {"min": min(times), "median": statistics.median(times), "repeat": repeat}
+
+
+def cold_import(module, repeat):
+    """Tiempo de `import module` en un intérprete nuevo, descontando el arranque vacío."""
+    def run(code):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True)
+        return time.perf_counter() - t0
+    base = min(run("pass") for _ in range(repeat))
+    times = [max(run(f"import {module}") - base, 0.0) for _ in range(repeat)]
+    return {"min": min(times), "median": statistics.median(times), "repeat": repeat}
+
+
+def chart_frame(df_one):
+    """df de un mercado con las columnas derivadas que esperan las figuras."""
+    import engine
+    df = df_one.copy()
+    if "PERIODO" in df.columns:
+        df["AÑO"] = df.pop("PERIODO")
+    return engine.add_derived(df.drop(columns=["MERCADO"], errors="ignore"))
+
+
+def run(args):
+    import engine, store, charts, trend, markets, forecast
+    from cube import MediaCube
+
+    results, sizes = {}, {}
+    r = args.repeat
+
+    def bench(name, fn, repeat=r):
+        results[name] = timeit(fn, repeat)
+        if args.verbose:
+            print(f"  {name:<28} {results[name]['median']*1e3:10.2f} ms", file=sys.stderr)
+
+    df = make_dataset(args.years, args.start, args.granularity, args.media, args.markets, args.seed)
+    names = media_names(args.media)
+
+    # ── import ──
+    if not args.skip_import:
+        for mod in ("engine", "charts"):
+            results[f"import.{mod}"] = cold_import(mod, max(r, 3))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # ── build ──
+        csv_path = os.path.join(tmp, "synthetic.csv")
+        df.to_csv(csv_path, index=False)
+        bench("build.csv_parse", lambda: pd.read_csv(csv_path))
+
+        # Agregado anual del primer mercado con el esquema exacto del CSV
+        first = df[df["MERCADO"] == df["MERCADO"].iloc[0]] if "MERCADO" in df.columns else df
+        agg = {c: "sum" for c in BASE_MEDIA + ["TOTAL_INV"]} | {c: "mean" for c in MACRO_COLS}
+        yearly = first.groupby("AÑO", as_index=False).agg(agg)
+        yearly = yearly[yearly["AÑO"].between(engine.YEAR_MIN, engine.YEAR_MAX)]
+        yearly_path = os.path.join(tmp, "yearly.csv")
+        yearly.to_csv(yearly_path, index=False)
+        bench("build.build_dataset", lambda: engine.build_dataset(yearly_path))
+
+        def store_cold():
+            cache = tempfile.mkdtemp(dir=tmp)
+            store.load_dataset(yearly_path, cache_dir=cache)
+        bench("build.store_cold", store_cold)
+        warm_cache = os.path.join(tmp, "warm")
+        store.load_dataset(yearly_path, cache_dir=warm_cache)
+        bench("build.store_warm", lambda: store.load_dataset(yearly_path, cache_dir=warm_cache))
+
+    if args.markets > 1:
+        df_long = markets.to_long(df[df["AÑO"] <= engine.YEAR_MAX])
+        bench("build.markets", lambda: markets.build_results(df_long, workers=args.workers))
+        results["build.markets"]["markets"] = args.markets
+
+    # ── projections ──
+    Y = series_matrix(df, names + ["TOTAL_INV"])
+    x = (df["PERIODO"] if "PERIODO" in df.columns else df["AÑO"]).to_numpy(float)[:len(Y)]
+    future = np.arange(x.max() + 1, x.max() + 7)
+    bench("projections.fit", lambda: trend.project_trends(x, Y, future, floor=0))
+    results["projections.fit"]["series"] = Y.shape[1]
+    cols = [f"S{i}" for i in range(Y.shape[1])]
+    bench("projections.backtest", lambda: forecast.fit_all(x, Y, cols, future, workers=args.workers), repeat=1)
+    results["projections.backtest"]["series"] = Y.shape[1]
+
+    # ── prep ──
+    df_c = chart_frame(first)
+    mid = (int(df_c["AÑO"].min()) + int(df_c["AÑO"].max())) // 2
+    yr = (int(df_c["AÑO"].min()) + 3, int(df_c["AÑO"].max()) - 3)
+    bench("prep.year_range", lambda: engine.year_range(df_c, yr))
+    bench("prep.cube_build", lambda: MediaCube.from_frame(df_c))
+    cube = MediaCube.from_frame(df_c)
+    def cube_queries():
+        cube.totals(yr); cube.means(yr); cube.shares(yr)
+        cube.snapshot(mid); cube.normalized_shares(yr); cube.increments(yr)
+    bench("prep.cube_queries", cube_queries)
+    bench("prep.describe", lambda: engine.describe_matrix(Y))
+    results["prep.describe"]["series"] = Y.shape[1]
+    bench("prep.correlation", lambda: engine.internet_tv_correlation(df_c))
+
+    # ── figures ──
+    df_v = engine.year_range(df_c, yr)
+    df_stat = df_v[engine.MEDIOS].dropna()
+    desc = engine.describe_media(df_stat)
+    df_full = pd.concat([df_c.assign(PROYECCION=False), engine.project(df_c)], ignore_index=True)
+    proj = df_full[df_full["PROYECCION"] == True]
+    df_corr, x_line, y_line, _ = engine.internet_tv_correlation(df_c)
+    builders = {
+        "fig1a": lambda: charts.fig_history_area(df_v, engine.MEDIOS),
+        "fig1b": lambda: charts.fig_market_lines(df_v),
+        "fig2a": lambda: charts.fig_share_normalized(cube.normalized_shares(yr)),
+        "fig2b": lambda: charts.fig_share_duel(df_v),
+        "fig2c": lambda: charts.fig_snapshot(cube.snapshot(mid), mid),
+        "fig3a": lambda: charts.fig_histogram(df_stat, "DIGITAL"),
+        "fig3b": lambda: charts.fig_boxplot(desc, df_stat),
+        "fig3c": lambda: charts.fig_means(cube.means_table(yr)),
+        "fig4a": lambda: charts.fig_yoy(df_v.dropna(subset=["VAR_YOY"])),
+        "fig4b": lambda: charts.fig_tv_waterfall(df_v["AÑO"].tolist(), cube.increments(yr).tolist()),
+        "fig5a": lambda: charts.fig_projection_total(df_c, proj),
+        "fig5b": lambda: charts.fig_projection_series(df_c, proj),
+        "fig5c": lambda: charts.fig_correlation(df_corr, x_line, y_line),
+        "fig6":  lambda: charts.fig_pib(df_c.dropna(subset=["PIB_PCT"])),
+    }
+    for name, build in builders.items():
+        bench(f"figures.{name}", build)
+        if not args.skip_serialize:
+            fig = build()
+            bench(f"serialize.{name}", fig.to_json)
+            sizes[name] = len(fig.to_json().encode())
+
+    return {
+        "meta": {
+            "years": args.years, "start": args.start, "granularity": args.granularity,
+            "media": args.media, "markets": args.markets, "rows": len(df), "seed": args.seed,
+            "python": platform.python_version(), "numpy": np.__version__, "pandas": pd.__version__,
+            "platform": platform.platform(), "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "stages": results,
+        "payload_bytes": sizes,
+    }
+
+
+def compare(current, baseline, threshold):
+    """Imprime la comparación contra la línea base; devuelve las etapas que empeoraron."""
+    regressions = []
+    print(f"{'etapa':<28} {'base ms':>10} {'actual ms':>10} {'ratio':>7}")
+    for name, cur in current["stages"].items():
+        base = baseline["stages"].get(name)
+        if base is None:
+            print(f"{name:<28} {'—':>10} {cur['median']*1e3:10.2f} {'nuevo':>7}")
+            continue
+        ratio = cur["median"] / base["median"] if base["median"] else float("inf")
+        flag = "  ▲" if ratio > threshold else ""
+        print(f"{name:<28} {base['median']*1e3:10.2f} {cur['median']*1e3:10.2f} {ratio:7.2f}{flag}")
+        if ratio > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Benchmarks headless del dashboard.")
+    p.add_argument("--years", type=int, default=31)
+    p.add_argument("--start", type=int, default=1995)
+    p.add_argument("--granularity", choices=["yearly","monthly","daily"], default="yearly")
+    p.add_argument("--media", type=int, default=7, help="número de medios (mínimo 7)")
+    p.add_argument("--markets", type=int, default=1)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--workers", type=int, default=None, help="procesos para build.markets y projections.backtest (1 = en línea)")
+    p.add_argument("--repeat", type=int, default=5)
+    p.add_argument("--save", help="guardar resultados JSON en esta ruta")
+    p.add_argument("--baseline", help="JSON de una corrida anterior para comparar")
+    p.add_argument("--threshold", type=float, default=1.25, help="ratio a partir del cual se marca regresión")
+    p.add_argument("--fail-on-regression", action="store_true")
+    p.add_argument("--skip-import", action="store_true")
+    p.add_argument("--skip-serialize", action="store_true")
+    p.add_argument("-v", "--verbose", action="store_true")
+    args = p.parse_args(argv)
+    if args.media < 7:
+        p.error("--media debe ser al menos 7 (los medios del esquema original)")
+
+    out = run(args)
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(out, f, ensure_ascii=False, indent=1)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(out, json.load(f), args.threshold)
+        if regressions and args.fail_on_regression:
+            print(f"Regresiones: {', '.join(regressions)}", file=sys.stderr)
+            return 1
+    else:
+        for name, st in out["stages"].items():
+            print(f"{name:<28} {st['median']*1e3:10.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
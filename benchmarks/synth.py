@@ -0,0 +1,67 @@
+"""
+======================================================
+ SYNTH — Generador de datos sintéticos escalables
+ Mismo esquema que cleaned_ad_data.csv, escalable en
+ años, granularidad, número de medios y de mercados.
+======================================================
+
+    from benchmarks.synth import make_dataset
+    df = make_dataset(years=31, granularity="monthly", media=12, markets=50)
+
+Con granularity="yearly" y markets=1 el resultado tiene exactamente las
+columnas del CSV original. Las granularidades finas añaden PERIODO (año
+fraccionario) y varios mercados añaden MERCADO.
+"""
+
+import numpy as np
+import pandas as pd
+
+BASE_MEDIA = ["TV REG Y LOCAL","REVISTAS","PUB EXTERIOR","PRENSA","RADIO","TV NACIONAL","DIGITAL"]
+MACRO_COLS = ["IPC","TRM Promedio","Penetración Internet (%)","Poblacion DANE"]
+PERIODS_PER_YEAR = {"yearly": 1, "monthly": 12, "daily": 365}
+
+
+def media_names(media):
+    extra = [f"MEDIO {i:02d}" for i in range(len(BASE_MEDIA) + 1, media + 1)]
+    return (BASE_MEDIA + extra)[:media] if media >= len(BASE_MEDIA) else BASE_MEDIA[:media]
+
+
+def make_dataset(years=31, start=1995, granularity="yearly", media=7, markets=1, seed=0):
+    ppy = PERIODS_PER_YEAR[granularity]
+    rng = np.random.default_rng(seed)
+    names = media_names(media)
+    T = years * ppy
+    t = np.arange(T) / ppy                                  # años transcurridos
+
+    frames = []
+    for k in range(markets):
+        scale  = rng.uniform(0.2, 5.0)
+        level  = rng.uniform(2e4, 3e5, size=len(names)) * scale / ppy
+        growth = rng.normal(0.04, 0.05, size=len(names))
+        noise  = rng.normal(0, 0.06, size=(T, len(names)))
+        values = level * np.exp(np.outer(t, growth) + noise)
+        if "DIGITAL" in names:                              # el digital arranca hacia 2008
+            j = names.index("DIGITAL")
+            values[:, j] *= 1 / (1 + np.exp(-(t - 13) * 0.6)) * 12
+
+        df = pd.DataFrame(values, columns=names)
+        df.insert(0, "AÑO", start + (np.arange(T) // ppy))
+        df["TOTAL_INV"] = df[names].sum(axis=1)
+        df["IPC"]              = np.clip(rng.normal(0.05, 0.03, T), 0.0, None)
+        df["TRM Promedio"]     = 900 * np.exp(0.05 * t + rng.normal(0, 0.03, T))
+        df["Penetración Internet (%)"] = 1 / (1 + np.exp(-(t - 18) * 0.3))
+        df["Poblacion DANE"]   = 3.6e7 * scale * (1 + 0.013) ** t
+        if ppy > 1:
+            df.insert(1, "PERIODO", start + t)
+        if markets > 1:
+            df.insert(0, "MERCADO", f"M{k:04d}")
+        frames.append(df)
+    return pd.concat(frames, ignore_index=True)
+
+
+def series_matrix(df, names):
+    """Matriz periodo × (mercado, medio) para los kernels por lotes."""
+    if "MERCADO" not in df.columns:
+        return df[names].to_numpy(float)
+    T = (df["MERCADO"] == df["MERCADO"].iloc[0]).sum()
+    return df[names].to_numpy(float).reshape(-1, T, len(names)).transpose(1, 0, 2).reshape(T, -1)
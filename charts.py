@@ -0,0 +1,344 @@
+"""
+======================================================
+ CHARTS — figuras Plotly de los seis capítulos
+ Cada función recibe datos ya preparados por engine.py
+ y devuelve un go.Figure listo para renderizar.
+======================================================
+
+Las series de tiempo (fig1a, fig1b, fig2a, fig2b, fig5a, fig5b) aceptan
+webgl=True y max_points=N: trazas Scattergl donde Plotly las soporta,
+reducción de puntos con downsample.thin() y valores en float32. Plotly ≥ 6
+envía los arrays NumPy como typed arrays binarios (base64), no como listas
+JSON de floats.
+"""
+
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+
+from downsample import thin
+
+# Paleta pastel para gráficas
+PLOT_BG  = "#F0F5FF"   # Azul hielo muy suave: fondo de gráfica
+PAPER_BG = "#F0F5FF"   # Igual para el lienzo exterior
+PALETTE  = ["#1D4ED8","#3B82F6","#10B981","#F59E0B","#6B7280","#94A3B8","#CBD5E1"]
+
+
+# ── helpers de render: SVG/WebGL y arrays compactos ──
+def _scatter(webgl):
+    return go.Scattergl if webgl else go.Scatter
+
+
+def _y(values, webgl):
+    arr = np.asarray(values)
+    return arr.astype(np.float32) if webgl and arr.dtype == np.float64 else arr
+
+
+# ── helper para layout uniforme ──
+def base_layout(fig, title="", xtitle="Año", ytitle="Inversión (M COP)"):
+    fig.update_layout(
+        title        = dict(text=title, font=dict(color="#0F172A", size=17, family="DM Sans")),
+        paper_bgcolor= PAPER_BG,
+        plot_bgcolor = PLOT_BG,
+        xaxis_title  = xtitle,
+        yaxis_title  = ytitle,
+        font         = dict(color="#0F172A", family="DM Sans"),  # Negro para todo el texto
+        legend       = dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1,
+                            font=dict(color="#0F172A")),
+        hovermode    = "x unified",
+    )
+    fig.update_xaxes(gridcolor="#DBEAFE", title_font=dict(color="#0F172A"), tickfont=dict(color="#0F172A"))
+    fig.update_yaxes(gridcolor="#DBEAFE", title_font=dict(color="#0F172A"), tickfont=dict(color="#0F172A"))
+    return fig
+
+
+# ════════════════════════════════════════════
+# CAPÍTULO 1  CONTEXTO HISTÓRICO
+# ════════════════════════════════════════════
+def fig_history_area(df_v, medios, webgl=False, max_points=None):
+    # Áreas apiladas: Scattergl no soporta stackgroup, sólo se reducen puntos
+    df_v = thin(df_v, medios, max_points)
+    if webgl:
+        df_v = df_v.astype({m: np.float32 for m in medios})
+    fig1a = px.area(df_v, x="AÑO", y=medios,
+                    title="Inversión histórica por medio (M COP)",
+                    color_discrete_sequence=PALETTE)
+    return base_layout(fig1a)
+
+
+def fig_market_lines(df_v, webgl=False, max_points=None):
+    Sc = _scatter(webgl)
+    df_t = thin(df_v, ["TOTAL_INV","TV_TOTAL","DIGITAL"], max_points)
+    fig1b = go.Figure()
+    fig1b.add_trace(Sc(x=df_t["AÑO"], y=_y(df_t["TOTAL_INV"], webgl), name="Total Mercado", line=dict(color="#0F172A", width=2)))
+    fig1b.add_trace(Sc(x=df_t["AÑO"], y=_y(df_t["TV_TOTAL"], webgl),  name="Televisión",   line=dict(color="#1D4ED8", width=4)))
+    fig1b.add_trace(Sc(x=df_t["AÑO"], y=_y(df_t["DIGITAL"], webgl),   name="Digital",      line=dict(color="#10B981", width=4)))
+    if 2020 in df_v["AÑO"].values:
+        fig1b.add_annotation(x=2020, y=df_v[df_v["AÑO"]==2020]["TOTAL_INV"].values[0]*1.06,
+                             text="Pandemia -6.9%", showarrow=True, arrowhead=2,
+                             bgcolor="#FEF9C3", font=dict(color="#92400E"))
+    return base_layout(fig1b, "Mercado Total vs TV vs Digital")
+
+
+# ════════════════════════════════════════════
+# CAPÍTULO 2  TENDENCIAS & MIX
+# ════════════════════════════════════════════
+def fig_share_normalized(df_norm, webgl=False, max_points=None):
+    # Apilado: siempre SVG, con puntos reducidos y float32 en modo WebGL
+    df_norm = thin(df_norm, ["TV_TOTAL","DIGITAL","TRADICIONAL"], max_points)
+    fig2a = go.Figure()
+    fig2a.add_trace(go.Scatter(x=df_norm["AÑO"], y=_y(df_norm["TV_TOTAL"], webgl),    stackgroup="one", name="TV",         fillcolor="rgba(29,78,216,0.55)",  line=dict(color="#1D4ED8")))
+    fig2a.add_trace(go.Scatter(x=df_norm["AÑO"], y=_y(df_norm["DIGITAL"], webgl),     stackgroup="one", name="Digital",    fillcolor="rgba(16,185,129,0.55)", line=dict(color="#10B981")))
+    fig2a.add_trace(go.Scatter(x=df_norm["AÑO"], y=_y(df_norm["TRADICIONAL"], webgl), stackgroup="one", name="Tradicional",fillcolor="rgba(148,163,184,0.45)",line=dict(color="#94A3B8")))
+    return base_layout(fig2a, "Share normalizado del Presupuesto (%)", ytitle="Share (%)")
+
+
+def fig_share_duel(df_v, webgl=False, max_points=None):
+    Sc = _scatter(webgl)
+    df_v = thin(df_v, ["TV_SHARE","DIG_SHARE"], max_points)
+    fig2b = go.Figure()
+    fig2b.add_trace(Sc(x=df_v["AÑO"], y=_y(df_v["TV_SHARE"]*100, webgl),  name="TV %",     fill="tozeroy", line=dict(color="#1D4ED8", width=3)))
+    fig2b.add_trace(Sc(x=df_v["AÑO"], y=_y(df_v["DIG_SHARE"]*100, webgl), name="Digital %",fill="tozeroy", line=dict(color="#10B981", width=3)))
+    return base_layout(fig2b, "Duelo por el Share: TV vs Digital (%)", ytitle="% del presupuesto")
+
+
+def fig_snapshot(snap_data, year_snap):
+    fig2c = go.Figure(go.Bar(
+        x=snap_data["Medio"], y=snap_data["Inversión"],
+        marker_color=PALETTE,
+        text=snap_data["Inversión"].apply(lambda v: f"{v/1e3:.0f}K"),
+        textposition="outside"
+    ))
+    return base_layout(fig2c, f"Inversión por Medio — {year_snap}", xtitle="Medio")
+
+
+# ════════════════════════════════════════════
+# CAPÍTULO 3  ESTADÍSTICA DESCRIPTIVA
+# ════════════════════════════════════════════
+def fig_histogram(df_stat, var_hist):
+    fig3a = go.Figure(go.Histogram(x=df_stat[var_hist], nbinsx=15, marker_color="#3B82F6",
+                                    marker_line_color="white", marker_line_width=1.5))
+    return base_layout(fig3a, f"Distribución histórica — {var_hist}", xtitle=var_hist, ytitle="Frecuencia")
+
+
+def fig_boxplot(desc, df_stat):
+    """Cajas con cuartiles precalculados (engine.describe_media); sólo los outliers viajan como puntos."""
+    fig3b = go.Figure()
+    for i, m in enumerate(desc.index):
+        d, color = desc.loc[m], PALETTE[i % len(PALETTE)]
+        fig3b.add_trace(go.Box(
+            x=[m], name=m, q1=[d["25%"]], median=[d["50%"]], q3=[d["75%"]], mean=[d["mean"]],
+            lowerfence=[d["lowerfence"]], upperfence=[d["upperfence"]],
+            boxpoints=False, marker_color=color))
+        vals = df_stat[m].to_numpy()
+        out  = vals[(vals < d["lowerfence"]) | (vals > d["upperfence"])]
+        if out.size:
+            fig3b.add_trace(go.Scatter(x=[m] * out.size, y=out, mode="markers", name=m,
+                                       marker=dict(color=color, size=7, symbol="circle-open")))
+    base_layout(fig3b, "Volatilidad por Medio (Boxplot)", xtitle="Medio")
+    fig3b.update_layout(showlegend=False)
+    return fig3b
+
+
+def fig_means(means):
+    fig3c = go.Figure(go.Bar(
+        x=means["Medio"], y=means["Media"],
+        marker_color=PALETTE,
+        text=means["Media"].apply(lambda v: f"{v/1e3:.0f}K"), textposition="outside"
+    ))
+    return base_layout(fig3c, "Media histórica de inversión por medio", xtitle="Medio")
+
+
+# ════════════════════════════════════════════
+# CAPÍTULO 4  AÑO A AÑO
+# ════════════════════════════════════════════
+def fig_yoy(df_var):
+    bar_colors = ["#F87171" if v < 0 else "#60A5FA" for v in df_var["VAR_YOY"]]
+    fig4a = go.Figure(go.Bar(
+        x=df_var["AÑO"], y=df_var["VAR_YOY"],
+        marker_color=bar_colors,
+        text=[f"{v:.1f}%" for v in df_var["VAR_YOY"]], textposition="outside"
+    ))
+    for hito in [(2020,"Pandemia\n-6.9%"),(2021,"Rebote\n+47.5%"),(2016,"Crisis\nPetróleo")]:
+        y_val = df_var[df_var["AÑO"]==hito[0]]["VAR_YOY"]
+        if not y_val.empty:
+            fig4a.add_annotation(x=hito[0], y=y_val.values[0],
+                                  text=hito[1], showarrow=True, arrowhead=2,
+                                  bgcolor="#FEF9C3", font=dict(color="#78350F", size=11))
+    return base_layout(fig4a, "Variación Porcentual Anual de la Inversión Total (%)", ytitle="Variación (%)")
+
+
+def fig_tv_waterfall(years, increments):
+    fig4b = go.Figure(go.Waterfall(
+        x=list(years),
+        y=list(increments),
+        connector=dict(line=dict(color="#BFDBFE")),
+        increasing=dict(marker=dict(color="#60A5FA")),
+        decreasing=dict(marker=dict(color="#F87171")),
+    ))
+    return base_layout(fig4b, "Variación Incremental de TV por Año (Waterfall)")
+
+
+# ════════════════════════════════════════════
+# CAPÍTULO 5  PROYECCIONES
+# ════════════════════════════════════════════
+def _fan(fig, bands, col, rgb, name):
+    """Bandas de predicción anidadas (la más ancha primero), como áreas entre lower y upper."""
+    for lv in sorted(bands or {}, reverse=True):
+        lo, hi = bands[lv]
+        alpha = 0.12 + 0.25 * (1 - lv)
+        fig.add_trace(go.Scatter(x=hi["AÑO"], y=hi[col], mode="lines", line=dict(width=0),
+                                 legendgroup=f"{name}{lv}", showlegend=False, hoverinfo="skip"))
+        fig.add_trace(go.Scatter(x=lo["AÑO"], y=lo[col], mode="lines", line=dict(width=0),
+                                 fill="tonexty", fillcolor=f"rgba({rgb},{alpha:.2f})",
+                                 legendgroup=f"{name}{lv}", name=f"{name} {lv:.0%}",
+                                 customdata=hi[col], hovertemplate=f"{name} {lv:.0%}: "
+                                 "%{y:,.0f} – %{customdata:,.0f}<extra></extra>"))
+
+
+def _span(df_hist, future_years):
+    """(primer año, último histórico, último proyectado) del mercado, antes de reducir puntos."""
+    first, last = int(df_hist["AÑO"].min()), int(df_hist["AÑO"].max())
+    return first, last, (int(max(future_years)) if len(future_years) else last)
+
+
+def fig_projection_total(df_hist, proj_slice, webgl=False, max_points=None, bands=None):
+    first, last, end = _span(df_hist, proj_slice["AÑO"])
+    df_hist = thin(df_hist, ["TOTAL_INV"], max_points)
+    fig5a = go.Figure()
+    _fan(fig5a, bands, "TOTAL_INV", "59,130,246", "Intervalo")
+    fig5a.add_trace(_scatter(webgl)(x=df_hist["AÑO"], y=_y(df_hist["TOTAL_INV"], webgl),
+                                name="Histórico", mode="lines+markers", line=dict(color="#1D4ED8", width=3)))
+    fig5a.add_trace(go.Scatter(x=proj_slice["AÑO"], y=proj_slice["TOTAL_INV"],
+                                name="Proyección", mode="lines+markers",
+                                line=dict(color="#93C5FD", width=3, dash="dash"),
+                                marker=dict(symbol="diamond")))
+    fig5a.add_vrect(x0=last + 0.5, x1=end + 0.5, fillcolor="#DBEAFE", opacity=0.5,
+                    layer="below", annotation_text="Zona Proyección", annotation_position="top left")
+    return base_layout(fig5a, f"Regresión Lineal: Inversión Total {first} – {end}")
+
+
+def fig_projection_series(df_hist, proj_slice, webgl=False, max_points=None, bands=None):
+    Sc = _scatter(webgl)
+    _, last, end = _span(df_hist, proj_slice["AÑO"])
+    df_hist = thin(df_hist, ["TV_TOTAL","DIGITAL"], max_points)
+    fig5b = go.Figure()
+    _fan(fig5b, bands, "TV_TOTAL", "29,78,216", "TV")
+    _fan(fig5b, bands, "DIGITAL", "16,185,129", "Digital")
+    fig5b.add_trace(Sc(x=df_hist["AÑO"],     y=_y(df_hist["TV_TOTAL"], webgl), name="TV Histórico", line=dict(color="#1D4ED8", width=4)))
+    fig5b.add_trace(go.Scatter(x=proj_slice["AÑO"],  y=proj_slice["TV_TOTAL"], name="TV Proyectado", line=dict(color="#93C5FD", width=3, dash="dot"), marker=dict(symbol="diamond")))
+    fig5b.add_trace(Sc(x=df_hist["AÑO"],     y=_y(df_hist["DIGITAL"], webgl),  name="Digital Histórico", line=dict(color="#10B981", width=4)))
+    fig5b.add_trace(go.Scatter(x=proj_slice["AÑO"],  y=proj_slice["DIGITAL"],  name="Digital Proyectado",line=dict(color="#6EE7B7", width=3, dash="dot")))
+    fig5b.add_vrect(x0=last + 0.5, x1=end + 0.5, fillcolor="#F0FDF4", opacity=0.5, layer="below", annotation_text="Futuro")
+    return base_layout(fig5b, f"Series de Tiempo: Trayectorias TV y Digital al {end}")
+
+
+def fig_forecast_models(df_hist, forecasts, col, best, labels, webgl=False, max_points=None):
+    """Histórico de `col` y el pronóstico de cada modelo; el elegido por backtesting, en línea llena."""
+    _, last, end = _span(df_hist, next(iter(forecasts.values()), {"AÑO": []})["AÑO"])
+    df_hist = thin(df_hist, [col], max_points)
+    fig5d = go.Figure()
+    fig5d.add_trace(_scatter(webgl)(x=df_hist["AÑO"], y=_y(df_hist[col], webgl), name="Histórico",
+                                    line=dict(color="#0F172A", width=4)))
+    for color, (model, df_fc) in zip(PALETTE[1:], forecasts.items()):
+        chosen = model == best
+        fig5d.add_trace(go.Scatter(x=df_fc["AÑO"], y=df_fc[col],
+                                   name=labels.get(model, model) + (" ★" if chosen else ""),
+                                   line=dict(color=color, width=4 if chosen else 2,
+                                             dash=None if chosen else "dot")))
+    fig5d.add_vrect(x0=last + 0.5, x1=end + 0.5, fillcolor="#F0FDF4", opacity=0.5, layer="below", annotation_text="Futuro")
+    return base_layout(fig5d, f"Modelos de pronóstico: {col} (★ menor error en backtesting)")
+
+
+def fig_scenario_total(df_hist, sc, webgl=False, max_points=None):
+    """Histórico del total y el escenario Monte Carlo: mediana y bandas de cuantiles."""
+    df_hist = thin(df_hist, ["TOTAL_INV"], max_points)
+    fig5e = go.Figure()
+    _fan(fig5e, sc.bands, "TOTAL_INV", "245,158,11", "Escenario")
+    fig5e.add_trace(_scatter(webgl)(x=df_hist["AÑO"], y=_y(df_hist["TOTAL_INV"], webgl), name="Histórico",
+                                    line=dict(color="#0F172A", width=3)))
+    fig5e.add_trace(go.Scatter(x=sc.median["AÑO"], y=sc.median["TOTAL_INV"], name="Mediana",
+                               mode="lines+markers", line=dict(color="#F59E0B", width=3, dash="dash")))
+    return base_layout(fig5e, f"Escenario Monte Carlo: Inversión Total ({sc.n_paths:,} trayectorias)")
+
+
+def fig_scenario_shares(df_hist, sc, webgl=False, max_points=None):
+    """Share de TV y de digital: histórico y bandas del escenario, en %."""
+    Sc = _scatter(webgl)
+    pct = lambda d: d.assign(TV_SHARE=d["TV_SHARE"] * 100, DIG_SHARE=d["DIG_SHARE"] * 100)
+    bands = {lv: (pct(lo), pct(hi)) for lv, (lo, hi) in sc.bands.items()}
+    median = pct(sc.median)
+    df_hist = thin(df_hist, ["TV_SHARE","DIG_SHARE"], max_points)
+    fig5f = go.Figure()
+    _fan(fig5f, bands, "TV_SHARE", "29,78,216", "TV")
+    _fan(fig5f, bands, "DIG_SHARE", "16,185,129", "Digital")
+    fig5f.add_trace(Sc(x=df_hist["AÑO"], y=_y(df_hist["TV_SHARE"]*100, webgl),  name="TV %",      line=dict(color="#1D4ED8", width=3)))
+    fig5f.add_trace(Sc(x=df_hist["AÑO"], y=_y(df_hist["DIG_SHARE"]*100, webgl), name="Digital %", line=dict(color="#10B981", width=3)))
+    fig5f.add_trace(go.Scatter(x=median["AÑO"], y=median["TV_SHARE"],  name="TV % (mediana)",      line=dict(color="#93C5FD", width=3, dash="dot")))
+    fig5f.add_trace(go.Scatter(x=median["AÑO"], y=median["DIG_SHARE"], name="Digital % (mediana)", line=dict(color="#6EE7B7", width=3, dash="dot")))
+    return base_layout(fig5f, "Escenario Monte Carlo: Share TV vs Digital (%)", ytitle="% del presupuesto")
+
+
+def fig_correlation(df_corr, x_line, y_line):
+    fig5c = go.Figure()
+    fig5c.add_trace(go.Scatter(
+        x=df_corr["Penetración Internet (%)"], y=df_corr["TV_TOTAL"],
+        mode="markers+text",
+        text=df_corr["AÑO"].astype(int).astype(str), textposition="top center",
+        marker=dict(color="#1D4ED8", size=9), name="Cada año"))
+    fig5c.add_trace(go.Scatter(x=x_line, y=y_line, mode="lines",
+                                name="Tendencia", line=dict(color="#F59E0B", width=3, dash="dash")))
+    return base_layout(fig5c, "Correlación: Internet (%) vs Inversión TV",
+                       xtitle="Penetración Internet (%)", ytitle="Inversión TV (M COP)")
+
+
+def _corr_heatmap(fig, z, x, y, labels=True):
+    fig.add_trace(go.Heatmap(z=z, x=x, y=y, zmin=-1, zmax=1, colorscale="RdBu", reversescale=True,
+                             text=np.round(z, 2) if labels else None, texttemplate="%{text}" if labels else None,
+                             colorbar=dict(title="r"), hovertemplate="%{y} · %{x}: r = %{z:.2f}<extra></extra>"))
+    fig.update_yaxes(autorange="reversed")
+
+
+def fig_corr_matrix(matrix, yr_range, lag=0):
+    """Heatmap medio × indicador macro (r de Pearson, −1 a 1)."""
+    fig5g = go.Figure()
+    _corr_heatmap(fig5g, matrix.to_numpy(), list(matrix.columns), list(matrix.index))
+    base_layout(fig5g, f"Correlación {yr_range[0]}–{yr_range[1]} · rezago {lag}", xtitle="Indicador", ytitle="Medio")
+    fig5g.update_layout(hovermode="closest")
+    return fig5g
+
+
+def fig_corr_rolling(rolling, column, window=None):
+    """Heatmap medio × año final de la ventana: cómo cambia la correlación en el tiempo."""
+    rolling = rolling.dropna(axis=1, how="all")
+    fig5h = go.Figure()
+    _corr_heatmap(fig5h, rolling.to_numpy(), list(rolling.columns), list(rolling.index), labels=False)
+    span_txt = "ventana creciente" if window is None else f"ventanas de {window} años"
+    base_layout(fig5h, f"Correlación móvil con {column} — {span_txt}", xtitle="Año final de la ventana", ytitle="Medio")
+    fig5h.update_layout(hovermode="closest")
+    return fig5h
+
+
+# ════════════════════════════════════════════
+# CAPÍTULO 6  HALLAZGOS FINALES
+# ════════════════════════════════════════════
+def fig_pib(df_pib, market="Colombia"):
+    fig6 = go.Figure()
+    fig6.add_trace(go.Bar(x=df_pib["AÑO"], y=df_pib["TOTAL_INV"],
+                           name="Inversión Publicitaria (M COP)", marker_color="#BFDBFE"))
+    fig6.add_trace(go.Scatter(x=df_pib["AÑO"], y=df_pib["PIB_PCT"],
+                               name="Crecimiento PIB (%)", yaxis="y2",
+                               line=dict(color="#1D4ED8", width=3)))
+    fig6.update_layout(
+        title        = dict(text=f"Inversión Publicitaria vs Crecimiento del PIB en {market}",
+                            font=dict(color="#0F172A", size=17)),
+        paper_bgcolor= PAPER_BG,
+        plot_bgcolor = PLOT_BG,
+        font         = dict(color="#0F172A", family="DM Sans"),
+        yaxis        = dict(title="Inversión (M COP)", gridcolor="#DBEAFE",
+                            title_font=dict(color="#0F172A"), tickfont=dict(color="#0F172A")),
+        yaxis2       = dict(title="Crecimiento PIB (%)", overlaying="y", side="right", showgrid=False,
+                            title_font=dict(color="#0F172A"), tickfont=dict(color="#0F172A")),
+        legend       = dict(orientation="h", y=1.12, font=dict(color="#0F172A")),
+    )
+    return fig6
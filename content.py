@@ -0,0 +1,391 @@
+"""
+======================================================
+ CONTENT — Textos, estilos y firma del storytelling
+ Compartido por la página Streamlit (dashboard.py) y la
+ exportación estática (static_site.py).
+======================================================
+"""
+
+import base64
+import os
+import re
+import unicodedata
+
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+QR_PATH  = os.path.join(BASE_DIR, "qr_linkedin.png")
+
+PAGE_TITLE = "Inversión Publicitaria Colombia | Storytelling"
+
+# ─────────────────────────────────────────
+# CSS PREMIUM — light, contraste alto
+# ─────────────────────────────────────────
+# Reglas sin <style>: assets.py las publica como hoja de estilos con huella
+FONTS_URL = "https://fonts.googleapis.com/css2?family=DM+Sans:wght@300;400;500;700&family=DM+Serif+Display&display=swap"
+
+STYLES = """
+html, body, [class*="css"] {
+    font-family: 'DM Sans', sans-serif !important;
+    background-color: #ffffff !important;
+    color: #1E293B !important;
+}
+.stApp { background-color: #ffffff !important; }
+
+/* ── HERO ── */
+.hero {
+    background: linear-gradient(135deg, #1E3A8A 0%, #2563EB 65%, #60A5FA 100%);
+    color: white;
+    padding: 50px 40px 36px;
+    border-radius: 28px;
+    text-align: center;
+    margin-bottom: 36px;
+}
+.hero h1 {
+    font-family: 'DM Serif Display', serif;
+    font-size: 3rem;
+    margin-bottom: 10px;
+    letter-spacing: -0.02em;
+    color: white !important;
+}
+.hero p { font-size: 1.1rem; opacity: 0.9; color: white !important; }
+.hero-author {
+    margin-top: 26px;
+    padding-top: 22px;
+    border-top: 1px solid rgba(255,255,255,0.3);
+    display: flex;
+    align-items: center;
+    justify-content: center;
+    gap: 20px;
+    flex-wrap: wrap;
+}
+.hero-author-info { text-align: left; }
+.hero-author-name  { font-size: 1.2rem; font-weight: 700; color: white !important; }
+.hero-author-role  { font-size: 0.85rem; color: rgba(255,255,255,0.78); margin-top: 2px; }
+.hero-li-link {
+    background: rgba(255,255,255,0.18);
+    color: white !important;
+    text-decoration: none !important;
+    padding: 8px 18px;
+    border-radius: 30px;
+    font-weight: 600;
+    font-size: 0.9rem;
+    border: 1px solid rgba(255,255,255,0.4);
+}
+.hero-li-link:hover { background: rgba(255,255,255,0.30); }
+
+/* ── SECTION SEPARATORS ── */
+.section-label {
+    font-size: 0.75rem; font-weight: 700;
+    letter-spacing: 0.14em; text-transform: uppercase;
+    color: #2563EB; margin-bottom: 4px;
+}
+.section-title {
+    font-family: 'DM Serif Display', serif;
+    font-size: 2rem; color: #0F172A; margin-bottom: 8px;
+}
+
+/* ── KPI CARDS ── */
+div[data-testid="stMetric"] {
+    background: #EFF6FF !important;
+    border: 1.5px solid #BFDBFE !important;
+    border-radius: 18px !important;
+    padding: 20px 24px !important;
+}
+[data-testid="stMetricLabel"] > div { color: #1E40AF !important; font-weight: 600 !important; }
+[data-testid="stMetricValue"] > div { color: #0F172A !important; font-size: 1.9rem !important; font-weight: 800 !important; }
+[data-testid="stMetricDelta"] > div { font-weight: 600 !important; }
+
+/* ── NARRATIVE CARD ── */
+.narr {
+    background: #F8FAFC; border-left: 6px solid #2563EB;
+    padding: 22px 26px; border-radius: 14px;
+    line-height: 1.7; color: #334155;
+    margin: 16px 0 28px; font-size: 1.05rem;
+}
+
+/* ── TABS — texto siempre visible ── */
+.stTabs [data-baseweb="tab-list"] {
+    gap: 6px; background: #DBEAFE;
+    padding: 6px; border-radius: 14px;
+}
+.stTabs [data-baseweb="tab"] {
+    border-radius: 10px; padding: 8px 18px;
+    color: #1E40AF !important;
+    font-weight: 700 !important;
+    background: transparent;
+}
+.stTabs [aria-selected="true"] {
+    background-color: #1E40AF !important;
+    color: #ffffff !important;
+    box-shadow: 0 2px 8px rgba(30,64,175,0.3);
+}
+
+/* ── SIDEBAR — texto siempre oscuro ── */
+[data-testid="stSidebar"] { background-color: #EFF6FF !important; }
+[data-testid="stSidebar"] p,
+[data-testid="stSidebar"] span,
+[data-testid="stSidebar"] label,
+[data-testid="stSidebar"] div { color: #1E293B !important; font-weight: 500; }
+[data-testid="stSidebar"] h1,
+[data-testid="stSidebar"] h2,
+[data-testid="stSidebar"] h3 { color: #1E40AF !important; font-weight: 700 !important; }
+[data-baseweb="tag"] { background-color: #BFDBFE !important; }
+[data-baseweb="tag"] span { color: #1E3A8A !important; }
+
+/* ── MULTISELECT — contenedor de tags (recuadro negro → blanco) ── */
+[data-baseweb="select"] > div,
+[data-baseweb="base-input"],
+div[data-baseweb="select"] div[role="combobox"],
+div[class*="multiSelect"] {
+    background-color: #FFFFFF !important;
+    border: 1.5px solid #BFDBFE !important;
+    border-radius: 10px !important;
+    color: #1E293B !important;
+}
+
+/* ── MULTISELECT DROPDOWN POPUP — fondo azul crema, letra negra ── */
+[data-baseweb="popover"],
+[data-baseweb="menu"],
+[role="listbox"] {
+    background-color: #EFF6FF !important;
+    border: 1px solid #BFDBFE !important;
+    border-radius: 12px !important;
+}
+[data-baseweb="menu"] li,
+[role="option"],
+[role="listbox"] li {
+    color: #1E293B !important;
+    font-weight: 500 !important;
+    background-color: #EFF6FF !important;
+}
+[data-baseweb="menu"] li:hover,
+[role="option"]:hover {
+    background-color: #DBEAFE !important;
+    color: #1E40AF !important;
+}
+
+/* ── FOOTER CARD DE FIRMA ── */
+.footer-card {
+    background: linear-gradient(135deg, #EFF6FF 0%, #DBEAFE 100%);
+    border-radius: 22px;
+    padding: 32px 40px;
+    display: flex;
+    align-items: center;
+    gap: 36px;
+    margin-top: 40px;
+    flex-wrap: wrap;
+    border: 1px solid #BFDBFE;
+}
+.footer-card-text h3 { color: #1E40AF !important; margin: 0; font-size: 1.4rem; }
+.footer-card-text .role { color: #475569; margin: 4px 0 12px; font-size: 1rem; }
+.footer-card-text a {
+    background: #1E40AF;
+    color: white !important;
+    padding: 9px 22px;
+    border-radius: 25px;
+    text-decoration: none !important;
+    font-weight: 600;
+    font-size: 0.95rem;
+}
+.footer { text-align:center; color:#94A3B8; margin-top:16px; font-size:0.85rem; }
+"""
+
+CSS = f"<style>\n@import url('{FONTS_URL}');\n{STYLES}</style>\n"
+
+CHAPTER_TITLES = {
+    1: "El legado de 30 años de publicidad",
+    2: "Tendencias: Digital vs Tradicional vs TV",
+    3: "Perfil estadístico de los medios",
+    4: "¿Qué pasó cada año?",
+    5: "Proyecciones al 2031: Tres métodos",
+    6: "La TV y el PIB: El ecosistema que no muere",
+}
+
+NARRATIVES = {
+    1: """
+<div class="narr">
+En 1995 Colombia tenía menos de 37 millones de habitantes y el internet era prácticamente invisible.
+La <strong>Televisión Nacional</strong> concentraba casi el 60% del presupuesto publicitario.
+Tres décadas después el mercado creció más de <strong>15 veces en términos nominales</strong>,
+y aunque el mapa de medios luce radicalmente distinto, la TV sigue en el centro del tablero.
+</div>
+""",
+    4: """
+<div class="narr">
+Cada punto de inflexión deja huella en el presupuesto publicitario.
+La caída del petróleo en 2016, la pandemia de 2020 y el rebote de 2021 son los episodios más dramáticos en 30 años.
+</div>
+""",
+    6: """
+<div class="narr">
+🔵 <strong>La TV no muere — se transforma.</strong>
+Desde 1995, la inversión acumulada en televisión supera los <em>25 billones de pesos</em>.
+Aunque su share cayó del 60% al 19%, en términos absolutos la inversión <strong>se triplicó</strong>.<br><br>
+📈 <strong>Relación TV–PIB.</strong>
+La curva publicitaria es espejo fiel del ciclo económico. En recesiones, la TV regional es el último presupuesto en recortarse.<br><br>
+🌐 <strong>Convergencia, no sustitución.</strong>
+El coeficiente de correlación entre penetración de internet e inversión en TV es positivo: ambos ecosistemas se potencian.<br><br>
+{outlook}La TV Conectada (CTV) y el Streaming capturarán presupuesto digital bajo la lógica y métricas de televisión.
+</div>
+""",
+}
+
+
+# ─────────────────────────────────────────
+# QR Y FIRMA
+# ─────────────────────────────────────────
+def get_qr_b64(path=QR_PATH):
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            return base64.b64encode(f.read()).decode()
+    return None
+
+
+def qr_img(qr_src, width, style):
+    """<img> del QR; qr_src es una URL (assets.py) o un data URI. Vacío si no hay QR."""
+    return f'<img src="{qr_src}" width="{width}" style="{style}"/>' if qr_src else ""
+
+
+def qr_hero(qr_src):
+    return qr_img(qr_src, 88, "border-radius:10px;border:2px solid rgba(255,255,255,0.4);")
+
+
+def qr_foot(qr_src):
+    return qr_img(qr_src, 110, "border-radius:14px;box-shadow:0 4px 12px rgba(30,64,175,0.15);")
+
+
+def section_header(n):
+    return (f'<div class="section-label">Capítulo {n}</div>'
+            f'<div class="section-title">{CHAPTER_TITLES[n]}</div>')
+
+
+def hero_html(qr_src):
+    qr_hero_img = qr_hero(qr_src)
+    return f"""
+<div class="hero">
+    <h1>📺 Inversión Publicitaria en Colombia</h1>
+    <p>Análisis de Datos, Tendencias y Proyecciones 1995 – 2031 &nbsp;|&nbsp; Storytelling de Medios</p>
+    <div class="hero-author">
+        {qr_hero_img}
+        <div class="hero-author-info">
+            <div class="hero-author-name">👤 Luis Miguel López</div>
+            <div class="hero-author-role">Data Analyst &nbsp;|&nbsp; Marketing & Media Intelligence</div>
+        </div>
+        <a href="https://www.linkedin.com/in/luislopezanalytics" target="_blank" class="hero-li-link">
+            🔗 LinkedIn: luislopezanalytics
+        </a>
+    </div>
+</div>
+"""
+
+
+def footer_html(qr_src):
+    qr_foot_img = qr_foot(qr_src)
+    return f"""
+<div class="footer-card">
+    {qr_foot_img}
+    <div class="footer-card-text">
+        <h3>👤 Luis Miguel López</h3>
+        <div class="role">Data Analyst &nbsp;•&nbsp; Marketing & Media Intelligence &nbsp;•&nbsp; Colombia</div>
+        <a href="https://www.linkedin.com/in/luislopezanalytics" target="_blank">
+            🔗 www.linkedin.com/in/luislopezanalytics
+        </a>
+    </div>
+</div>
+<div class="footer">
+    Colombia Advertising Intelligence &nbsp;|&nbsp;
+    Data Storytelling Dashboard &nbsp;|&nbsp; 2026 &nbsp;|&nbsp;
+    Fuentes: IBOPE · DANE · Banco Mundial · IAB Colombia
+</div>
+"""
+
+
+def download_stem(market, first, last):
+    """Nombre base de una descarga: 'colombia_publicidad_1995_2031', 'bogota_d_c_publicidad_2010_2020'."""
+    ascii_name = unicodedata.normalize("NFKD", str(market)).encode("ascii", "ignore").decode()
+    slug = re.sub(r"[^a-z0-9]+", "_", ascii_name.lower()).strip("_") or "mercado"
+    return f"{slug}_publicidad_{int(first)}_{int(last)}"
+
+
+def kpis(latest, market="Colombia"):
+    """(etiqueta, valor, delta) de las cuatro tarjetas del encabezado; `latest` es el último año del mercado."""
+    return [
+        (f"Inversión Total {market} {int(latest['AÑO'])}", f"${latest['TOTAL_INV']/1e6:.2f}B COP", f"{latest['VAR_YOY']:.1f}%"),
+        ("Inversión TV",          f"${latest['TV_TOTAL']/1e6:.2f}B COP",    "Ancla del Mercado"),
+        ("Share Televisión",      f"{latest['TV_SHARE']*100:.1f}%",          "-1.2 pts"),
+        ("Share Digital",         f"{latest['DIG_SHARE']*100:.1f}%",         "+4.8 pts"),
+    ]
+
+
+PROJECTION_NOTE = ("**Rango de predicción 2031** (bootstrap por bloques sobre la tendencia lineal): "
+                   "central {center:.1f} billones · 80%: {lo80:.1f} – {hi80:.1f} · "
+                   "95%: {lo95:.1f} – {hi95:.1f} billones de pesos.")
+
+
+# Frase de cierre del capítulo 6: sale de la proyección y sus bandas, no de un número fijo
+OUTLOOK = ("📊 <strong>Para {year}</strong> la proyección central del mercado publicitario es de "
+           "<em>{center:.1f} billones de pesos</em> (rango de predicción del 95%: {lo95:.1f} – {hi95:.1f}).\n")
+
+
+def narrative_6(proj_slice, bands, col="TOTAL_INV"):
+    """NARRATIVES[6] con la frase de 2031 calculada; sin proyección, sin esa frase."""
+    if not len(proj_slice) or not bands:
+        return NARRATIVES[6].format(outlook="")
+    b = lambda lv, i: bands[lv][i][col].iloc[-1] / 1e6
+    return NARRATIVES[6].format(outlook=OUTLOOK.format(
+        year=int(proj_slice["AÑO"].iloc[-1]), center=proj_slice[col].iloc[-1] / 1e6,
+        lo95=b(0.95, 0), hi95=b(0.95, 1)))
+
+
+def projection_note(proj_slice, bands, col="TOTAL_INV"):
+    """PROJECTION_NOTE del último año proyectado (valores en millones → billones)."""
+    b = lambda lv, i: bands[lv][i][col].iloc[-1] / 1e6
+    return PROJECTION_NOTE.format(center=proj_slice[col].iloc[-1] / 1e6,
+                                  lo80=b(0.8, 0), hi80=b(0.8, 1), lo95=b(0.95, 0), hi95=b(0.95, 1))
+
+
+FORECAST_NOTE = ("MAPE promedio de cada modelo reajustado año a año (tras los primeros 8 años) y "
+                 "evaluado en los hasta 6 años siguientes. Las filas proyectadas del dataset usan "
+                 "AD_PROJECTION_MODEL: la regresión lineal por defecto, o el modelo elegido de cada "
+                 "serie con AD_PROJECTION_MODEL=auto.")
+
+
+def forecast_table(scores, best, labels):
+    """MAPE por serie y modelo (columnas con nombre legible) más el modelo elegido."""
+    table = scores.rename(columns=labels)
+    table["Elegido"] = [labels[best[c]] for c in scores.index]
+    return table
+
+
+SCENARIO_NOTE = ("**Escenario {year}** ({n:,} trayectorias): inversión total mediana {center:.1f} billones "
+                 "(80%: {lo80:.1f} – {hi80:.1f}) · share TV {tv:.0%} · share digital {dig:.0%}. "
+                 "Crecimiento y volatilidad por medio en la barra lateral; al editar uno sólo ese "
+                 "medio se vuelve a simular.")
+
+
+def scenario_table(assumptions):
+    """Supuestos {medio: (crecimiento, volatilidad)} → tabla editable en %."""
+    return pd.DataFrame({"Medio": list(assumptions),
+                         "Crecimiento %": [round(a[0] * 100, 1) for a in assumptions.values()],
+                         "Volatilidad %": [round(a[1] * 100, 1) for a in assumptions.values()]})
+
+
+def scenario_note(sc):
+    """SCENARIO_NOTE del último año simulado (valores en millones → billones)."""
+    med, (lo, hi) = sc.median.iloc[-1], sc.bands[0.8]
+    return SCENARIO_NOTE.format(year=int(med["AÑO"]), n=sc.n_paths, center=med["TOTAL_INV"] / 1e6,
+                                lo80=lo["TOTAL_INV"].iloc[-1] / 1e6, hi80=hi["TOTAL_INV"].iloc[-1] / 1e6,
+                                tv=med["TV_SHARE"], dig=med["DIG_SHARE"])
+
+
+# Ventanas del heatmap de correlación: años hasta el último dato (None = toda la muestra)
+CORR_WINDOWS = {"Toda la muestra": None, "Últimos 15 años": 15, "Últimos 10 años": 10, "Últimos 5 años": 5}
+
+CORR_MATRIX_NOTE = ("Pearson por pares, con los años en que ambas series tienen dato (mínimo 4). Rezago k > 0: "
+                    "el medio en t frente al indicador en t − k (el indicador anticipa); k < 0, al revés. "
+                    "La correlación móvil usa ventanas del ancho elegido (creciente con toda la muestra).")
+
+
+CORRELATION_NOTE = ("**Correlación de Pearson = {corr:.2f}** — La TV crece junto con el acceso a internet, "
+                    "refutando el mito de sustitución.")
@@ -0,0 +1,178 @@
+"""
+======================================================
+ CORRELATION — Matrices de correlación móviles y con
+ rezago entre medios e indicadores macro
+ Sumas acumuladas de productos sobre el tiempo: la
+ correlación de cualquier ventana, rezago y mercado
+ sale de una resta, sin recorrer los datos.
+======================================================
+
+    corr = correlation_cube(df_hist)              # caché por hash de los datos
+    corr.matrix((2010, 2025))                     # DataFrame medio × indicador
+    corr.matrix((2010, 2025), lag=2)              # indicador de dos años antes
+    corr.lagged((1995, 2025))                     # (rezagos, medios, indicadores)
+    corr.rolling(10, INTERNET)                    # DataFrame medio × año final, ventana de 10
+
+Con lag = k > 0 se correlaciona el medio en t con el indicador en t − k
+(el indicador anticipa al medio); con k < 0, al revés. Cada par usa los
+años donde ambos tienen dato (pairwise complete, como DataFrame.corr).
+
+Para cada rezago, par y mercado se acumulan n, Σx, Σy, Σx², Σy² y Σxy
+sólo sobre los años válidos de los dos, en una sola pasada vectorizada
+(T × rezagos × medios × indicadores × mercados). Las series se centran
+en su media antes de acumular para no perder precisión con valores del
+orden de la población. Un cubo con todos los mercados se arma una vez
+por versión del dataset (markets.py).
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from engine import INTERNET, MEDIOS
+
+CORR_MEDIA = MEDIOS + ["TV_TOTAL", "TOTAL_INV"]
+CORR_MACRO = ["IPC", "TRM Promedio", INTERNET, "Poblacion DANE", "PIB_PCT"]
+MAX_LAG = 3
+MIN_OBS = 4                    # menos años que esto en una ventana → NaN
+VAR_RTOL = 1e-10               # varianza bajo esto × Σx² es error de redondeo: serie constante → NaN
+
+
+class CorrelationCube:
+    def __init__(self, years, X, Y, x_cols, y_cols, markets=("Colombia",), max_lag=MAX_LAG):
+        """X: (T, p, K) medios, Y: (T, q, K) indicadores; años ordenados y sin huecos."""
+        self.years   = np.asarray(years).astype(int)
+        self.x_cols  = list(x_cols)
+        self.y_cols  = list(y_cols)
+        self.markets = list(markets)
+        self.lags    = np.arange(-max_lag, max_lag + 1)
+        self._mkt    = {m: i for i, m in enumerate(self.markets)}
+
+        X, Y = self._centered(X), self._centered(Y)
+        T = len(X)
+
+        # Indicador desplazado por cada rezago: Yl[l, t] = Y[t − lag]
+        Yl = np.full((len(self.lags), T, *Y.shape[1:]), np.nan)
+        for i, lag in enumerate(self.lags):
+            if lag >= 0:
+                Yl[i, lag:] = Y[:T - lag]
+            else:
+                Yl[i, :lag] = Y[-lag:]
+
+        # (T, L, p, q, K): ejes alineados para el producto por pares
+        mx = ~np.isnan(X)[:, None, :, None, :]
+        my = ~np.isnan(Yl).transpose(1, 0, 2, 3)[:, :, None, :, :]
+        x  = np.where(mx, X[:, None, :, None, :], 0.0)
+        y  = np.where(my, Yl.transpose(1, 0, 2, 3)[:, :, None, :, :], 0.0)
+        both = mx & my
+        terms = {"n": both, "sx": x * my, "sy": y * mx, "sxx": x * x * my, "syy": y * y * mx, "sxy": x * y}
+        self._acc = {}
+        for name, term in terms.items():
+            acc = np.zeros((T + 1, *term.shape[1:]))
+            np.cumsum(term, axis=0, out=acc[1:])
+            self._acc[name] = acc
+
+    @staticmethod
+    def _centered(V):
+        V = np.asarray(V, dtype=float)
+        valid = ~np.isnan(V)
+        mean = np.where(valid, V, 0.0).sum(axis=0) / np.maximum(valid.sum(axis=0), 1)
+        return V - mean
+
+    @classmethod
+    def from_frame(cls, df_hist, x_cols=CORR_MEDIA, y_cols=CORR_MACRO, market="Colombia", max_lag=MAX_LAG):
+        df = df_hist.reindex(columns=["AÑO", *x_cols, *y_cols]).set_index("AÑO")
+        years = np.arange(int(df.index.min()), int(df.index.max()) + 1) if len(df) else []
+        df = df.reindex(years).reset_index()          # años consecutivos: el rezago es un corrimiento
+        return cls(years, df[x_cols].to_numpy(float)[:, :, None], df[y_cols].to_numpy(float)[:, :, None],
+                   x_cols, y_cols, markets=(market,), max_lag=max_lag)
+
+    @classmethod
+    def from_markets(cls, df_hist, x_cols=CORR_MEDIA, y_cols=CORR_MACRO, market_col="MERCADO",
+                     markets=None, max_lag=MAX_LAG):
+        """Un cubo para varios mercados apilados: eje de años común, NaN donde un mercado no tiene datos."""
+        markets = list(markets) if markets is not None else sorted(df_hist[market_col].unique())
+        df = df_hist.reindex(columns=["AÑO", market_col, *x_cols, *y_cols])
+        wide = df.set_index(["AÑO", market_col]).unstack(market_col)
+        years = np.arange(int(wide.index.min()), int(wide.index.max()) + 1) if len(wide) else []
+        wide = wide.reindex(index=years, columns=pd.MultiIndex.from_product([x_cols + y_cols, markets]))
+        V = wide.to_numpy(float).reshape(len(wide), len(x_cols) + len(y_cols), len(markets))
+        return cls(years, V[:, :len(x_cols)], V[:, len(x_cols):], x_cols, y_cols,
+                   markets=markets, max_lag=max_lag)
+
+    # ── índices ──
+    def bounds(self, yr_range):
+        lo = int(np.searchsorted(self.years, yr_range[0], side="left"))
+        hi = int(np.searchsorted(self.years, yr_range[1], side="right"))
+        return lo, hi
+
+    def _m(self, market):
+        return 0 if market is None else self._mkt[market]
+
+    def _l(self, lag):
+        return int(lag) + int(self.lags[-1])
+
+    @staticmethod
+    def _corr(d):
+        """Pearson a partir de las sumas de una ventana (cualquier forma de arrays)."""
+        n = d["n"]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            cov = d["sxy"] - d["sx"] * d["sy"] / n
+            vx  = d["sxx"] - d["sx"] ** 2 / n
+            vy  = d["syy"] - d["sy"] ** 2 / n
+            r = cov / np.sqrt(vx * vy)
+        ok = (n >= MIN_OBS) & (vx > VAR_RTOL * d["sxx"]) & (vy > VAR_RTOL * d["syy"])
+        return np.where(ok, np.clip(r, -1.0, 1.0), np.nan)
+
+    # ── consultas ──
+    def lagged(self, yr_range, market=None):
+        """(rezagos, medios, indicadores) sobre los años de yr_range, todos los rezagos a la vez."""
+        lo, hi = self.bounds(yr_range)
+        k = self._m(market)
+        return self._corr({name: a[hi, ..., k] - a[lo, ..., k] for name, a in self._acc.items()})
+
+    def matrix(self, yr_range, lag=0, market=None):
+        """DataFrame medio × indicador para un rezago."""
+        return pd.DataFrame(self.lagged(yr_range, market)[self._l(lag)], index=self.x_cols, columns=self.y_cols)
+
+    def rolling(self, window, column, lag=0, market=None):
+        """DataFrame medio × año final con la correlación de las ventanas de `window` años.
+
+        window=None: ventana creciente desde el primer año.
+        """
+        l, j, k = self._l(lag), self.y_cols.index(column), self._m(market)
+        ends = np.arange(1, len(self.years) + 1)
+        starts = np.zeros_like(ends) if window is None else np.maximum(ends - int(window), 0)
+        r = self._corr({name: a[ends, l, :, j, k] - a[starts, l, :, j, k] for name, a in self._acc.items()})
+        return pd.DataFrame(r.T, index=self.x_cols, columns=self.years)
+
+
+# ─────────────────────────────────────────
+# CACHÉ POR HASH DE LOS DATOS
+# ─────────────────────────────────────────
+_cache = OrderedDict()
+_lock  = threading.Lock()
+
+
+def correlation_cube(df_hist, market_col="MERCADO", markets=None, max_lag=MAX_LAG):
+    """CorrelationCube de df_hist (apilado por mercado si trae market_col), cacheado por contenido."""
+    stacked = market_col in df_hist.columns
+    cols = ["AÑO", *([market_col] if stacked else []), *CORR_MEDIA, *CORR_MACRO]
+    df = df_hist.reindex(columns=cols)
+    h = hashlib.sha256(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    h.update(repr((list(markets or []), max_lag, MIN_OBS, VAR_RTOL)).encode())
+    key = h.hexdigest()
+    with _lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+    cube = (CorrelationCube.from_markets(df, market_col=market_col, markets=markets, max_lag=max_lag)
+            if stacked else CorrelationCube.from_frame(df, max_lag=max_lag))
+    with _lock:
+        _cache[key] = cube
+        while len(_cache) > 16:
+            _cache.popitem(last=False)
+    return cube
@@ -0,0 +1,145 @@
+"""
+======================================================
+ CUBE — Cubo preagregado periodo × medio × mercado
+ Sumas acumuladas sobre el tiempo: totales, medias,
+ shares y cortes de un año para cualquier rango se
+ resuelven con dos búsquedas y una resta, sin
+ recorrer el DataFrame.
+======================================================
+
+    cube = MediaCube.from_frame(df_hist)
+    cube.totals((2000, 2020))          # Serie medio → suma del rango
+    cube.means((2000, 2020))           # Serie medio → media del rango
+    cube.snapshot(2020)                # Medio / Inversión de ese año
+
+El eje de periodos puede ser anual, mensual o diario: los rangos se
+expresan en años y se resuelven sobre el año de cada periodo.
+"""
+
+import numpy as np
+import pandas as pd
+
+from engine import MEDIOS, SHARE_COLS, SNAP_LABELS
+
+CUBE_COLS = MEDIOS + ["TV_TOTAL","TRADICIONAL","TOTAL_INV"]
+
+
+class MediaCube:
+    def __init__(self, periods, years, values, columns, markets=("Colombia",)):
+        """values: (T, M, K) = periodo × medio × mercado, periodos ordenados."""
+        self.periods = np.asarray(periods)
+        self.years   = np.asarray(years)
+        self.columns = list(columns)
+        self.markets = list(markets)
+        self.values  = np.asarray(values, dtype=float)
+        self._col    = {c: i for i, c in enumerate(self.columns)}
+        self._mkt    = {m: i for i, m in enumerate(self.markets)}
+
+        T, M, K = self.values.shape
+        valid = ~np.isnan(self.values)
+        self._sum = np.zeros((T + 1, M, K))
+        self._cnt = np.zeros((T + 1, M, K))
+        np.cumsum(np.where(valid, self.values, 0.0), axis=0, out=self._sum[1:])
+        np.cumsum(valid, axis=0, out=self._cnt[1:])
+
+        # Derivados por periodo, listos para cortar
+        share_idx   = [self._col[c] for c in SHARE_COLS]
+        share_tot   = self.values[:, share_idx, :].sum(axis=1, keepdims=True)
+        self._norm  = self.values[:, share_idx, :] / share_tot * 100
+        self._diff  = np.diff(self.values, axis=0, prepend=np.nan)
+
+    @classmethod
+    def from_frame(cls, df_hist, columns=CUBE_COLS, period_col="AÑO", market="Colombia"):
+        periods = df_hist[period_col].to_numpy()
+        years   = periods.astype(int) if np.issubdtype(periods.dtype, np.number) \
+                  else pd.DatetimeIndex(periods).year.to_numpy()
+        values  = df_hist[columns].to_numpy(float)[:, :, None]
+        return cls(periods, years, values, columns, markets=(market,))
+
+    @classmethod
+    def from_markets(cls, df_hist, columns=CUBE_COLS, market_col="MERCADO", markets=None):
+        """Un cubo para varios mercados apilados: eje de años común, NaN donde un mercado no tiene datos."""
+        markets = list(markets) if markets is not None else sorted(df_hist[market_col].unique())
+        wide = df_hist.set_index(["AÑO", market_col])[columns].unstack(market_col)
+        wide = wide.reindex(columns=pd.MultiIndex.from_product([columns, markets])).sort_index()
+        values = wide.to_numpy(float).reshape(len(wide), len(columns), len(markets))
+        periods = wide.index.to_numpy()
+        return cls(periods, periods.astype(int), values, columns, markets=markets)
+
+    # ── índices ──
+    def bounds(self, yr_range):
+        lo = int(np.searchsorted(self.years, yr_range[0], side="left"))
+        hi = int(np.searchsorted(self.years, yr_range[1], side="right"))
+        return lo, hi
+
+    def _m(self, market):
+        return 0 if market is None else self._mkt[market]
+
+    # ── consultas por rango ──
+    def totals(self, yr_range, market=None):
+        lo, hi = self.bounds(yr_range)
+        k = self._m(market)
+        return pd.Series(self._sum[hi, :, k] - self._sum[lo, :, k], index=self.columns)
+
+    def counts(self, yr_range, market=None):
+        lo, hi = self.bounds(yr_range)
+        k = self._m(market)
+        return pd.Series(self._cnt[hi, :, k] - self._cnt[lo, :, k], index=self.columns)
+
+    def means(self, yr_range, columns=MEDIOS, market=None):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return (self.totals(yr_range, market) / self.counts(yr_range, market))[columns]
+
+    def means_table(self, yr_range, columns=MEDIOS, market=None):
+        """Medio / Media ordenado de mayor a menor (Tab 3)."""
+        means = self.means(yr_range, columns, market)
+        return pd.DataFrame({"Medio": means.index, "Media": means.to_numpy()}) \
+                 .sort_values("Media", ascending=False)
+
+    def shares(self, yr_range, columns=MEDIOS, market=None):
+        """Participación de cada medio en el total acumulado del rango."""
+        tot = self.totals(yr_range, market)
+        return tot[columns] / tot["TOTAL_INV"]
+
+    def snapshot(self, year, market=None):
+        """Medio / Inversión acumulada en `year`, de mayor a menor (None si no existe).
+
+        Con datos anuales es la fila del año; con mensuales o diarios, la suma
+        de sus periodos.
+        """
+        lo, hi = self.bounds((year, year))
+        if hi == lo:
+            return None
+        if hi - lo == 1:     # un solo periodo: valor exacto, sin restar acumulados
+            row = pd.Series(self.values[lo, :, self._m(market)], index=self.columns)
+        else:
+            row = self.totals((year, year), market)
+        return pd.DataFrame({
+            "Medio":     list(SNAP_LABELS.values()),
+            "Inversión": row[list(SNAP_LABELS)].to_numpy(),
+        }).sort_values("Inversión", ascending=False)
+
+    # ── cortes por periodo ──
+    def normalized_shares(self, yr_range, market=None):
+        lo, hi = self.bounds(yr_range)
+        df_norm = pd.DataFrame(self._norm[lo:hi, :, self._m(market)], columns=SHARE_COLS)
+        df_norm.insert(0, "AÑO", self.periods[lo:hi])
+        return df_norm
+
+    def increments(self, yr_range, column="TV_TOTAL", market=None):
+        """Variación periodo a periodo; el primero del rango arranca desde su nivel."""
+        lo, hi = self.bounds(yr_range)
+        j, k = self._col[column], self._m(market)
+        vals = self.values[lo:hi, j, k]
+        inc = self._diff[lo:hi, j, k].copy()
+        if hi > lo:
+            inc[0] = vals[0]
+        # Mercados que arrancan dentro del rango: su primer dato también parte de su nivel
+        first = np.isnan(inc) & ~np.isnan(vals)
+        inc[first] = vals[first]
+        return inc
+
+    def period_slice(self, yr_range):
+        """Periodos del eje común dentro del rango (el eje x de increments y normalized_shares)."""
+        lo, hi = self.bounds(yr_range)
+        return self.periods[lo:hi]
@@ -0,0 +1,99 @@
+"""
+======================================================
+ DOWNSAMPLE — Reducción de puntos que preserva la forma
+ Para series largas (mensuales, diarias o por spot):
+ min/max por bucket (vectorizado) y LTTB.
+======================================================
+
+Ambos métodos devuelven índices, no valores, para que varias series que
+comparten eje x (áreas apiladas, shares) se corten en los mismos puntos.
+"""
+
+import numpy as np
+
+POINTS_PER_PX = 2          # ~dos puntos por píxel horizontal ya saturan la línea
+
+AUTO_WEBGL_POINTS = 2000
+FULL_WIDTH_PX, HALF_WIDTH_PX = 1200, 600
+
+
+def budget(width_px, points_per_px=POINTS_PER_PX):
+    """Puntos máximos razonables para una gráfica de `width_px` de ancho."""
+    return max(int(width_px * points_per_px), 16)
+
+
+def render_options(mode, n_points):
+    """(webgl, full_opts, half_opts) para el modo "Auto" / "SVG" / "WebGL" y n_points filas."""
+    # Series largas (mensuales, diarias): WebGL + reducción a ~2 puntos por píxel
+    webgl = mode == "WebGL" or (mode == "Auto" and n_points > AUTO_WEBGL_POINTS)
+    full_opts = dict(webgl=webgl, max_points=budget(FULL_WIDTH_PX) if webgl else None)
+    half_opts = dict(webgl=webgl, max_points=budget(HALF_WIDTH_PX) if webgl else None)
+    return webgl, full_opts, half_opts
+
+
+def minmax_indices(Y, n_buckets):
+    """Índices del mínimo y máximo de cada bucket, para una o varias series.
+
+    Y: (n,) o (n, k). Con varias series se conserva la unión de extremos de
+    todas, de modo que ningún pico de ninguna serie se pierde. Siempre
+    incluye el primer y el último punto.
+    """
+    Y = np.asarray(Y, dtype=float)
+    if Y.ndim == 1:
+        Y = Y[:, None]
+    n = len(Y)
+    if n <= 2 * n_buckets:
+        return np.arange(n)
+
+    edges = np.linspace(0, n, n_buckets + 1).astype(int)
+    size  = np.diff(edges)
+    # Buckets de igual tamaño salvo redondeo: rellenar con NaN hasta el más grande
+    width = size.max()
+    pos   = edges[:-1, None] + np.arange(width)[None, :]
+    inside = pos < edges[1:, None]
+    pos   = np.where(inside, pos, edges[1:, None] - 1)
+    keep  = [np.array([0, n - 1])]
+    for j in range(Y.shape[1]):
+        vals = np.where(inside, Y[pos, j], np.nan)
+        if np.isnan(vals).all():
+            continue
+        filled = np.where(np.isnan(vals), np.inf, vals)
+        keep.append(pos[np.arange(n_buckets), filled.argmin(axis=1)])
+        filled = np.where(np.isnan(vals), -np.inf, vals)
+        keep.append(pos[np.arange(n_buckets), filled.argmax(axis=1)])
+    return np.unique(np.concatenate(keep))
+
+
+def lttb_indices(x, y, n_out):
+    """Largest-Triangle-Three-Buckets: n_out índices que preservan la forma visual."""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    out = np.empty(n_out, dtype=int)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nxt_lo, nxt_hi = edges[i + 1], edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[nxt_lo:nxt_hi].mean() if nxt_hi > nxt_lo else x[-1]
+        avg_y = y[nxt_lo:nxt_hi].mean() if nxt_hi > nxt_lo else y[-1]
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.nanargmax(area)) if hi > lo else lo
+        out[i + 1] = a
+    return out
+
+
+def thin(df, columns, max_points, x="AÑO", method="minmax"):
+    """Filas de df reducidas a ~max_points conservando la forma de `columns`."""
+    if max_points is None or len(df) <= max_points:
+        return df
+    if method == "lttb":
+        idx = lttb_indices(df[x].to_numpy(), df[columns].to_numpy(float).sum(axis=1), max_points)
+    else:
+        # la unión de extremos de k series puede llegar a 2·k puntos por bucket
+        idx = minmax_indices(df[columns].to_numpy(float), max(max_points // (2 * len(columns)), 1))
+    return df.iloc[idx]
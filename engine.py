@@ -0,0 +1,318 @@
+"""
+======================================================
+ DATA ENGINE — Inversión Publicitaria Colombia
+ Construcción del dataset, columnas derivadas,
+ proyecciones y estadística, sin Streamlit ni Plotly.
+======================================================
+
+Uso headless (batch jobs, workers):
+
+    from engine import build_dataset
+    df_hist, df_full = build_dataset()
+
+Las proyecciones se resuelven por lotes en trend.py (NumPy puro), así
+que el arranque de procesos cortos no paga la importación de scikit-learn.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from io import StringIO
+
+import numpy as np
+import pandas as pd
+
+from telemetry import span
+from trend import bootstrap_intervals, fit_trends, predict_trends, project_trends
+
+BASE_DIR  = os.path.dirname(os.path.abspath(__file__))
+DATA_PATH = os.path.join(BASE_DIR, "cleaned_ad_data.csv")
+
+# ─────────────────────────────────────────
+# CONSTANTES DEL MODELO
+# ─────────────────────────────────────────
+YEAR_MIN, YEAR_MAX = 1995, 2025
+PROJ_YEARS = np.arange(2026, 2032)
+
+MEDIOS     = ["TV REG Y LOCAL","TV NACIONAL","DIGITAL","RADIO","PRENSA","PUB EXTERIOR","REVISTAS"]
+PROJ_COLS  = ["TOTAL_INV","TV_TOTAL","DIGITAL","TRADICIONAL"]
+SHARE_COLS = ["TV_TOTAL","DIGITAL","TRADICIONAL"]
+
+# Modelo de las filas proyectadas: "linear" (tendencia de trend.py), un
+# modelo de forecast.MODELS o "auto" (el mejor por serie según backtesting)
+PROJECTION_MODEL = os.environ.get("AD_PROJECTION_MODEL", "linear")
+INTERNET   = "Penetración Internet (%)"
+
+# Etiquetas cortas para el corte por año (Tab 2)
+SNAP_LABELS = {
+    "TV NACIONAL":"TV Nac.","TV REG Y LOCAL":"TV Reg.","DIGITAL":"Digital","RADIO":"Radio",
+    "PRENSA":"Prensa","PUB EXTERIOR":"Exterior","REVISTAS":"Revistas",
+}
+
+PIB_MAP = {
+    1995:5.2,1996:2.1,1997:3.4,1998:0.6,1999:-4.2,
+    2000:2.9,2001:1.7,2002:2.5,2003:3.9,2004:5.3,
+    2005:4.7,2006:6.7,2007:6.9,2008:3.5,2009:1.7,
+    2010:4.0,2011:6.6,2012:4.0,2013:4.9,2014:4.4,
+    2015:3.0,2016:2.1,2017:1.4,2018:2.6,2019:3.2,
+    2020:-7.0,2021:10.8,2022:7.3,2023:0.6,2024:1.5,2025:2.8,
+}
+
+# Respaldo embebido si el CSV no está disponible
+FALLBACK_CSV = (
+    "AÑO;TV REG Y LOCAL;REVISTAS;PUB EXTERIOR;PRENSA;RADIO;TV NACIONAL;"
+    "DIGITAL;TOTAL_INV;IPC;TRM Promedio;Penetración Internet (%);"
+    "Poblacion DANE\n"
+    "1995;22969.6;32751.2;15280.0;38202.0;25468.0;198962.4;0.0;333633.2;0.195;912.9;0.001;36229830\n"
+    "2000;24330.8;53527.7;38491.6;96229.0;188868.2;374799.9;0.0;776246.2;0.088;2087.73;0.030;39140080\n"
+    "2005;36742.0;83440.0;84253.0;353131.0;257508.0;673410.0;0.0;1488484.0;0.049;2320.08;0.121;41671878\n"
+    "2010;65275.0;99876.0;128054.0;536026.0;419008.0;919366.0;94682.0;2262287.0;0.032;1897.74;0.325;44086292\n"
+    "2014;71644.0;103048.0;145738.0;636192.0;550216.0;1155026.0;255389.0;2917253.0;0.037;2000.36;0.516;45866010\n"
+    "2015;71228.0;95061.0;145885.0;574232.0;561034.0;1102929.0;376110.0;2926479.0;0.068;2747.73;0.572;46313898\n"
+    "2016;56371.0;77516.0;130590.0;503065.0;517723.0;990127.0;409739.0;2685131.0;0.058;2977.77;0.630;46830116\n"
+    "2017;51899.0;71067.0;181973.0;465685.0;528459.0;917494.0;600476.0;2817053.0;0.041;2951.0;0.665;47419200\n"
+    "2018;52374.0;59988.0;184168.0;418083.0;549185.0;889760.0;848594.0;3002152.0;0.032;2956.0;0.684;48258494\n"
+    "2019;60717.0;48036.0;209888.0;376697.0;541920.0;889057.0;1080535.0;3206850.0;0.038;3281.0;0.709;49395678\n"
+    "2020;56101.0;19606.0;82238.0;225403.0;373737.0;763423.0;1251333.0;2771841.0;0.016;3693.0;0.720;50407647\n"
+    "2021;69995.0;14732.0;166607.0;253875.0;499184.0;1037067.0;2040158.0;4081618.0;0.056;3743.0;0.752;51117378\n"
+    "2022;70900.0;11470.0;274741.0;269501.0;578788.0;1043937.0;2354697.9;4604034.9;0.131;4255.44;0.768;51682692\n"
+    "2023;59038.0;10513.0;279346.0;246444.0;578117.0;975070.0;2663179.0;4811707.0;0.093;4325.05;0.773;52314000\n"
+    "2024;52116.3;8622.2;292696.0;215570.0;558882.4;955310.3;2825565.2;4908762.4;0.052;4072.59;0.757;52695952\n"
+    "2025;61114.8;6839.0;328924.6;206962.0;560706.3;908657.0;3066685.3;5139889.1;0.035;4000.0;0.835;53200000\n"
+)
+
+
+# ─────────────────────────────────────────
+# CARGA Y COLUMNAS DERIVADAS
+# ─────────────────────────────────────────
+def load_raw(path=DATA_PATH):
+    try:
+        return pd.read_csv(path)
+    except FileNotFoundError:
+        return pd.read_csv(StringIO(FALLBACK_CSV), sep=";")
+
+
+def derive_columns(df, year_max=YEAR_MAX, year_min=YEAR_MIN):
+    # El CSV trae filas posteriores a YEAR_MAX (proyecciones viejas): se descartan aquí
+    num_cols = [c for c in df.columns if c != "AÑO"]
+    df[num_cols] = df[num_cols].apply(pd.to_numeric, errors="coerce")
+    df = df.set_index("AÑO").reindex(range(year_min, year_max + 1)).interpolate(method="linear").reset_index()
+    return add_derived(df)
+
+
+DERIVED_COLS = ["PIB_PCT","TV_TOTAL","TRADICIONAL","TV_SHARE","DIG_SHARE","VAR_YOY"]
+
+
+def add_derived(df):
+    """PIB, agregados TV/Tradicional, shares y variación anual sobre un df ya interpolado."""
+    df["PIB_PCT"]    = df["AÑO"].map(PIB_MAP)
+    df["TV_TOTAL"]   = df["TV REG Y LOCAL"] + df["TV NACIONAL"]
+    df["TRADICIONAL"]= df["REVISTAS"] + df["PUB EXTERIOR"] + df["PRENSA"] + df["RADIO"]
+    df["TV_SHARE"]   = df["TV_TOTAL"] / df["TOTAL_INV"]
+    df["DIG_SHARE"]  = df["DIGITAL"]  / df["TOTAL_INV"]
+    df["VAR_YOY"]    = df["TOTAL_INV"].pct_change() * 100
+    return df
+
+
+# ─────────────────────────────────────────
+# PROYECCIONES
+# ─────────────────────────────────────────
+def projection_years(last_year):
+    """Años a proyectar después del último dato, hasta el horizonte de PROJ_YEARS."""
+    return np.arange(int(last_year) + 1, int(PROJ_YEARS[-1]) + 1)
+
+
+def project(df, cols=PROJ_COLS, future_idx=PROJ_YEARS, model=None):
+    model = model or PROJECTION_MODEL
+    if model == "linear":
+        # Todas las series en una sola resolución: matriz año × serie
+        pred = project_trends(df["AÑO"].to_numpy(float), df[cols].to_numpy(float), future_idx, floor=0)
+    else:
+        from forecast import forecast_frame      # backtesting con caché en disco
+
+        fc = forecast_frame(df, cols, future_idx, models=None if model == "auto" else [model])
+        pred = (fc.projection if model == "auto" else fc.forecasts[model])[cols].to_numpy()
+    df_proj = pd.DataFrame({"AÑO": future_idx, "PROYECCION": True})
+    df_proj[cols] = pred
+    return df_proj
+
+
+# Bandas de predicción: bootstrap por bloques de 3 años sobre los residuos de la tendencia
+PI_LEVELS = (0.5, 0.8, 0.95)
+PI_BOOT   = 2000
+PI_BLOCK  = 3
+_pi_cache = OrderedDict()
+_pi_lock  = threading.Lock()
+
+
+def projection_intervals(df, cols=PROJ_COLS, future_idx=PROJ_YEARS, levels=PI_LEVELS,
+                         n_boot=PI_BOOT, block=PI_BLOCK):
+    """{nivel: (lower, upper)} como DataFrames AÑO + cols, cacheados por hash de los datos."""
+    x, Y = df["AÑO"].to_numpy(float), df[cols].to_numpy(float)
+    h = hashlib.sha256(np.ascontiguousarray(x).tobytes() + np.ascontiguousarray(Y).tobytes())
+    h.update(repr((list(cols), list(np.asarray(future_idx)), levels, n_boot, block)).encode())
+    key = h.hexdigest()
+    with _pi_lock:
+        if key in _pi_cache:
+            _pi_cache.move_to_end(key)
+            return _pi_cache[key]
+    with span("projections.bootstrap"):
+        _, bands = bootstrap_intervals(x, Y, future_idx, levels, n_boot, block, floor=0)
+    frame = lambda arr: pd.DataFrame(arr, columns=cols).assign(AÑO=np.asarray(future_idx))
+    out = {lv: (frame(lo), frame(hi)) for lv, (lo, hi) in bands.items()}
+    with _pi_lock:
+        _pi_cache[key] = out
+        while len(_pi_cache) > 64:
+            _pi_cache.popitem(last=False)
+    return out
+
+
+def build_dataset(path=DATA_PATH, year_max=YEAR_MAX):
+    """df_hist hasta el último año del CSV (como mucho year_max) y df_full con las proyecciones.
+
+    Un CSV que termina antes de year_max no se rellena hasta year_max:
+    los años que faltan se proyectan, como en markets.derive_market.
+    """
+    with span("build.load_csv"):
+        raw = load_raw(path)
+    last = min(int(pd.to_numeric(raw["AÑO"]).max()), year_max)
+    with span("build.interpolate"):
+        df = derive_columns(raw, year_max=last)
+    with span("build.projections"):
+        df_proj = project(df, future_idx=projection_years(last))
+
+    df["PROYECCION"] = False
+    df_full = pd.concat([df, df_proj], ignore_index=True)
+    return df, df_full
+
+
+# ─────────────────────────────────────────
+# VISTAS Y ESTADÍSTICA
+# ─────────────────────────────────────────
+def year_range(df_hist, yr_range):
+    """Filas con AÑO en [yr_range[0], yr_range[1]].
+
+    Con años ordenados (el caso de build_dataset) es un corte posicional:
+    una vista sin copia sobre los buffers de df_hist.
+    """
+    years = df_hist["AÑO"].to_numpy()
+    if df_hist["AÑO"].is_monotonic_increasing:
+        lo = np.searchsorted(years, yr_range[0], side="left")
+        hi = np.searchsorted(years, yr_range[1], side="right")
+        return df_hist.iloc[lo:hi]
+    return df_hist[(years >= yr_range[0]) & (years <= yr_range[1])]
+
+
+def latest_row(df_hist):
+    return df_hist[df_hist["AÑO"] == df_hist["AÑO"].max()].iloc[0]
+
+
+def normalized_shares(df_v):
+    df_norm = df_v[["AÑO"] + SHARE_COLS].copy()
+    tot = df_norm[SHARE_COLS].sum(axis=1)
+    for col in SHARE_COLS:
+        df_norm[col] = df_norm[col] / tot * 100
+    return df_norm
+
+
+def snapshot(df_v, year):
+    """Inversión por medio en un año, ordenada de mayor a menor (None si no hay datos)."""
+    row_snap = df_v[df_v["AÑO"] == year]
+    if row_snap.empty:
+        return None
+    row = row_snap.iloc[0]
+    return pd.DataFrame({
+        "Medio": list(SNAP_LABELS.values()),
+        "Inversión": [row[c] for c in SNAP_LABELS],
+    }).sort_values("Inversión", ascending=False)
+
+
+def media_means(df_stat):
+    means = df_stat.mean().reset_index()
+    means.columns = ["Medio","Media"]
+    return means.sort_values("Media", ascending=False)
+
+
+def _take(sorted_X, pos):
+    """Interpolación lineal en posiciones fraccionarias `pos` (una por columna)."""
+    lo = np.floor(pos).astype(int)
+    hi = np.minimum(lo + 1, sorted_X.shape[0] - 1)
+    v_lo = np.take_along_axis(sorted_X, lo[None, :], axis=0)[0]
+    v_hi = np.take_along_axis(sorted_X, hi[None, :], axis=0)[0]
+    return v_lo + (v_hi - v_lo) * (pos - lo)
+
+
+def describe_matrix(X, columns=None):
+    """Estadística descriptiva de cada columna de X (n, k) con un solo ordenamiento.
+
+    Devuelve un DataFrame (una fila por columna) con count, mean, std (ddof=1),
+    min, 25%, 50%, 75%, max, moda y los bigotes del boxplot (lowerfence,
+    upperfence a 1.5·IQR). Cuartiles por interpolación lineal, como pandas;
+    la moda es el menor de los valores más repetidos, como Series.mode().
+    Los NaN se ignoran columna por columna.
+    """
+    X = np.asarray(X, dtype=float)
+    n_rows, k = X.shape
+    S = np.sort(X, axis=0)                                  # NaN al final
+    valid = ~np.isnan(S)
+    n = valid.sum(axis=0)
+    last = np.maximum(n - 1, 0)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.nansum(S, axis=0) / n
+        std  = np.sqrt(np.nansum((S - mean) ** 2, axis=0) / (n - 1))
+    q = {p: _take(S, p * last) for p in (0.25, 0.5, 0.75)}
+
+    # Moda: longitud de racha de valores iguales sobre la columna ordenada
+    idx    = np.arange(n_rows)[:, None]
+    starts = np.ones_like(valid)
+    starts[1:] = S[1:] != S[:-1]
+    run_start = np.maximum.accumulate(np.where(starts, idx, 0), axis=0)
+    run_len   = np.where(valid, idx - run_start + 1, 0)
+    mode = np.take_along_axis(S, run_len.argmax(axis=0)[None, :], axis=0)[0]
+
+    # Bigotes: dato más extremo dentro de 1.5·IQR
+    iqr = q[0.75] - q[0.25]
+    lo_lim, hi_lim = q[0.25] - 1.5 * iqr, q[0.75] + 1.5 * iqr
+    with np.errstate(invalid="ignore"):
+        lowerfence = np.nanmin(np.where(S >= lo_lim, S, np.nan), axis=0, initial=np.inf)
+        upperfence = np.nanmax(np.where(S <= hi_lim, S, np.nan), axis=0, initial=-np.inf)
+
+    out = pd.DataFrame({
+        "count": n, "mean": mean, "std": std,
+        "min": S[0], "25%": q[0.25], "50%": q[0.5], "75%": q[0.75],
+        "max": np.take_along_axis(S, last[None, :], axis=0)[0],
+        "moda": mode, "lowerfence": lowerfence, "upperfence": upperfence,
+    }, index=columns)
+    empty = n == 0
+    out.loc[empty, out.columns != "count"] = np.nan
+    return out
+
+
+def describe_media(df_stat, columns=MEDIOS):
+    return describe_matrix(df_stat[columns].to_numpy(float), columns=columns)
+
+
+def descriptive_stats(desc):
+    """Tabla de Tab 3 a partir de describe_media()."""
+    return desc[["mean","50%","moda","std","min","max"]].rename(columns={
+        "mean":"Media","std":"Desv. Std","min":"Mínimo","max":"Máximo",
+        "50%":"Mediana","moda":"Moda"
+    })
+
+
+def tv_increments(df_v):
+    return df_v["TV_TOTAL"].diff().fillna(df_v["TV_TOTAL"].iloc[0])
+
+
+def internet_tv_correlation(df_hist, n_points=80):
+    """Tendencia lineal y Pearson entre penetración de internet e inversión TV."""
+    df_corr = df_hist[[INTERNET,"TV_TOTAL","AÑO"]].dropna()
+    X_c = df_corr[INTERNET].to_numpy(float)
+    y_c = df_corr["TV_TOTAL"].to_numpy(float)
+    slope, intercept = fit_trends(X_c, y_c)
+    x_line  = np.linspace(X_c.min(), X_c.max(), n_points)
+    y_line  = predict_trends(slope, intercept, x_line, floor=None)[:, 0]
+    corr_val = np.corrcoef(df_corr[INTERNET], df_corr["TV_TOTAL"])[0,1]
+    return df_corr, x_line, y_line, corr_val
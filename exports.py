@@ -0,0 +1,144 @@
+"""
+======================================================
+ EXPORTS — Descargas bajo demanda en CSV, Parquet y XLSX
+ Nada se serializa hasta que alguien lo pide; el
+ resultado queda en caché por hash de contenido.
+======================================================
+
+    from exports import export_bytes
+    data = export_bytes(df_full, "parquet")             # bytes, cacheado
+
+Los archivos se entregan completos: st.download_button necesita todos
+los bytes y no hay ruta de descarga que consuma un stream. iter_export
+convierte por bloques de CHUNK_ROWS filas (CSV y Parquet, un row group
+por bloque), pero export_bytes une los bloques en memoria y XLSX sólo
+sale al final, cuando se cierra el zip del libro.
+
+Parquet usa pyarrow y XLSX usa openpyxl; ambos se importan sólo al
+exportar en ese formato.
+"""
+
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from telemetry import gauge, span
+
+FORMATS = {
+    "csv":     ("text/csv", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "xlsx":    ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "xlsx"),
+}
+CHUNK_ROWS = 50_000
+_CACHE_MAX = 16
+
+_cache = OrderedDict()
+_lock  = threading.Lock()
+
+
+def content_hash(df):
+    """Hash estable de columnas + valores (no depende de la identidad del objeto)."""
+    h = hashlib.sha256("\x1f".join(map(str, df.columns)).encode())
+    h.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return h.hexdigest()[:16]
+
+
+# ─────────────────────────────────────────
+# GENERADORES POR BLOQUES
+# ─────────────────────────────────────────
+def _iter_csv(df, chunk_rows):
+    for start in range(0, max(len(df), 1), chunk_rows):
+        part = df.iloc[start:start + chunk_rows]
+        yield part.to_csv(index=False, header=start == 0).encode()
+
+
+def _iter_parquet(df, chunk_rows):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    sink = _ChunkSink()
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    with pq.ParquetWriter(sink, schema) as writer:
+        for start in range(0, max(len(df), 1), chunk_rows):
+            table = pa.Table.from_pandas(df.iloc[start:start + chunk_rows], schema=schema,
+                                         preserve_index=False)
+            writer.write_table(table)          # un row group por bloque
+            yield sink.drain()
+    yield sink.drain()
+
+
+def _iter_xlsx(df, chunk_rows):
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("datos")
+    ws.append(list(df.columns))
+    for start in range(0, len(df), chunk_rows):
+        for row in df.iloc[start:start + chunk_rows].itertuples(index=False):
+            ws.append([None if pd.isna(v) else v.item() if hasattr(v, "item") else v for v in row])
+    buf = io.BytesIO()
+    wb.save(buf)                         # el zip de XLSX sólo se cierra al final
+    buf.seek(0)
+    while chunk := buf.read(1 << 20):
+        yield chunk
+
+
+class _ChunkSink(io.RawIOBase):
+    """Destino de sólo escritura: acumula bytes hasta drain() y reporta la posición real."""
+    def __init__(self):
+        self._parts, self._pos = [], 0
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self._parts.append(bytes(b))
+        self._pos += len(b)
+        return len(b)
+
+    def tell(self):
+        return self._pos
+
+    def drain(self):
+        data, self._parts = b"".join(self._parts), []
+        return data
+
+
+_WRITERS = {"csv": _iter_csv, "parquet": _iter_parquet, "xlsx": _iter_xlsx}
+
+
+def iter_export(df, fmt, chunk_rows=CHUNK_ROWS):
+    """El archivo `fmt` de df como secuencia de bloques de bytes (export_bytes los une)."""
+    if fmt not in _WRITERS:
+        raise ValueError(f"Formato no soportado: {fmt!r} (use {', '.join(FORMATS)})")
+    for chunk in _WRITERS[fmt](df, chunk_rows):
+        if chunk:
+            yield chunk
+
+
+# ─────────────────────────────────────────
+# CACHÉ POR CONTENIDO
+# ─────────────────────────────────────────
+def export_bytes(df, fmt, digest=None):
+    """Archivo completo en bytes; se reutiliza mientras el contenido no cambie."""
+    key = (digest or content_hash(df), fmt)
+    with _lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+    with span(f"export.{fmt}"):
+        data = b"".join(iter_export(df, fmt))
+    gauge("export_bytes", len(data), format=fmt)
+    with _lock:
+        _cache[key] = data
+        while len(_cache) > _CACHE_MAX:
+            _cache.popitem(last=False)
+    return data
+
+
+def deferred(df, fmt):
+    """Callable sin argumentos para st.download_button: exporta sólo al hacer clic."""
+    return lambda: export_bytes(df, fmt)
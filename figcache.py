@@ -0,0 +1,64 @@
+"""
+======================================================
+ FIGCACHE — Caché LRU de figuras Plotly
+ Cada gráfica se indexa sólo por los filtros que usa,
+ así que mover un widget reconstruye únicamente las
+ figuras que dependen de él.
+======================================================
+
+Uso:
+
+    figs = FigureCache(maxsize=256)
+    fig  = figs.get("fig1b", yr_range, lambda: charts.fig_market_lines(df_v))
+
+Las figuras cacheadas se comparten entre sesiones y se tratan como
+inmutables: no modificarlas después de obtenerlas.
+"""
+
+import threading
+from collections import Counter, OrderedDict
+
+
+class FigureCache:
+    def __init__(self, maxsize=256):
+        self.maxsize   = maxsize
+        self._items    = OrderedDict()
+        self._lock     = threading.Lock()
+        self.hits      = Counter()
+        self.misses    = Counter()
+        self.evictions = 0
+
+    def get(self, name, key, build):
+        """Figura `name` para `key`; llama a build() sólo si no está en caché."""
+        full_key = (name, key)
+        with self._lock:
+            if full_key in self._items:
+                self._items.move_to_end(full_key)
+                self.hits[name] += 1
+                return self._items[full_key]
+            self.misses[name] += 1
+
+        fig = build()   # fuera del lock: dos sesiones pueden construir en paralelo
+
+        with self._lock:
+            self._items[full_key] = fig
+            self._items.move_to_end(full_key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+                self.evictions += 1
+        return fig
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def stats(self):
+        with self._lock:
+            names = sorted(set(self.hits) | set(self.misses))
+            hits, misses = sum(self.hits.values()), sum(self.misses.values())
+            return {
+                "size": len(self._items), "maxsize": self.maxsize,
+                "hits": hits, "misses": misses, "evictions": self.evictions,
+                "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+                "charts": {n: {"hits": self.hits[n], "misses": self.misses[n]} for n in names},
+            }
@@ -0,0 +1,304 @@
+"""
+======================================================
+ FORECAST — Varios modelos de pronóstico por serie
+ Lineal, log-lineal (CAGR), Holt y tendencia amortiguada,
+ elegidos por backtesting con origen móvil.
+======================================================
+
+    from forecast import forecast_frame
+    fc = forecast_frame(df_hist)              # caché en disco por hash de los datos
+    fc.best                                    # {"TOTAL_INV": "holt", …}
+    fc.scores                                  # MAPE de backtesting: serie × modelo
+    fc.projection                              # AÑO + columnas con el modelo elegido
+    fc.forecasts["damped"]                     # AÑO + columnas de un modelo
+
+Cada modelo es una función (y, orígenes, h) → matriz (orígenes, h) con
+el pronóstico de h pasos desde cada origen t ajustado sólo con y[:t];
+registrar uno nuevo es agregarlo a MODELS. El pronóstico final es el
+origen len(y). El backtesting evalúa a lo sumo MAX_ORIGINS orígenes
+repartidos en t ≥ MIN_TRAIN_YEARS años de datos, todos en una llamada
+(lineal y log-lineal: un ajuste cerrado por lotes de trend.py con una
+columna por origen; Holt: una sola pasada de la recursión, que es causal,
+guardando el estado en cada origen), y mide el MAPE de los periodos
+siguientes hasta el horizonte de la proyección; gana el menor MAPE
+promedio. Un modelo que no aplica a una serie (log-lineal con ceros)
+queda fuera de su selección.
+
+Horizonte y entrenamiento mínimo se cuentan en años y se pasan a
+periodos con la frecuencia del eje x (1 anual, 12 mensual, 365 diario):
+en datos mensuales el backtesting mira los mismos 6 años que en anuales.
+
+Las series se reparten en un ProcessPoolExecutor (spawn) cuando son
+PARALLEL_MIN_SERIES o más; el resultado se guarda en
+.cache/forecast-<hash>.json, así que sólo la primera construcción de una
+versión del dataset paga el ajuste. Precalentar:
+
+    python forecast.py [ruta.csv]
+"""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from multiprocessing import get_context
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from engine import BASE_DIR, PROJ_COLS, PROJ_YEARS
+from telemetry import count, span
+from trend import fit_trends, predict_trends
+
+CACHE_DIR = os.path.join(BASE_DIR, ".cache")
+FORECAST_VERSION = 2            # subir si cambia algún modelo o el backtesting
+MIN_TRAIN_YEARS = 8
+MAX_ORIGINS = 24                # orígenes del backtesting, repartidos en el histórico
+PARALLEL_MIN_SERIES = 16
+
+# Rejilla de suavizamiento: α nivel, β tendencia, φ amortiguación
+ALPHAS = np.linspace(0.1, 0.9, 9)
+BETAS  = np.array([0.05, 0.1, 0.2, 0.3, 0.5])
+PHIS   = np.array([0.8, 0.85, 0.9, 0.95, 0.98])
+
+
+# ─────────────────────────────────────────
+# MODELOS: (y, orígenes, h) → (orígenes, h)
+# ─────────────────────────────────────────
+def linear(y, origins, h):
+    """Una recta por origen: columna j = y hasta origins[j], NaN después (un solo ajuste por lotes)."""
+    t = np.arange(len(y), dtype=float)
+    origins = np.asarray(origins)
+    Y = np.where(t[:, None] < origins[None, :], y[:, None], np.nan)
+    slope, intercept = fit_trends(t, Y)
+    steps = origins[:, None] + np.arange(h)[None, :]
+    return intercept[:, None] + steps * slope[:, None]
+
+
+def loglinear(y, origins, h):
+    """Tasa de crecimiento constante (CAGR): recta sobre log(y). NaN en orígenes con ceros o negativos."""
+    origins = np.asarray(origins)
+    nonpos = np.concatenate([[0], np.cumsum(y <= 0)])[origins] > 0
+    with np.errstate(invalid="ignore", divide="ignore"):
+        pred = np.exp(linear(np.log(np.where(y > 0, y, np.nan)), origins, h))
+    pred[nonpos] = np.nan
+    return pred
+
+
+def _holt(y, origins, h, phis):
+    """Holt con amortiguación φ; α, β (y φ) por mínimo SSE a un paso sobre la rejilla.
+
+    La recursión sólo mira hacia atrás: el estado antes de la observación t
+    es el ajuste con y[:t], así que una pasada sirve para todos los orígenes.
+    """
+    a, b, p = (g.ravel() for g in np.meshgrid(ALPHAS, BETAS, phis, indexing="ij"))
+    steps = np.cumsum(p[None, :] ** np.arange(1, h + 1)[:, None], axis=0)      # φ + φ² + … + φʰ
+    at = {int(t): j for j, t in enumerate(origins)}
+    out = np.full((len(at), h), np.nan)
+    level = np.full(a.shape, y[0])
+    trend = np.full(a.shape, y[1] - y[0])
+    sse = np.zeros(a.shape)
+    for t in range(1, len(y) + 1):
+        if t in at:
+            i = np.argmin(sse)
+            out[at[t]] = level[i] + steps[:, i] * trend[i]
+        if t == len(y):
+            break
+        fc = level + p * trend
+        sse += (y[t] - fc) ** 2
+        new_level = a * y[t] + (1 - a) * fc
+        trend = b * (new_level - level) + (1 - b) * p * trend
+        level = new_level
+    return out
+
+
+def holt(y, origins, h):
+    return _holt(y, origins, h, np.array([1.0]))
+
+
+def damped(y, origins, h):
+    return _holt(y, origins, h, PHIS)
+
+
+MODELS = {
+    "linear":    linear,
+    "loglinear": loglinear,
+    "holt":      holt,
+    "damped":    damped,
+}
+MODEL_LABELS = {
+    "linear":    "Regresión lineal",
+    "loglinear": "Log-lineal (CAGR)",
+    "holt":      "Holt",
+    "damped":    "Holt amortiguado",
+}
+
+
+# ─────────────────────────────────────────
+# BACKTESTING (corre en los workers)
+# ─────────────────────────────────────────
+def periods_per_year(x):
+    """Frecuencia del eje x en años (1 anual, 12 mensual, …), por el paso mediano."""
+    d = np.diff(np.asarray(x, dtype=float))
+    d = d[d > 0]
+    return max(1, int(round(1 / np.median(d)))) if len(d) else 1
+
+
+def backtest_origins(n, min_train, max_origins=MAX_ORIGINS):
+    """Orígenes t ∈ [min_train, n) del backtesting; si son más de max_origins, repartidos parejo."""
+    origins = np.arange(min_train, n)
+    if len(origins) > max_origins:
+        origins = np.unique(np.linspace(min_train, n - 1, max_origins).round().astype(int))
+    return origins
+
+
+def backtest(y, model, horizon, min_train, max_origins=MAX_ORIGINS):
+    """MAPE (%) promedio de `model` pronosticando `horizon` periodos desde cada origen."""
+    origins = backtest_origins(len(y), min_train, max_origins)
+    if not len(origins):
+        return np.nan
+    pred = MODELS[model](y, origins, horizon)
+    idx = origins[:, None] + np.arange(horizon)[None, :]
+    valid = idx < len(y)
+    if np.isnan(pred[valid]).any():        # el modelo no aplica en algún origen
+        return np.nan
+    actual = y[np.minimum(idx, len(y) - 1)]
+    nz = valid & (actual != 0)             # el MAPE no está definido con valor real 0
+    err = np.abs(pred[nz] - actual[nz]) / np.abs(actual[nz])
+    return float(err.mean() * 100) if len(err) else np.nan
+
+
+def _fit_series(y, steps, ppy, models, floor):
+    """{modelo: (mape, pronóstico)} de una serie; NaN con MIN_TRAIN_YEARS años de datos o menos.
+
+    steps: periodos desde el último dato hasta cada año pedido (1, 2, … en anuales).
+    """
+    y = y[~np.isnan(y)]                    # huecos sólo al inicio o al final tras derive_columns
+    horizon, min_train = int(steps.max()), MIN_TRAIN_YEARS * ppy
+    out = {}
+    for m in models:
+        if len(y) <= min_train:
+            out[m] = (np.nan, np.full(len(steps), np.nan))
+            continue
+        pred = MODELS[m](y, [len(y)], horizon)[0, steps - 1]
+        if floor is not None:
+            pred = np.maximum(pred, floor)
+        out[m] = (backtest(y, m, horizon, min_train), pred)
+    return out
+
+
+def _fit_chunk(items, steps, ppy, models, floor):
+    return [(col, _fit_series(y, steps, ppy, models, floor)) for col, y in items]
+
+
+# ─────────────────────────────────────────
+# RESULTADO
+# ─────────────────────────────────────────
+class ForecastSet(NamedTuple):
+    scores: pd.DataFrame        # MAPE de backtesting, serie × modelo
+    best: dict                  # serie → modelo elegido
+    forecasts: dict             # modelo → DataFrame AÑO + series
+    projection: pd.DataFrame    # AÑO + series con el modelo elegido de cada una
+
+
+def _assemble(fits, cols, future_idx, models):
+    scores = pd.DataFrame({m: [fits[c][m][0] for c in cols] for m in models}, index=cols)
+    best = {c: (scores.loc[c].idxmin() if scores.loc[c].notna().any() else "linear") for c in cols}
+    years = np.asarray(future_idx)
+    forecasts = {m: pd.DataFrame({"AÑO": years, **{c: fits[c][m][1] for c in cols}}) for m in models}
+    projection = pd.DataFrame({"AÑO": years, **{c: forecasts[best[c]][c].to_numpy() for c in cols}})
+    return ForecastSet(scores, best, forecasts, projection)
+
+
+def fit_all(x, Y, cols, future_idx, models=None, floor=0.0, workers=None):
+    """{serie: {modelo: (mape, pronóstico)}}, en paralelo si hay suficientes series."""
+    models = list(models or MODELS)
+    x = np.asarray(x, dtype=float)
+    ppy = periods_per_year(x)
+    steps = np.maximum(np.rint((np.asarray(future_idx, dtype=float) - x[-1]) * ppy).astype(int), 1)
+    items = list(zip(cols, np.asarray(Y, dtype=float).T))
+    if workers == 1 or len(items) < PARALLEL_MIN_SERIES:
+        return dict(_fit_chunk(items, steps, ppy, models, floor))
+    workers = workers or os.cpu_count() or 1
+    n_chunks = min(len(items), workers * 4)
+    chunks = [items[i::n_chunks] for i in range(n_chunks)]
+    with ProcessPoolExecutor(workers, mp_context=get_context("spawn")) as pool:
+        parts = pool.map(_fit_chunk, chunks, repeat(steps), repeat(ppy), repeat(models), repeat(floor))
+        return dict(r for part in parts for r in part)
+
+
+# ─────────────────────────────────────────
+# CACHÉ (memoria + disco)
+# ─────────────────────────────────────────
+_mem_cache = OrderedDict()
+_mem_lock  = threading.Lock()
+
+
+def _digest(x, Y, cols, future_idx, models, floor):
+    h = hashlib.sha256(f"forecast-{FORECAST_VERSION}\n".encode())
+    h.update(np.ascontiguousarray(x, dtype=float).tobytes())
+    h.update(np.ascontiguousarray(Y, dtype=float).tobytes())
+    h.update(repr((list(cols), [int(v) for v in future_idx], list(models), floor, MIN_TRAIN_YEARS, MAX_ORIGINS)).encode())
+    return h.hexdigest()[:16]
+
+
+def _read(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            raw = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+    return {c: {m: (np.nan if s is None else s, np.array(p, dtype=float)) for m, (s, p) in fm.items()}
+            for c, fm in raw.items()}
+
+
+def _write(path, fits):
+    """JSON con los NaN como null; el archivo aparece de forma atómica, con permisos del umask."""
+    clean = lambda v: None if np.isnan(v) else float(v)
+    raw = {c: {m: [clean(s), [clean(v) for v in p]] for m, (s, p) in fm.items()} for c, fm in fits.items()}
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(raw, f)
+    os.replace(tmp, path)
+
+
+def forecast_frame(df, cols=PROJ_COLS, future_idx=PROJ_YEARS, models=None, floor=0.0,
+                   workers=None, cache_dir=CACHE_DIR):
+    """ForecastSet de las columnas `cols` de df (AÑO + series) para los años future_idx."""
+    models = list(models or MODELS)
+    x, Y = df["AÑO"].to_numpy(float), df[cols].to_numpy(float)
+    key = _digest(x, Y, cols, future_idx, models, floor)
+    with _mem_lock:
+        if key in _mem_cache:
+            _mem_cache.move_to_end(key)
+            return _mem_cache[key]
+
+    path = os.path.join(cache_dir, f"forecast-{key}.json")
+    fits = _read(path)
+    if fits is None:
+        count("forecast_cache_misses")
+        with span("forecast.fit"):
+            fits = fit_all(x, Y, cols, future_idx, models, floor, workers)
+        try:
+            _write(path, fits)
+        except OSError:
+            pass                            # disco de sólo lectura: queda en memoria
+    result = _assemble(fits, cols, future_idx, models)
+    with _mem_lock:
+        _mem_cache[key] = result
+        while len(_mem_cache) > 64:
+            _mem_cache.popitem(last=False)
+    return result
+
+
+if __name__ == "__main__":
+    from engine import DATA_PATH, build_dataset
+
+    df_hist, _ = build_dataset(sys.argv[1] if len(sys.argv) > 1 else DATA_PATH)
+    fc = forecast_frame(df_hist)
+    print(fc.scores.round(2).assign(ELEGIDO=pd.Series(fc.best)).to_string())
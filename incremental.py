@@ -0,0 +1,104 @@
+"""
+======================================================
+ INCREMENTAL — Agregar años nuevos sin reconstruir
+ Columnas derivadas calculadas sólo sobre las filas
+ nuevas y tendencias actualizadas con sumas corrientes.
+======================================================
+
+    from incremental import IncrementalDataset
+    inc = IncrementalDataset.build()                 # una vez: build_dataset completo
+    df_hist, df_full = inc.append(nuevos)            # cada entrega de IBOPE/Kantar
+
+`nuevos` tiene el esquema del CSV (AÑO + medios + macro) con años
+posteriores al último histórico. append():
+
+  1. interpola sólo la ventana [último año, años nuevos], así que los
+     huecos entre entregas quedan lineales como en derive_columns;
+  2. calcula PIB, agregados, shares y VAR_YOY de esas filas (VAR_YOY
+     usa la fila anterior, que ya está en la ventana);
+  3. suma las filas a los estadísticos de TrendStats y re-predice sólo
+     las series con datos nuevos; las filas proyectadas de años que ya
+     son históricos se descartan.
+
+Los huecos al final de una entrega se rellenan con el último valor,
+como en build_dataset, y no se corrigen cuando llega el dato real;
+para revisiones de años ya cargados use build_dataset.
+
+Es una biblioteca para cargas por lotes: DatasetWatcher (watcher.py)
+sigue reconstruyendo el dataset completo cuando cambia el CSV.
+"""
+
+import numpy as np
+import pandas as pd
+
+from engine import DATA_PATH, DERIVED_COLS, PROJ_COLS, add_derived, build_dataset, projection_years
+from telemetry import span
+from trend import TrendStats, predict_trends
+
+
+class IncrementalDataset:
+    """df_hist/df_full que crecen por filas, con ajustes de tendencia acumulados."""
+
+    def __init__(self, df_hist, df_full, cols=PROJ_COLS, floor=0.0):
+        self.cols    = list(cols)
+        self.floor   = floor
+        self.df_hist = df_hist.reset_index(drop=True)
+        self.df_proj = df_full[df_full["PROYECCION"] == True].reset_index(drop=True)
+        self.raw_cols = [c for c in self.df_hist.columns if c not in DERIVED_COLS + ["PROYECCION"]]
+        years = self.df_hist["AÑO"].to_numpy(float)
+        self.stats = TrendStats.from_data(years, self.df_hist[self.cols].to_numpy(float), x0=years[0])
+
+    @classmethod
+    def build(cls, path=DATA_PATH, **kwargs):
+        """Desde el CSV, hasta su último año con datos: append() sigue desde ahí."""
+        return cls(*build_dataset(path), **kwargs)
+
+    @property
+    def last_year(self):
+        return int(self.df_hist["AÑO"].iloc[-1])
+
+    @property
+    def df_full(self):
+        return pd.concat([self.df_hist, self.df_proj], ignore_index=True)
+
+    def append(self, new_raw):
+        """Agrega filas crudas posteriores al último año; devuelve (df_hist, df_full)."""
+        new = new_raw.copy()
+        num_cols = [c for c in new.columns if c != "AÑO"]
+        new[num_cols] = new[num_cols].apply(pd.to_numeric, errors="coerce")
+        new = new.sort_values("AÑO")
+        last = self.last_year
+        if new.empty:
+            return self.df_hist, self.df_full
+        if (new["AÑO"] <= last).any():
+            raise ValueError(f"append sólo acepta años posteriores a {last}; "
+                             "para revisiones use build_dataset")
+        unknown = set(new.columns) - set(self.raw_cols)
+        if unknown:
+            raise ValueError(f"Columnas desconocidas: {sorted(unknown)}")
+
+        with span("incremental.derive"):
+            window = pd.concat([self.df_hist[self.raw_cols].iloc[[-1]], new], ignore_index=True)
+            window = (window.set_index("AÑO").reindex(range(last, int(new["AÑO"].max()) + 1))
+                      .interpolate(method="linear").reset_index())
+            rows = add_derived(window[self.raw_cols]).iloc[1:].copy()
+            rows["PROYECCION"] = False
+            self.df_hist = pd.concat([self.df_hist, rows[self.df_hist.columns]], ignore_index=True)
+
+        with span("incremental.projections"):
+            touched = self.stats.update(rows["AÑO"].to_numpy(float), rows[self.cols].to_numpy(float))
+            self._refresh_projection(touched)
+        return self.df_hist, self.df_full
+
+    def _refresh_projection(self, touched):
+        """Quita años ya observados y re-predice sólo las series con datos nuevos."""
+        future = projection_years(self.last_year)
+        proj = self.df_proj[self.df_proj["AÑO"].isin(future)].reset_index(drop=True)
+        if len(proj) < len(future):                  # horizonte sin filas previas: todo de nuevo
+            proj = pd.DataFrame({"AÑO": future, "PROYECCION": True}).reindex(columns=self.df_proj.columns)
+            touched = np.ones(len(self.cols), bool)
+        if touched.any() and len(future):
+            slope, intercept = self.stats.solve()
+            cols = [c for c, t in zip(self.cols, touched) if t]
+            proj[cols] = predict_trends(slope[touched], intercept[touched], future, self.floor)
+        self.df_proj = proj
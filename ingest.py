@@ -0,0 +1,271 @@
+"""
+======================================================
+ INGEST — Logs de pauta (spots/inserciones) → CSV anual
+ Lectura por bloques, mapeo de canales a los medios del
+ dashboard y group-by incremental; memoria acotada por
+ el tamaño del bloque, no por el del archivo.
+======================================================
+
+    python ingest.py exports/*.csv exports/*.xlsx --out cleaned_ad_data.csv \\
+        --macro cleaned_ad_data.csv
+    python ingest.py logs/*.csv --market-col PAIS --long --out markets_long.csv
+
+Cada archivo se procesa en un worker (ProcessPoolExecutor, spawn):
+CSV con read_csv(chunksize=…) y XLSX con openpyxl en modo read_only,
+ambos en bloques de --chunk-rows filas. Por bloque se calcula el año,
+se mapean los canales (las reglas se evalúan una vez por canal distinto,
+no por fila) y se suma por (mercado, año, medio); sólo esas sumas
+parciales viajan de vuelta y se combinan.
+
+La salida tiene el esquema de cleaned_ad_data.csv: AÑO, los siete medios,
+TOTAL_INV y, con --macro, las columnas IPC/TRM/internet/población de
+ese archivo por año. Con --long se escribe el formato de markets.py.
+Los valores se dividen por --divisor (por defecto 1e6: pesos → millones,
+la unidad del CSV). Los canales sin regla se reportan y no se suman.
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+import unicodedata
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from engine import MEDIOS
+from telemetry import span
+
+CHUNK_ROWS = 250_000
+MACRO_COLS = ["IPC", "TRM Promedio", "Penetración Internet (%)", "Poblacion DANE"]
+CSV_COLUMNS = ["AÑO","TV REG Y LOCAL","REVISTAS","PUB EXTERIOR","PRENSA","RADIO","TV NACIONAL",
+               "DIGITAL","TOTAL_INV"]
+
+# Canal crudo (normalizado: mayúsculas, sin tildes) → medio; la primera regla que coincide gana.
+# Las plataformas van primero: "YouTube TV" o "Google TV" son pauta digital, no televisión
+MEDIA_RULES = [
+    (r"FACEBOOK|INSTAGRAM|\bMETA\b|GOOGLE|YOUTUBE|TIKTOK|TWITTER|LINKEDIN|PINTEREST|SNAPCHAT|"
+     r"SPOTIFY|WHATSAPP", "DIGITAL"),
+    (r"(\bTV\b|\bCANAL\b|TELEVISION).*\b(REGIONAL|LOCAL)\b|\b(REGIONAL|LOCAL)\b.*(\bTV\b|TELEVISION)|"
+     r"TELEANTIOQUIA|TELECARIBE|TELEPACIFICO|TELECAFE|CANAL TRO|"
+     r"TELEISLAS|CANAL CAPITAL|CITY ?TV|\bTV REG", "TV REG Y LOCAL"),
+    (r"\bTV\b|TELEVISION|CARACOL TV|\bRCN\b(?! RADIO)|CANAL UNO|CANAL 1\b|SENAL COLOMBIA|\bCTV\b|TV PAGA|"
+     r"CABLE", "TV NACIONAL"),
+    (r"DIGITAL|INTERNET|ONLINE|DISPLAY|SEARCH|SOCIAL|STREAMING|PROGRAMATIC|VIDEO ONLINE|"
+     r"\bWEB\b|MOBILE|APP\b", "DIGITAL"),
+    (r"RADIO|\bAM\b|\bFM\b|EMISORA", "RADIO"),
+    (r"REVISTA", "REVISTAS"),
+    (r"PRENSA|PERIODICO|DIARIO|\bPRINT\b", "PRENSA"),
+    (r"EXTERIOR|\bOOH\b|\bDOOH\b|VALLA|PANTALLA|MOBILIARIO|TRANSPORTE|OUT OF HOME", "PUB EXTERIOR"),
+]
+_RULES = [(re.compile(p), medio) for p, medio in MEDIA_RULES]
+
+
+class LogSpec(NamedTuple):
+    """Columnas del log crudo y cómo convertirlas."""
+    channel_col: str = "CANAL"
+    value_col: str   = "INVERSION"
+    date_col: str    = "FECHA"
+    year_col: str    = None          # si el log ya trae el año, no se parsean fechas
+    market_col: str  = None
+    date_format: str = None          # p. ej. "%d/%m/%Y"; None = inferir (ISO8601)
+    divisor: float   = 1e6
+    chunk_rows: int  = CHUNK_ROWS
+
+    @property
+    def columns(self):
+        cols = [self.channel_col, self.value_col, self.year_col or self.date_col]
+        return cols + [self.market_col] if self.market_col else cols
+
+
+# ─────────────────────────────────────────
+# MAPEO DE CANALES
+# ─────────────────────────────────────────
+def normalize(text):
+    text = unicodedata.normalize("NFKD", str(text)).encode("ascii", "ignore").decode()
+    return re.sub(r"\s+", " ", text.upper()).strip()
+
+
+def map_channel(channel):
+    """Medio del dashboard para un canal crudo, o None si ninguna regla coincide."""
+    name = normalize(channel)
+    for rx, medio in _RULES:
+        if rx.search(name):
+            return medio
+    return None
+
+
+def map_channels(values, cache):
+    """Vector de medios (object, None = sin mapeo); las reglas corren una vez por valor distinto."""
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    for u in uniques:
+        if u not in cache:
+            cache[u] = map_channel(u)
+    mapped = np.array([cache[u] for u in uniques] + [None], dtype=object)
+    return mapped[codes]                      # código -1 (NaN) → último elemento, None
+
+
+# ─────────────────────────────────────────
+# LECTURA POR BLOQUES
+# ─────────────────────────────────────────
+def iter_chunks(path, spec):
+    """DataFrames de como máximo spec.chunk_rows filas con sólo las columnas de spec."""
+    lower = path.lower()
+    if lower.endswith((".xlsx", ".xlsm")):
+        yield from _iter_xlsx(path, spec)
+    else:
+        yield from pd.read_csv(path, usecols=spec.columns, chunksize=spec.chunk_rows,
+                               dtype={spec.channel_col: "string"})
+
+
+def _iter_xlsx(path, spec):
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = wb.worksheets[0].iter_rows(values_only=True)
+        header = [str(h) if h is not None else "" for h in next(rows)]
+        missing = set(spec.columns) - set(header)
+        if missing:
+            raise ValueError(f"{path}: faltan columnas {sorted(missing)}")
+        idx = [header.index(c) for c in spec.columns]
+        batch = []
+        for row in rows:
+            batch.append([row[i] for i in idx])
+            if len(batch) >= spec.chunk_rows:
+                yield pd.DataFrame(batch, columns=spec.columns)
+                batch = []
+        if batch:
+            yield pd.DataFrame(batch, columns=spec.columns)
+    finally:
+        wb.close()
+
+
+# ─────────────────────────────────────────
+# AGREGACIÓN INCREMENTAL
+# ─────────────────────────────────────────
+def _years(chunk, spec):
+    if spec.year_col:
+        return pd.to_numeric(chunk[spec.year_col], errors="coerce")
+    dates = pd.to_datetime(chunk[spec.date_col], errors="coerce",
+                           format=spec.date_format or "ISO8601", cache=True)
+    return dates.dt.year
+
+
+def aggregate_chunk(chunk, spec, cache, unmapped):
+    """(suma de valor por (MERCADO, AÑO, MEDIO), filas válidas) de un bloque; acumula canales sin regla."""
+    medio  = map_channels(chunk[spec.channel_col].to_numpy(object), cache)
+    year   = _years(chunk, spec).to_numpy(float)
+    value  = pd.to_numeric(chunk[spec.value_col], errors="coerce").to_numpy(float)
+    market = chunk[spec.market_col].astype("string").to_numpy(object) if spec.market_col else "TODOS"
+
+    mapped = pd.notna(medio)
+    ok = mapped & ~np.isnan(year) & ~np.isnan(value)
+    if not mapped.all():
+        lost = chunk.loc[~mapped, spec.channel_col]
+        unmapped.update(lost.fillna("<vacío>").astype(str).value_counts().to_dict())
+    frame = pd.DataFrame({"MERCADO": market, "AÑO": year, "MEDIO": medio, "VALOR": value})[ok]
+    return frame.groupby(["MERCADO", "AÑO", "MEDIO"], sort=False)["VALOR"].sum(), int(ok.sum())
+
+
+def ingest_file(path, spec):
+    """(sumas parciales, filas leídas, filas usadas, Counter de canales sin mapeo) de un archivo."""
+    total, cache, unmapped, n_rows, n_used = None, {}, Counter(), 0, 0
+    for chunk in iter_chunks(path, spec):
+        part, used = aggregate_chunk(chunk, spec, cache, unmapped)
+        n_rows += len(chunk)
+        n_used += used
+        total = part if total is None else total.add(part, fill_value=0.0)
+    return total, n_rows, n_used, unmapped
+
+
+def ingest(paths, spec=LogSpec(), workers=None):
+    """Agrega todos los archivos → (Serie (MERCADO, AÑO, MEDIO) → valor, resumen)."""
+    with span("ingest.read"):
+        if workers == 1 or len(paths) == 1:
+            parts = [ingest_file(p, spec) for p in paths]
+        else:
+            with ProcessPoolExecutor(min(workers or os.cpu_count() or 1, len(paths)),
+                                     mp_context=get_context("spawn")) as pool:
+                parts = list(pool.map(ingest_file, paths, [spec] * len(paths)))
+
+    totals = [t for t, *_ in parts if t is not None]
+    agg = pd.concat(totals).groupby(level=[0, 1, 2]).sum() if totals else pd.Series(dtype=float)
+    unmapped = Counter()
+    for *_, u in parts:
+        unmapped.update(u)
+    summary = {"files": len(paths), "rows": sum(p[1] for p in parts),
+               "rows_used": sum(p[2] for p in parts), "unmapped": dict(unmapped.most_common())}
+    return agg / spec.divisor, summary
+
+
+# ─────────────────────────────────────────
+# SALIDA
+# ─────────────────────────────────────────
+def to_table(agg, macro=None):
+    """Tabla ancha con el esquema de cleaned_ad_data.csv (un solo mercado o la suma de todos)."""
+    wide = agg.groupby(level=["AÑO", "MEDIO"]).sum().unstack("MEDIO").reindex(columns=MEDIOS)
+    wide = wide.fillna(0.0)
+    wide.index = wide.index.astype(int)
+    wide["TOTAL_INV"] = wide[MEDIOS].sum(axis=1)
+    table = wide.rename_axis("AÑO").reset_index()[CSV_COLUMNS]
+    if macro is not None:
+        table = table.merge(macro[["AÑO"] + MACRO_COLS], on="AÑO", how="left")
+    return table
+
+
+def to_long_table(agg):
+    """Formato largo de markets.py: MERCADO, AÑO, MEDIO, VALOR."""
+    df = agg.rename("VALOR").reset_index()
+    df["AÑO"] = df["AÑO"].astype(int)
+    return df.sort_values(["MERCADO", "AÑO", "MEDIO"], ignore_index=True)
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Agrega logs de pauta (CSV/XLSX) a inversión anual por medio.")
+    p.add_argument("paths", nargs="+", help="archivos .csv/.csv.gz/.xlsx")
+    p.add_argument("--out", required=True, help="CSV de salida")
+    p.add_argument("--channel-col", default="CANAL")
+    p.add_argument("--value-col", default="INVERSION")
+    p.add_argument("--date-col", default="FECHA")
+    p.add_argument("--year-col", help="columna con el año (evita parsear fechas)")
+    p.add_argument("--date-format", help="formato strptime de las fechas (por defecto ISO8601)")
+    p.add_argument("--market-col", help="columna de mercado/país")
+    p.add_argument("--divisor", type=float, default=1e6, help="divide los valores (1e6: pesos → millones)")
+    p.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    p.add_argument("--workers", type=int, default=None)
+    p.add_argument("--macro", help="CSV con IPC/TRM/internet/población por AÑO para completar la tabla")
+    p.add_argument("--long", action="store_true", help="escribir formato largo (MERCADO, AÑO, MEDIO, VALOR)")
+    args = p.parse_args(argv)
+
+    spec = LogSpec(args.channel_col, args.value_col, args.date_col, args.year_col, args.market_col,
+                   args.date_format, args.divisor, args.chunk_rows)
+    t0 = time.perf_counter()
+    agg, summary = ingest(args.paths, spec, args.workers)
+    if agg.empty:
+        print("Ninguna fila válida: revise columnas y reglas de canales.", file=sys.stderr)
+        return 1
+    if args.long:
+        table = to_long_table(agg)
+    else:
+        table = to_table(agg, pd.read_csv(args.macro) if args.macro else None)
+
+    tmp = f"{args.out}.{os.getpid()}.tmp"
+    table.to_csv(tmp, index=False)
+    os.replace(tmp, args.out)               # el watcher nunca ve un CSV a medias
+
+    print(f"{summary['rows']:,} filas de {summary['files']} archivo(s), {summary['rows_used']:,} usadas "
+          f"→ {args.out} ({len(table)} filas, {time.perf_counter()-t0:.1f} s)")
+    if summary["unmapped"]:
+        top = ", ".join(f"{k} ({v:,})" for k, v in list(summary["unmapped"].items())[:10])
+        print(f"Canales sin mapeo: {top}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+"""
+======================================================
+ MARKETS — Modelo largo multi-mercado
+ (MERCADO, AÑO, MEDIO, VALOR) → un dataset derivado y
+ proyectado por mercado, construido en un pool de
+ procesos y consultado sin recorrer los mercados.
+======================================================
+
+    from markets import build_markets, to_long
+    mset = build_markets(pd.read_csv("markets_long.csv"))
+    df_hist, df_full = mset.get("Perú")                  # dict, O(1)
+    mset.cube.means((2010, 2020), market="Perú")         # un cubo para todos
+    mset.correlations.matrix((2010, 2020), market="Perú")   # medios × indicadores macro
+
+Formato largo: una fila por (MERCADO, AÑO, MEDIO, VALOR). MEDIO es un
+medio (TV NACIONAL, DIGITAL …, más los que tenga cada mercado), TOTAL_INV
+o una serie macro del mercado (MACRO_SERIES: IPC, TRM, penetración de
+internet, población, PIB). Si hay varias filas por año (meses, spots) se
+agregan a año: suma para medios, promedio para macro. Un mercado sin
+algún medio base lo cuenta como 0; sin TOTAL_INV se usa la suma de medios;
+sin PIB_PCT queda en NaN (PIB_MAP es sólo de Colombia).
+
+Cada mercado pasa por derive_columns, add_derived y project de engine.py
+con su propio rango de años. Con PARALLEL_MIN_MARKETS mercados o más, el
+trabajo se reparte en bloques a un ProcessPoolExecutor (spawn: seguro
+dentro de un servidor con hilos).
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from multiprocessing import get_context
+
+import numpy as np
+import pandas as pd
+
+from correlation import correlation_cube
+from cube import MediaCube
+from engine import (
+    BASE_DIR, INTERNET, MEDIOS, YEAR_MAX, derive_columns, project, projection_years,
+)
+from store import freeze
+from telemetry import span
+
+MARKETS_PATH   = os.environ.get("AD_MARKETS_FILE") or os.path.join(BASE_DIR, "markets_long.csv")
+DEFAULT_MARKET = "Colombia"
+MACRO_SERIES   = ["IPC", "TRM Promedio", INTERNET, "Poblacion DANE", "PIB_PCT"]
+LONG_COLS      = ["MERCADO", "AÑO", "MEDIO", "VALOR"]
+PARALLEL_MIN_MARKETS = 16
+
+
+# ─────────────────────────────────────────
+# FORMATO LARGO ⇄ ANCHO
+# ─────────────────────────────────────────
+def to_long(df_wide, market=DEFAULT_MARKET):
+    """CSV ancho (una columna por medio/macro) → formato largo; respeta MERCADO si existe."""
+    df = df_wide.drop(columns=["PERIODO"], errors="ignore")
+    if "MERCADO" not in df.columns:
+        df = df.assign(MERCADO=market)
+    value_cols = [c for c in df.columns if c not in ("MERCADO", "AÑO")]
+    return df.melt(id_vars=["MERCADO", "AÑO"], value_vars=value_cols, var_name="MEDIO", value_name="VALOR")
+
+
+def to_wide(df_long):
+    """Formato largo → una fila por (MERCADO, AÑO) y una columna por medio o serie macro."""
+    df = df_long.assign(AÑO=np.floor(pd.to_numeric(df_long["AÑO"])).astype(int),
+                        VALOR=pd.to_numeric(df_long["VALOR"], errors="coerce"))
+    is_macro = df["MEDIO"].isin(MACRO_SERIES)
+    media = df[~is_macro].pivot_table(index=["MERCADO", "AÑO"], columns="MEDIO", values="VALOR",
+                                      aggfunc="sum", min_count=1)
+    macro = df[is_macro].pivot_table(index=["MERCADO", "AÑO"], columns="MEDIO", values="VALOR",
+                                     aggfunc="mean")
+    wide = media.join(macro, how="outer").sort_index()
+    wide.columns.name = None
+    return wide
+
+
+# ─────────────────────────────────────────
+# CONSTRUCCIÓN POR MERCADO (corre en los workers)
+# ─────────────────────────────────────────
+def derive_market(wide_m, year_max=YEAR_MAX):
+    """df_hist, df_full de un mercado a partir de sus filas anchas (AÑO + columnas)."""
+    raw = wide_m.dropna(axis=1, how="all").copy()
+    for m in MEDIOS:
+        if m not in raw.columns:
+            raw[m] = 0.0
+    extra = [c for c in raw.columns if c not in MEDIOS + MACRO_SERIES + ["AÑO", "TOTAL_INV"]]
+    if "TOTAL_INV" not in raw.columns:
+        raw["TOTAL_INV"] = raw[MEDIOS + extra].sum(axis=1)
+    pib = raw.pop("PIB_PCT").set_axis(raw["AÑO"]) if "PIB_PCT" in raw.columns else None
+
+    first = int(raw["AÑO"].min())
+    last  = min(int(raw["AÑO"].max()), year_max)
+    df = derive_columns(raw, year_max=last, year_min=first)
+    df["PIB_PCT"] = df["AÑO"].map(pib) if pib is not None else np.nan
+    df_proj = project(df, future_idx=projection_years(last))
+    df["PROYECCION"] = False
+    return df, pd.concat([df, df_proj], ignore_index=True)
+
+
+def _build_chunk(items, year_max):
+    return [(market, *derive_market(wide_m, year_max)) for market, wide_m in items]
+
+
+# ─────────────────────────────────────────
+# CONJUNTO DE MERCADOS
+# ─────────────────────────────────────────
+class MarketSet:
+    """Resultados precalculados: mercado → (df_hist, df_full), un cubo y un cubo de correlaciones con todos."""
+
+    def __init__(self, results):
+        self.markets = [m for m, _, _ in results]
+        self._frames = {}
+        for market, df_hist, df_full in results:
+            df_full = freeze(df_full)
+            self._frames[market] = (df_full.iloc[:len(df_hist)], df_full)
+        stacked = pd.concat([h.assign(MERCADO=m) for m, (h, _) in self._frames.items()], ignore_index=True)
+        self.cube = MediaCube.from_markets(stacked, markets=self.markets)
+        self.correlations = correlation_cube(stacked, markets=self.markets)
+
+    def __len__(self):
+        return len(self.markets)
+
+    def __contains__(self, market):
+        return market in self._frames
+
+    def get(self, market):
+        return self._frames[market]
+
+
+def build_results(df_long, year_max=YEAR_MAX, workers=None):
+    """[(mercado, df_hist, df_full)] de todos los mercados de df_long, en paralelo si vale la pena."""
+    with span("markets.pivot"):
+        wide = to_wide(df_long)
+        items = [(m, g.droplevel("MERCADO").reset_index())
+                 for m, g in wide.groupby(level="MERCADO", sort=True)]
+    with span("markets.build"):
+        if workers == 1 or len(items) < PARALLEL_MIN_MARKETS:
+            return _build_chunk(items, year_max)
+        workers = workers or os.cpu_count() or 1
+        n_chunks = min(len(items), workers * 4)
+        chunks = [items[i::n_chunks] for i in range(n_chunks)]
+        with ProcessPoolExecutor(workers, mp_context=get_context("spawn")) as pool:
+            parts = pool.map(_build_chunk, chunks, repeat(year_max))
+            results = [r for part in parts for r in part]
+    order = {m: i for i, (m, _) in enumerate(items)}
+    return sorted(results, key=lambda r: order[r[0]])
+
+
+def build_markets(df_long, year_max=YEAR_MAX, workers=None):
+    return MarketSet(build_results(df_long, year_max, workers))
+
+
+def load_markets(df_hist, df_full, path=MARKETS_PATH, workers=None):
+    """Colombia (el dataset principal, ya construido) más los mercados de `path` si existe."""
+    results = [(DEFAULT_MARKET, df_hist, df_full)]
+    if os.path.exists(path):
+        df_long = pd.read_csv(path)
+        df_long = df_long[df_long["MERCADO"] != DEFAULT_MARKET]
+        results += build_results(df_long, workers=workers)
+    return MarketSet(results)
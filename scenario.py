@@ -0,0 +1,144 @@
+"""
+======================================================
+ SCENARIO — Simulador Monte Carlo de presupuestos
+ "¿Y si digital crece 15% anual y TV NACIONAL se queda
+ plana hasta 2031?": miles de trayectorias por medio
+ y bandas de cuantiles del total y de los shares.
+======================================================
+
+    from scenario import Assumption, default_assumptions, simulate
+    base = default_assumptions(df_hist)          # {medio: Assumption(crecimiento, volatilidad)}
+    sc = simulate(df_hist, {**base, "DIGITAL": Assumption(0.15, 0.10),
+                                    "TV NACIONAL": Assumption(0.0, 0.05)})
+    sc.median                                    # AÑO + TOTAL_INV, TV_SHARE, DIG_SHARE
+    sc.bands[0.8]                                # (lower, upper) como projection_intervals
+
+Cada medio sigue un crecimiento lognormal desde su último año: el log
+del factor anual es N(log(1 + g) − σ²/2, σ), así que g es el crecimiento
+esperado y σ la volatilidad. Las N_PATHS trayectorias de un medio salen
+de un solo lote de normales (n_paths × años) y un cumsum. Los medios son
+independientes y cada uno usa su propia semilla (SeedSequence de la
+semilla global y el nombre del medio), así que sus trayectorias sólo
+dependen de sus supuestos: se cachean por medio y, al editar uno, sólo
+ese se vuelve a simular; el resto es sumar matrices y sacar cuantiles.
+El total del escenario es la suma de los medios simulados.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from engine import MEDIOS, PI_LEVELS, PROJ_YEARS
+from telemetry import count, span
+
+N_PATHS = 20_000
+SEED = 2031
+ASSUMPTION_YEARS = 10          # ventana del histórico para los supuestos por defecto
+TV_MEDIA = ["TV REG Y LOCAL", "TV NACIONAL"]
+SCENARIO_COLS = ["TOTAL_INV", "TV_SHARE", "DIG_SHARE"]
+_CACHE_MAX = 128
+
+
+class Assumption(NamedTuple):
+    growth: float               # crecimiento anual esperado (0.15 = +15%)
+    volatility: float           # desviación estándar del log-crecimiento anual
+
+
+class Scenario(NamedTuple):
+    median: pd.DataFrame        # AÑO + SCENARIO_COLS, mediana de las trayectorias
+    bands: dict                 # {nivel: (lower, upper)} DataFrames AÑO + SCENARIO_COLS
+    n_paths: int
+
+
+# ─────────────────────────────────────────
+# SUPUESTOS POR DEFECTO
+# ─────────────────────────────────────────
+def default_assumptions(df_hist, media=MEDIOS, years=ASSUMPTION_YEARS):
+    """CAGR y volatilidad del log-crecimiento de cada medio en sus últimos `years` años."""
+    out = {}
+    for m in media:
+        y = df_hist[m].to_numpy(float)[-(years + 1):]
+        y = y[np.isfinite(y) & (y > 0)]
+        if len(y) < 3:
+            out[m] = Assumption(0.0, 0.0)
+            continue
+        r = np.diff(np.log(y))
+        out[m] = Assumption(round(float(np.expm1(r.mean())), 3) + 0.0, round(float(r.std(ddof=1)), 3))   # + 0.0: sin -0.0
+    return out
+
+
+# ─────────────────────────────────────────
+# TRAYECTORIAS POR MEDIO (cacheadas)
+# ─────────────────────────────────────────
+_paths_cache = OrderedDict()
+_paths_lock  = threading.Lock()
+
+
+def _rng(medium, seed):
+    tag = int.from_bytes(hashlib.sha256(medium.encode()).digest()[:8], "little")
+    return np.random.default_rng(np.random.SeedSequence([seed, tag]))
+
+
+def simulate_medium(medium, base, assumption, horizon, n_paths=N_PATHS, seed=SEED):
+    """(n_paths, horizon) valores simulados de un medio desde `base`; cacheado por supuestos."""
+    key = (medium, float(base), tuple(map(float, assumption)), horizon, n_paths, seed)
+    with _paths_lock:
+        if key in _paths_cache:
+            _paths_cache.move_to_end(key)
+            count("scenario_cache_hits")
+            return _paths_cache[key]
+    count("scenario_cache_misses")
+    g, sigma = assumption
+    if not np.isfinite(base) or base <= 0 or g <= -1:
+        paths = np.zeros((n_paths, horizon), dtype=np.float32)
+    else:
+        with span("scenario.simulate"):
+            z = _rng(medium, seed).standard_normal((n_paths, horizon), dtype=np.float32)
+            drift = np.log1p(g) - 0.5 * sigma ** 2
+            paths = (base * np.exp(np.cumsum(drift + sigma * z, axis=1))).astype(np.float32)
+    paths.flags.writeable = False          # compartida entre sesiones
+    with _paths_lock:
+        _paths_cache[key] = paths
+        while len(_paths_cache) > _CACHE_MAX:
+            _paths_cache.popitem(last=False)
+    return paths
+
+
+# ─────────────────────────────────────────
+# ESCENARIO COMPLETO
+# ─────────────────────────────────────────
+def _quantiles(V, qs):
+    """Cuantiles (interpolación lineal) por columna con un solo sort: (len(qs), columnas)."""
+    S = np.sort(V, axis=0)
+    pos = np.asarray(qs) * (len(S) - 1)
+    lo = np.floor(pos).astype(int)
+    hi = np.minimum(lo + 1, len(S) - 1)
+    w = (pos - lo)[:, None]
+    return S[lo] * (1 - w) + S[hi] * w
+
+
+def simulate(df_hist, assumptions, future_idx=PROJ_YEARS, levels=PI_LEVELS, n_paths=N_PATHS, seed=SEED):
+    """Scenario con mediana y bandas de TOTAL_INV, TV_SHARE y DIG_SHARE para future_idx."""
+    years = np.asarray(future_idx)
+    last = df_hist.iloc[-1]
+    paths = {m: simulate_medium(m, last[m], assumptions[m], len(years), n_paths, seed)
+             for m in MEDIOS}
+    with span("scenario.quantiles"):
+        total = np.zeros((n_paths, len(years)), dtype=np.float32)
+        for p in paths.values():
+            total += p
+        inv = 1.0 / np.where(total > 0, total, np.inf)          # total 0 → shares 0
+        series = {
+            "TOTAL_INV": total,
+            "TV_SHARE":  (paths[TV_MEDIA[0]] + paths[TV_MEDIA[1]]) * inv,
+            "DIG_SHARE": paths["DIGITAL"] * inv,
+        }
+        qs = sorted({0.5} | {q for lv in levels for q in ((1 - lv) / 2, (1 + lv) / 2)})
+        quant = {c: _quantiles(v, qs) for c, v in series.items()}     # (len(qs), años)
+    frame = lambda q: pd.DataFrame({"AÑO": years, **{c: quant[c][qs.index(q)] for c in SCENARIO_COLS}})
+    bands = {lv: (frame((1 - lv) / 2), frame((1 + lv) / 2)) for lv in levels}
+    return Scenario(frame(0.5), bands, n_paths)
@@ -0,0 +1,33 @@
+"""
+======================================================
+ SERVE — Arranque del dashboard con cachés calientes
+ Carga el dataset y lanza el calentamiento antes de
+ abrir el puerto; después es `streamlit run`.
+======================================================
+
+    python serve.py                                   # = streamlit run dashboard.py
+    python serve.py --server.port 8080 --server.headless true
+
+Con `streamlit run dashboard.py` el calentamiento empieza con la primera
+sesión (Streamlit no tiene gancho de arranque); con serve.py ya está en
+marcha cuando llega. La disponibilidad queda en app/static/ready.json
+(ver warmup.py).
+"""
+
+import os
+import sys
+
+import warmup
+
+DASHBOARD = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dashboard.py")
+
+
+def main(argv):
+    warmup.process_watcher()             # mismo módulo que importa dashboard.py: mismo watcher
+    from streamlit.web import cli
+    sys.argv = ["streamlit", "run", DASHBOARD, *argv]
+    return cli.main()
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,249 @@
+"""
+======================================================
+ STATIC SITE — Exportación estática del storytelling
+ Un solo build del pipeline y de las figuras; el
+ resultado se sirve desde cualquier servidor de
+ archivos o CDN sin ejecutar Python por visita.
+======================================================
+
+Desde la raíz del repo:
+
+    python static_site.py                       # → dist/index.html + plotly-<ver>.min.js + static/
+    python static_site.py --out public --single-file
+    python static_site.py --data otra_fuente.csv
+
+La página usa los mismos textos, CSS y QR que dashboard.py (content.py)
+y las mismas figuras (charts.py), con los filtros en su valor por
+defecto: rango completo, todos los medios, último año en el corte del
+capítulo 2 y DIGITAL en el histograma del capítulo 3. plotly.js va en
+un archivo aparte con la versión en el nombre (cacheable sin límite) y
+el CSS y el QR en static/ con huella de contenido (assets.py) o, con
+--single-file, todo embebido en el HTML.
+"""
+
+import argparse
+import html
+import os
+import re
+import sys
+import time
+
+import plotly
+from plotly.offline import get_plotlyjs
+
+import assets
+import charts
+import content
+import engine
+from cube import MediaCube
+from engine import (
+    DATA_PATH, INTERNET, MEDIOS, describe_media, descriptive_stats,
+    internet_tv_correlation, latest_row, projection_intervals,
+)
+from exports import FORMATS, export_bytes
+from forecast import MODEL_LABELS, forecast_frame
+from scenario import default_assumptions, simulate
+from correlation import correlation_cube
+from telemetry import span
+
+HIST_VAR = "DIGITAL"
+PLOT_CONFIG = {"responsive": True, "displaylogo": False}
+
+# Contenedor mínimo con el ancho y las columnas que da layout="wide" en Streamlit
+PAGE_CSS = """
+<style>
+body { margin: 0; }
+.page { max-width: 1280px; margin: 0 auto; padding: 32px 48px; }
+.row  { display: grid; grid-template-columns: repeat(var(--cols), minmax(0, 1fr)); gap: 24px; }
+.chapter { margin-top: 48px; }
+.info { background: #EFF6FF; border-radius: 10px; padding: 16px 20px; color: #1E3A8A; }
+.downloads a { margin-right: 18px; font-weight: 600; color: #1E40AF; }
+table { border-collapse: collapse; font-size: 0.9rem; }
+th, td { padding: 6px 10px; text-align: right; }
+@media (max-width: 900px) { .row { grid-template-columns: 1fr; } .page { padding: 16px; } }
+</style>
+"""
+
+
+# ─────────────────────────────────────────
+# PIEZAS HTML
+# ─────────────────────────────────────────
+def _bold(text):
+    return re.sub(r"\*\*(.+?)\*\*", r"<strong>\1</strong>", html.escape(text, quote=False))
+
+
+def _chart(fig):
+    return fig.to_html(full_html=False, include_plotlyjs=False, config=PLOT_CONFIG,
+                       default_width="100%")
+
+
+def _row(*cells):
+    return f'<div class="row" style="--cols:{len(cells)}">' + "".join(f"<div>{c}</div>" for c in cells) + "</div>"
+
+
+def _metric(label, value, delta):
+    # Mismos data-testid que st.metric: el CSS de content.py aplica sin cambios
+    return ('<div data-testid="stMetric">'
+            f'<div data-testid="stMetricLabel"><div>{html.escape(label)}</div></div>'
+            f'<div data-testid="stMetricValue"><div>{html.escape(value)}</div></div>'
+            f'<div data-testid="stMetricDelta"><div>{html.escape(delta)}</div></div>'
+            "</div>")
+
+
+# ─────────────────────────────────────────
+# CAPÍTULOS
+# ─────────────────────────────────────────
+def render_chapters(df_hist, df_full, downloads):
+    """Lista de (n, html) con los seis capítulos en su vista por defecto."""
+    yr = (int(df_hist["AÑO"].min()), int(df_hist["AÑO"].max()))
+    df_v = df_hist
+    cube = MediaCube.from_frame(df_hist)
+    year_snap = int(df_v["AÑO"].max())
+    df_stat = df_v[MEDIOS].dropna()
+    desc = describe_media(df_stat, MEDIOS)
+    proj_slice = df_full[df_full["PROYECCION"] == True]
+    bands = projection_intervals(df_hist, future_idx=proj_slice["AÑO"])
+    fc = forecast_frame(df_hist, future_idx=proj_slice["AÑO"])
+    sc = simulate(df_hist, default_assumptions(df_hist), future_idx=proj_slice["AÑO"])
+    fc_table = (content.forecast_table(fc.scores, fc.best, MODEL_LABELS)
+                .style.format("{:.1f}%", na_rep="—", subset=list(MODEL_LABELS.values())).to_html())
+    df_corr, x_line, y_line, corr_val = internet_tv_correlation(df_hist)
+    corr = correlation_cube(df_hist)
+    stats_table = (descriptive_stats(desc).style.format("{:,.0f}")
+                   .background_gradient(cmap="Blues").to_html())
+
+    return [
+        (1, content.NARRATIVES[1]
+            + _chart(charts.fig_history_area(df_v, MEDIOS))
+            + _chart(charts.fig_market_lines(df_v))),
+        (2, _row(_chart(charts.fig_share_normalized(cube.normalized_shares(yr))),
+                 _chart(charts.fig_share_duel(df_v)))
+            + f"<hr><h4>Inversión por Medio — {year_snap}</h4>"
+            + _chart(charts.fig_snapshot(cube.snapshot(year_snap), year_snap))),
+        (3, _row(f"<strong>Histograma de Frecuencia — {HIST_VAR}</strong>"
+                 + _chart(charts.fig_histogram(df_stat, HIST_VAR)),
+                 "<strong>Boxplot — Dispersión y Outliers</strong>"
+                 + _chart(charts.fig_boxplot(desc, df_stat)))
+            + "<strong>Media de Inversión por Medio</strong>"
+            + _chart(charts.fig_means(cube.means_table(yr)))
+            + "<strong>Tabla de Estadísticas Descriptivas</strong>" + stats_table),
+        (4, content.NARRATIVES[4]
+            + _chart(charts.fig_yoy(df_v.dropna(subset=["VAR_YOY"])))
+            + _chart(charts.fig_tv_waterfall(df_v["AÑO"].tolist(), cube.increments(yr).tolist()))),
+        (5, "<h4>Método 1 — Regresión Lineal (Mercado Total)</h4>"
+            + _chart(charts.fig_projection_total(df_hist, proj_slice, bands=bands))
+            + "<h4>Método 2 — Series de Tiempo (TV vs Digital al 2031)</h4>"
+            + _chart(charts.fig_projection_series(df_hist, proj_slice, bands=bands))
+            + "<strong>Modelos de pronóstico — backtesting con origen móvil</strong>"
+            + _chart(charts.fig_forecast_models(df_hist, fc.forecasts, "TOTAL_INV",
+                                                fc.best["TOTAL_INV"], MODEL_LABELS))
+            + fc_table + f"<p><small>{html.escape(content.FORECAST_NOTE)}</small></p>"
+            + "<h4>Escenarios — Simulación Monte Carlo</h4>"
+            + _chart(charts.fig_scenario_total(df_hist, sc))
+            + _chart(charts.fig_scenario_shares(df_hist, sc))
+            + f"<p><small>{_bold(content.scenario_note(sc))}</small></p>"
+            + "<h4>Método 3 — Correlación: Penetración de Internet vs Inversión TV</h4>"
+            + _chart(charts.fig_correlation(df_corr, x_line, y_line))
+            + f'<div class="info">{_bold(content.CORRELATION_NOTE.format(corr=corr_val))}</div>'
+            + "<strong>Matriz de correlación — medios × indicadores macro</strong>"
+            + _chart(charts.fig_corr_matrix(corr.matrix(yr), yr))
+            + _chart(charts.fig_corr_rolling(corr.rolling(None, INTERNET), INTERNET))
+            + f"<p><small>{html.escape(content.CORR_MATRIX_NOTE)}</small></p>"),
+        (6, _chart(charts.fig_pib(df_hist.dropna(subset=["PIB_PCT"])))
+            + content.narrative_6(proj_slice, bands)
+            + f'<div class="info">{_bold(content.projection_note(proj_slice, bands))}</div>'
+            + '<hr><strong>Descargas</strong><p class="downloads">'
+            + "".join(f'<a href="{name}" download>📥 Dataset completo ({fmt.upper()})</a>'
+                      for fmt, name in downloads)
+            + "</p>"),
+    ]
+
+
+def render_page(df_hist, df_full, plotly_tag, downloads, page_assets=None):
+    page_assets = page_assets or assets.inline()
+    style_tag = (f'<link rel="stylesheet" href="{page_assets.css_href}">' if page_assets.css_href
+                 else page_assets.head)
+    kpis = _row(*(_metric(*k) for k in content.kpis(latest_row(df_hist))))
+    chapters = "".join(f'<section class="chapter" id="capitulo-{n}">{content.section_header(n)}{body}</section>'
+                       for n, body in render_chapters(df_hist, df_full, downloads))
+    return f"""<!DOCTYPE html>
+<html lang="es">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{html.escape(content.PAGE_TITLE)}</title>
+{style_tag}
+{PAGE_CSS}
+{plotly_tag}
+</head>
+<body>
+<div class="page">
+{content.hero_html(page_assets.qr_src)}
+{kpis}
+{chapters}
+<hr>
+{content.footer_html(page_assets.qr_src)}
+</div>
+</body>
+</html>
+"""
+
+
+# ─────────────────────────────────────────
+# BUILD
+# ─────────────────────────────────────────
+def _write(path, data):
+    """Escritura atómica: un servidor nunca ve un archivo a medias."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data.encode() if isinstance(data, str) else data)
+    os.replace(tmp, path)
+
+
+def build_site(out_dir="dist", data_path=DATA_PATH, single_file=False):
+    """Escribe el sitio estático en out_dir y devuelve la ruta de index.html."""
+    os.makedirs(out_dir, exist_ok=True)
+    with span("static.build_dataset"):
+        df_hist, df_full = engine.build_dataset(data_path)
+
+    downloads = []
+    with span("static.downloads"):
+        for fmt, (_, ext) in FORMATS.items():
+            name = f"{content.download_stem('Colombia', df_full['AÑO'].min(), df_full['AÑO'].max())}.{ext}"
+            _write(os.path.join(out_dir, name), export_bytes(df_full, fmt))
+            downloads.append((fmt, name))
+
+    if single_file:
+        plotly_tag = f'<script type="text/javascript">{get_plotlyjs()}</script>'
+        page_assets = assets.inline()
+    else:
+        page_assets = assets.build(os.path.join(out_dir, "static"), url_prefix="static")
+        js_name = f"plotly-{plotly.__version__}.min.js"
+        js_path = os.path.join(out_dir, js_name)
+        if not os.path.exists(js_path):
+            _write(js_path, get_plotlyjs())
+        plotly_tag = f'<script src="{js_name}" charset="utf-8"></script>'
+
+    with span("static.render"):
+        page = render_page(df_hist, df_full, plotly_tag, downloads, page_assets)
+    index = os.path.join(out_dir, "index.html")
+    _write(index, page)
+    return index
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Exporta el dashboard como sitio HTML estático.")
+    p.add_argument("--out", default="dist", help="directorio de salida (por defecto dist/)")
+    p.add_argument("--data", default=DATA_PATH, help="CSV fuente (por defecto cleaned_ad_data.csv)")
+    p.add_argument("--single-file", action="store_true", help="embeber plotly.js en index.html")
+    args = p.parse_args(argv)
+
+    t0 = time.perf_counter()
+    index = build_site(args.out, args.data, args.single_file)
+    size = sum(os.path.getsize(os.path.join(args.out, f)) for f in os.listdir(args.out))
+    print(f"{index}  ({size/1e6:.1f} MB en {args.out}/, {time.perf_counter()-t0:.1f} s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+"""
+======================================================
+ STORE — Caché columnar del dataset en .npy (mmap)
+ Se construye una vez desde el CSV y después se abre
+ memory-mapped: cero parseo y páginas compartidas
+ entre todos los procesos del servidor.
+======================================================
+
+Estructura en disco (una carpeta por contenido de la fuente):
+
+    .cache/dataset-<sha256[:16]>/
+        manifest.json      columnas, dtypes, filas históricas
+        000.npy 001.npy …  una columna de df_full por archivo
+
+Las columnas interpoladas y derivadas (TV_TOTAL, TRADICIONAL, shares,
+VAR_YOY, PIB_PCT) y las filas proyectadas se guardan ya calculadas.
+
+`load_shared` entrega el mismo par de DataFrames a todo el proceso (ver
+DatasetWatcher en watcher.py). Las columnas son vistas NumPy de sólo
+lectura: escribir en los arrays (to_numpy(), .values) falla. Una
+asignación por pandas (df.iloc[0, 1] = …, df[col] = …) en cambio no
+falla: con copy-on-write (pandas ≥ 3) copia el bloque y cambia ese
+DataFrame. Los buffers compartidos y el caché en disco quedan intactos,
+pero el objeto es el mismo para todas las sesiones, que verían el
+cambio. Para modificar, trabajar sobre df.copy() o sobre un corte nuevo
+(year_range, filtros), que ya son objetos propios.
+
+Precalentar desde la línea de comandos:
+
+    python store.py [ruta.csv]
+"""
+
+import hashlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from engine import BASE_DIR, DATA_PATH, FALLBACK_CSV, PROJECTION_MODEL, build_dataset
+
+CACHE_DIR      = os.path.join(BASE_DIR, ".cache")
+SCHEMA_VERSION = 2      # subir si cambia la lógica de build_dataset
+
+
+def _read_source(path):
+    """Bytes del CSV, o None si no existe (build_dataset usa el respaldo embebido)."""
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def _digest(data):
+    h = hashlib.sha256(f"schema-{SCHEMA_VERSION}\n".encode())
+    if PROJECTION_MODEL != "linear":        # filas proyectadas distintas: otra carpeta
+        h.update(f"model-{PROJECTION_MODEL}\n".encode())
+    h.update(data if data is not None else FALLBACK_CSV.encode())
+    return h.hexdigest()[:16]
+
+
+def source_hash(path=DATA_PATH):
+    return _digest(_read_source(path))
+
+
+def _cache_path(digest, cache_dir):
+    return os.path.join(cache_dir, f"dataset-{digest}")
+
+
+def write_cache(df_hist, df_full, digest, cache_dir=CACHE_DIR):
+    """Escribe df_full columna a columna; la carpeta aparece de forma atómica."""
+    os.makedirs(cache_dir, exist_ok=True)
+    target = _cache_path(digest, cache_dir)
+    tmp = tempfile.mkdtemp(prefix=".tmp-", dir=cache_dir)
+    columns = []
+    for i, col in enumerate(df_full.columns):
+        arr = df_full[col].to_numpy()
+        if arr.dtype == object:
+            arr = arr.astype(bool if col == "PROYECCION" else float)
+        np.save(os.path.join(tmp, f"{i:03d}.npy"), np.ascontiguousarray(arr), allow_pickle=False)
+        columns.append({"name": col, "file": f"{i:03d}.npy", "dtype": arr.dtype.str})
+    manifest = {"digest": digest, "n_hist": len(df_hist), "n_rows": len(df_full), "columns": columns}
+    with open(os.path.join(tmp, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    try:
+        os.rename(tmp, target)
+    except OSError:
+        # Otro proceso ganó la carrera: su copia es idéntica
+        shutil.rmtree(tmp, ignore_errors=True)
+    return target
+
+
+def open_cache(digest, cache_dir=CACHE_DIR):
+    """Abre la caché memory-mapped → (df_hist, df_full), o None si no existe."""
+    target = _cache_path(digest, cache_dir)
+    try:
+        with open(os.path.join(target, "manifest.json"), encoding="utf-8") as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return None
+    data = {c["name"]: np.load(os.path.join(target, c["file"]), mmap_mode="r", allow_pickle=False)
+            for c in manifest["columns"]}
+    df_full = pd.DataFrame(data, copy=False)
+    df_hist = df_full.iloc[:manifest["n_hist"]]
+    return df_hist, df_full
+
+
+def load_versioned(path=DATA_PATH, cache_dir=CACHE_DIR):
+    """(digest, df_hist, df_full) servidos desde la caché columnar.
+
+    El CSV se lee una sola vez: el digest y, si no hay caché, el dataset
+    salen de los mismos bytes, así que un archivo reemplazado a mitad de
+    la carga nunca deja datos bajo la versión de otro contenido.
+    """
+    data = _read_source(path)
+    digest = _digest(data)
+    cached = open_cache(digest, cache_dir)
+    if cached is not None:
+        return (digest, *cached)
+    df_hist, df_full = build_dataset(io.BytesIO(data) if data is not None else path)
+    try:
+        write_cache(df_hist, df_full, digest, cache_dir)
+    except OSError:
+        return digest, df_hist, df_full  # disco de sólo lectura: servir en memoria
+    return (digest, *open_cache(digest, cache_dir))
+
+
+def load_dataset(path=DATA_PATH, cache_dir=CACHE_DIR):
+    """Como engine.build_dataset, pero servido desde la caché columnar."""
+    return load_versioned(path, cache_dir)[1:]
+
+
+def freeze(df):
+    """DataFrame sobre vistas NumPy de sólo lectura de las columnas (sin copiar).
+
+    Protege los buffers, no el DataFrame: pandas no tiene marca de sólo
+    lectura y una asignación por .loc/.iloc copia el bloque y la acepta.
+    """
+    cols = {}
+    for col in df.columns:
+        arr = df[col].to_numpy().view()
+        arr.setflags(write=False)
+        cols[col] = arr
+    return pd.DataFrame(cols, index=df.index, copy=False)
+
+
+def load_shared(path=DATA_PATH, cache_dir=CACHE_DIR):
+    """(digest, df_hist, df_full) inmutables para compartir entre sesiones; df_hist es un corte de df_full.
+
+    digest es la versión de los datos devueltos (ver load_versioned).
+    """
+    digest, df_hist, df_full = load_versioned(path, cache_dir)
+    df_full = freeze(df_full)
+    return digest, df_full.iloc[:len(df_hist)], df_full
+
+
+if __name__ == "__main__":
+    src = sys.argv[1] if len(sys.argv) > 1 else DATA_PATH
+    digest = source_hash(src)
+    if open_cache(digest) is None:
+        df_hist, df_full = build_dataset(src)
+        print(write_cache(df_hist, df_full, digest))
+    else:
+        print(_cache_path(digest, CACHE_DIR), "(ya existía)")
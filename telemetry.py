@@ -0,0 +1,155 @@
+"""
+======================================================
+ TELEMETRY — Tiempos por etapa, contadores y métricas
+ Spans livianos alrededor de cada etapa del dashboard,
+ agregados por proceso (p50/p99) y exportados como
+ JSON lines o texto Prometheus a un archivo local.
+======================================================
+
+    from telemetry import span, count, gauge
+
+    with span("build.load_csv"):
+        df = pd.read_csv(path)
+    count("figure_cache_hits", chart="fig1a")
+    gauge("chart_payload_bytes", 18234, chart="fig1a")
+
+Cada rerun de Streamlit se envuelve en begin_rerun()/end_rerun(): los
+spans del hilo actual se juntan en un registro que se agrega al archivo.
+
+Configuración por variables de entorno:
+
+    AD_TELEMETRY_FILE    ruta del archivo (vacío = no exportar)
+    AD_TELEMETRY_FORMAT  "jsonl" (una línea por rerun, por defecto) o
+                         "prometheus" (snapshot reescrito en cada rerun)
+"""
+
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+import numpy as np
+
+
+def _labels_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+class Telemetry:
+    def __init__(self, path=None, fmt="jsonl", window=2048):
+        self.path     = path
+        self.fmt      = fmt
+        self._lock    = threading.Lock()
+        self._local   = threading.local()
+        self.durations = defaultdict(lambda: deque(maxlen=window))   # etapa → últimos segundos
+        self.totals    = defaultdict(lambda: [0, 0.0])               # etapa → [n, suma]
+        self.counters  = defaultdict(int)                            # (nombre, labels) → n
+        self.gauges    = {}                                          # (nombre, labels) → valor
+
+    # ── registro ──
+    @contextmanager
+    def span(self, name):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - t0)
+
+    def observe(self, name, seconds):
+        with self._lock:
+            self.durations[name].append(seconds)
+            tot = self.totals[name]
+            tot[0] += 1
+            tot[1] += seconds
+        rerun = getattr(self._local, "rerun", None)
+        if rerun is not None:
+            rerun["spans"][name] = rerun["spans"].get(name, 0.0) + seconds
+
+    def count(self, name, n=1, **labels):
+        with self._lock:
+            self.counters[(name, _labels_key(labels))] += n
+        rerun = getattr(self._local, "rerun", None)
+        if rerun is not None:
+            key = name + "".join(f"|{v}" for _, v in sorted(labels.items()))
+            rerun["counters"][key] = rerun["counters"].get(key, 0) + n
+
+    def gauge(self, name, value, **labels):
+        with self._lock:
+            self.gauges[(name, _labels_key(labels))] = value
+
+    # ── reruns ──
+    def begin_rerun(self, session=None):
+        self._local.rerun = {"ts": time.time(), "session": session, "spans": {}, "counters": {}}
+        self._local.t0 = time.perf_counter()
+
+    def end_rerun(self):
+        rerun = getattr(self._local, "rerun", None)
+        if rerun is None:
+            return None
+        self._local.rerun = None
+        elapsed = time.perf_counter() - self._local.t0
+        self.observe("rerun", elapsed)
+        rerun["spans"]["rerun"] = elapsed
+        rerun["spans"] = {k: round(v * 1e3, 3) for k, v in rerun["spans"].items()}   # ms
+        if self.path:
+            self.export(rerun)
+        return rerun
+
+    # ── lectura ──
+    def summary(self):
+        """etapa → {count, p50_ms, p99_ms, last_ms, mean_ms} sobre la ventana reciente."""
+        with self._lock:
+            snap = {k: (np.fromiter(v, float), self.totals[k][:]) for k, v in self.durations.items()}
+        out = {}
+        for name, (arr, (n, total)) in sorted(snap.items()):
+            if not arr.size:
+                continue
+            p50, p99 = np.percentile(arr, [50, 99])
+            out[name] = {"count": n, "p50_ms": p50 * 1e3, "p99_ms": p99 * 1e3,
+                         "last_ms": arr[-1] * 1e3, "mean_ms": total / n * 1e3}
+        return out
+
+    def prometheus(self, prefix="dashboard"):
+        lines = [f"# TYPE {prefix}_stage_seconds summary"]
+        with self._lock:
+            snap = {k: (np.fromiter(v, float), self.totals[k][:]) for k, v in self.durations.items()}
+            counters, gauges = dict(self.counters), dict(self.gauges)
+        for name, (arr, (n, total)) in sorted(snap.items()):
+            if not arr.size:
+                continue
+            for q in (0.5, 0.9, 0.99):
+                lines.append(f'{prefix}_stage_seconds{{stage="{name}",quantile="{q}"}} {np.quantile(arr, q):.6f}')
+            lines.append(f'{prefix}_stage_seconds_sum{{stage="{name}"}} {total:.6f}')
+            lines.append(f'{prefix}_stage_seconds_count{{stage="{name}"}} {n}')
+        for kind, data, suffix in (("counter", counters, "_total"), ("gauge", gauges, "")):
+            for metric in sorted({name for name, _ in data}):
+                lines.append(f"# TYPE {prefix}_{metric}{suffix} {kind}")
+                for (name, labels), value in sorted(data.items()):
+                    if name == metric:
+                        lbl = ",".join(f'{k}="{v}"' for k, v in labels)
+                        lines.append(f"{prefix}_{metric}{suffix}{{{lbl}}} {value}")
+        return "\n".join(lines) + "\n"
+
+    # ── exportación ──
+    def export(self, rerun):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        if self.fmt == "prometheus":
+            tmp = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(self.prometheus())
+            os.replace(tmp, self.path)
+        else:
+            line = json.dumps(rerun, ensure_ascii=False) + "\n"
+            with self._lock, open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+
+
+# Instancia por proceso, configurada por entorno
+TELEMETRY = Telemetry(path=os.environ.get("AD_TELEMETRY_FILE") or None,
+                      fmt=os.environ.get("AD_TELEMETRY_FORMAT", "jsonl"))
+
+span  = TELEMETRY.span
+count = TELEMETRY.count
+gauge = TELEMETRY.gauge
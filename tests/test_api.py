@@ -0,0 +1,40 @@
+"""API HTTP con el cliente local: ETags, 304 y errores que un If-None-Match no tapa."""
+
+import pytest
+
+from api import DataAPI, request
+
+
+@pytest.fixture(scope="module")
+def app(tmp_path_factory):
+    return DataAPI(cache_dir=str(tmp_path_factory.mktemp("cache")))
+
+
+def test_etag_roundtrip_returns_304(app):
+    status, headers, body = request(app, "/series/DIGITAL?from=2010&to=2020")
+    assert status == 200 and body
+    status, again, body = request(app, "/series/DIGITAL?from=2010&to=2020",
+                                  headers={"If-None-Match": headers["ETag"]})
+    assert status == 304 and body == b"" and again["ETag"] == headers["ETag"]
+
+
+@pytest.mark.parametrize("path, expected", [
+    ("/series/BOGUS", 404),
+    ("/series", 404),
+    ("/hist/extra", 404),
+    ("/nada", 404),
+    ("/hist?from=5&to=1", 400),
+    ("/hist?from=dos", 400),
+    ("/hist?format=xml", 400),
+    ("/media?format=arrow", 406),
+])
+def test_errors_survive_wildcard_if_none_match(app, path, expected):
+    assert request(app, path)[0] == expected
+    assert request(app, path, headers={"If-None-Match": "*"})[0] == expected
+
+
+def test_unknown_query_keys_share_one_etag(app):
+    tags = {request(app, f"/hist?from=2010&x={i}")[1]["ETag"] for i in range(5)}
+    tags.add(request(app, "/hist?from=02010")[1]["ETag"])
+    assert len(tags) == 1
+    assert request(app, "/media?from=2010")[1]["ETag"] == request(app, "/media")[1]["ETag"]
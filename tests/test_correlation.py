@@ -0,0 +1,52 @@
+"""CorrelationCube frente a pandas: misma correlación de Pearson por pares."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from correlation import CORR_MACRO, CORR_MEDIA, MIN_OBS, CorrelationCube
+from engine import DATA_PATH, INTERNET, build_dataset
+
+
+@pytest.fixture(scope="module")
+def df_hist():
+    return build_dataset(DATA_PATH)[0]
+
+
+def _pairwise(df, x_cols, y_cols):
+    return df[x_cols + y_cols].corr(min_periods=MIN_OBS).loc[x_cols, y_cols]
+
+
+@pytest.mark.parametrize("yr", [(1995, 2025), (2008, 2020)])
+def test_matrix_matches_dataframe_corr(df_hist, yr):
+    cube = CorrelationCube.from_frame(df_hist)
+    df = df_hist[df_hist["AÑO"].between(*yr)]
+    ref = _pairwise(df, CORR_MEDIA, CORR_MACRO)
+    pd.testing.assert_frame_equal(cube.matrix(yr), ref, check_exact=False, atol=1e-10, check_names=False)
+
+
+@pytest.mark.parametrize("lag", [-2, 1, 3])
+def test_lagged_matrix_shifts_the_indicator(df_hist, lag):
+    cube = CorrelationCube.from_frame(df_hist)
+    shifted = df_hist[CORR_MEDIA].join(df_hist[CORR_MACRO].shift(lag))
+    ref = _pairwise(shifted, CORR_MEDIA, CORR_MACRO)
+    np.testing.assert_allclose(cube.matrix((1995, 2025), lag).to_numpy(), ref.to_numpy(), atol=1e-10)
+
+
+def test_rolling_matches_series_rolling_corr(df_hist):
+    cube = CorrelationCube.from_frame(df_hist)
+    out = cube.rolling(10, INTERNET)
+    for col in ("TV_TOTAL", "DIGITAL"):
+        ref = df_hist[col].rolling(10, min_periods=MIN_OBS).corr(df_hist[INTERNET])
+        np.testing.assert_allclose(out.loc[col].to_numpy(), ref.to_numpy(), atol=1e-10)
+
+
+def test_markets_with_gaps_use_pairwise_complete_years(df_hist):
+    other = df_hist.assign(MERCADO="B")
+    other.loc[other["AÑO"] < 2005, "DIGITAL"] = np.nan
+    stacked = pd.concat([df_hist.assign(MERCADO="Colombia"), other], ignore_index=True)
+    cube = CorrelationCube.from_markets(stacked)
+    ref = _pairwise(other, CORR_MEDIA, CORR_MACRO)
+    np.testing.assert_allclose(cube.matrix((1995, 2025), market="B").to_numpy(), ref.to_numpy(), atol=1e-10)
+    np.testing.assert_allclose(cube.matrix((1995, 2025), market="Colombia").to_numpy(),
+                               _pairwise(df_hist, CORR_MEDIA, CORR_MACRO).to_numpy(), atol=1e-10)
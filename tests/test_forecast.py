@@ -0,0 +1,52 @@
+"""Backtesting de forecast.py: orígenes vectorizados y selección de modelo."""
+
+import numpy as np
+import pytest
+
+import forecast
+from forecast import MODELS, backtest_origins, fit_all, periods_per_year
+
+
+@pytest.mark.parametrize("model", list(MODELS))
+def test_batched_origins_match_refit(model):
+    """Todos los orígenes en una llamada = reajustar el modelo con y[:t] en cada uno."""
+    rng = np.random.default_rng(0)
+    y = 100 * np.exp(0.05 * np.arange(30)) * np.exp(rng.normal(0, 0.05, 30))
+    origins = np.arange(8, 30)
+    batched = MODELS[model](y, origins, 6)
+    for j, t in enumerate(origins):
+        np.testing.assert_allclose(batched[j], MODELS[model](y[:t], [t], 6)[0], rtol=1e-10)
+
+
+def test_origins_are_capped():
+    origins = backtest_origins(31 * 12, 8 * 12)
+    assert len(origins) == forecast.MAX_ORIGINS
+    assert origins[0] == 8 * 12 and origins[-1] == 31 * 12 - 1
+    assert len(backtest_origins(31, 8)) == 23
+
+
+def test_selection_follows_the_shape_of_the_series():
+    rng = np.random.default_rng(4)
+    x = np.arange(1995, 2026, dtype=float)
+    t = x - x[0]
+    Y = np.column_stack([
+        50 * np.exp(0.12 * t) * np.exp(rng.normal(0, 0.02, len(t))),    # crecimiento compuesto
+        500 + 20 * t + rng.normal(0, 2, len(t)),                          # recta
+        np.r_[np.zeros(5), 10 + 3 * t[5:]],                               # arranca en cero
+    ])
+    cols = ["EXP", "LIN", "CEROS"]
+    fits = fit_all(x, Y, cols, np.arange(2026, 2032), workers=1)
+    scores = {c: {m: s for m, (s, _) in fits[c].items()} for c in cols}
+    assert min(scores["EXP"], key=scores["EXP"].get) == "loglinear"
+    assert scores["LIN"]["linear"] < scores["LIN"]["loglinear"]
+    assert np.isnan(scores["CEROS"]["loglinear"])
+
+
+def test_monthly_horizon_is_counted_in_years():
+    rng = np.random.default_rng(2)
+    x = 1995 + np.arange(20 * 12) / 12
+    y = 1000 + 5 * np.arange(len(x)) + rng.normal(0, 5, len(x))
+    assert periods_per_year(x) == 12
+    fits = fit_all(x, y[:, None], ["S"], [x[-1] + 1, x[-1] + 2], workers=1)
+    pred = fits["S"]["linear"][1]
+    np.testing.assert_allclose(pred, 1000 + 5 * (len(x) - 1 + np.array([12, 24])), rtol=1e-2)
@@ -0,0 +1,35 @@
+"""IncrementalDataset.append frente a reconstruir el dataset completo."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from engine import DATA_PATH, PROJ_YEARS, build_dataset, load_raw
+from incremental import IncrementalDataset
+
+
+@pytest.fixture
+def raw():
+    return load_raw(DATA_PATH)
+
+
+def test_build_stops_at_the_last_year_of_the_csv(raw, tmp_path):
+    path = tmp_path / "hasta_2020.csv"
+    raw[raw["AÑO"] <= 2020].to_csv(path, index=False)
+    inc = IncrementalDataset.build(path)
+    assert inc.last_year == 2020
+    assert inc.df_proj["AÑO"].tolist() == list(range(2021, int(PROJ_YEARS[-1]) + 1))
+
+
+def test_append_matches_full_rebuild(raw, tmp_path):
+    path = tmp_path / "hasta_2018.csv"
+    raw[raw["AÑO"] <= 2018].to_csv(path, index=False)
+    inc = IncrementalDataset.build(path)
+    inc.append(raw[(raw["AÑO"] > 2018) & (raw["AÑO"] <= 2021)])
+    df_hist, df_full = inc.append(raw[(raw["AÑO"] > 2021) & (raw["AÑO"] <= 2025)])
+
+    ref_hist, ref_full = build_dataset(DATA_PATH)
+    pd.testing.assert_frame_equal(df_hist, ref_hist, check_dtype=False, rtol=1e-9)
+    proj, ref_proj = (f[f["PROYECCION"] == True].reset_index(drop=True) for f in (df_full, ref_full))
+    assert proj["AÑO"].tolist() == ref_proj["AÑO"].tolist()
+    np.testing.assert_allclose(proj[inc.cols].to_numpy(float), ref_proj[inc.cols].to_numpy(float), rtol=1e-9)
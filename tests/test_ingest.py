@@ -0,0 +1,66 @@
+"""ingest.py: reglas de canales y agregación por bloques de un CSV de pauta."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from engine import MEDIOS
+from ingest import CSV_COLUMNS, LogSpec, ingest, map_channel, to_long_table, to_table
+
+
+@pytest.mark.parametrize("channel, medio", [
+    ("Televisión Regional",        "TV REG Y LOCAL"),
+    ("TV Local Bogotá",            "TV REG Y LOCAL"),
+    ("Canal Regional del Caribe",  "TV REG Y LOCAL"),
+    ("Teleantioquia",              "TV REG Y LOCAL"),
+    ("Caracol TV",                 "TV NACIONAL"),
+    ("Canal RCN",                  "TV NACIONAL"),
+    ("Televisión por cable",       "TV NACIONAL"),
+    ("Facebook",                   "DIGITAL"),
+    ("Google Ads",                 "DIGITAL"),
+    ("YouTube",                    "DIGITAL"),
+    ("YouTube TV",                 "DIGITAL"),
+    ("Meta (Instagram)",           "DIGITAL"),
+    ("Display programático",       "DIGITAL"),
+    ("RCN Radio",                  "RADIO"),
+    ("Caracol Radio",              "RADIO"),
+    ("La FM",                      "RADIO"),
+    ("Revista Semana",             "REVISTAS"),
+    ("Periódico El Colombiano",    "PRENSA"),
+    ("Vallas OOH",                 "PUB EXTERIOR"),
+    ("Patrocinio evento",          None),
+])
+def test_map_channel(channel, medio):
+    assert map_channel(channel) == medio
+
+
+def test_chunked_csv_roundtrip(tmp_path):
+    rng = np.random.default_rng(0)
+    channels = ["Caracol TV", "Facebook", "Televisión Regional", "Caracol Radio", "Revista Semana",
+                "El Tiempo Prensa", "Vallas OOH", "Patrocinio evento"]
+    n = 1000
+    log = pd.DataFrame({
+        "CANAL":     rng.choice(channels, n),
+        "INVERSION": rng.integers(1, 1000, n).astype(float),
+        "FECHA":     pd.to_datetime("2019-01-01") + pd.to_timedelta(rng.integers(0, 3 * 365, n), "D"),
+        "PAIS":      rng.choice(["CO", "PE"], n),
+    })
+    path = tmp_path / "pauta.csv"
+    log.to_csv(path, index=False)
+
+    agg, summary = ingest([str(path)], LogSpec(market_col="PAIS", divisor=1, chunk_rows=97), workers=1)
+    assert summary["rows"] == n
+    assert summary["rows_used"] == (log["CANAL"] != "Patrocinio evento").sum()
+    assert set(summary["unmapped"]) == {"Patrocinio evento"}
+
+    expected = (log.assign(AÑO=log["FECHA"].dt.year, MEDIO=log["CANAL"].map(map_channel))
+                .dropna(subset=["MEDIO"]).groupby(["AÑO", "MEDIO"])["INVERSION"].sum()
+                .unstack().reindex(columns=MEDIOS).fillna(0.0))
+    table = to_table(agg)
+    assert list(table.columns) == CSV_COLUMNS
+    np.testing.assert_allclose(table[MEDIOS].to_numpy(), expected.to_numpy())
+    np.testing.assert_allclose(table["TOTAL_INV"], expected.sum(axis=1))
+
+    long = to_long_table(agg)
+    assert set(long["MERCADO"]) == {"CO", "PE"}
+    assert long["VALOR"].sum() == pytest.approx(expected.to_numpy().sum())
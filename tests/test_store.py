@@ -0,0 +1,33 @@
+"""Caché columnar: la versión de un dataset es la de los bytes con que se construyó."""
+
+import store
+from engine import DATA_PATH, load_raw
+from watcher import DatasetWatcher
+
+
+def test_version_matches_data_when_csv_is_replaced_during_load(tmp_path, monkeypatch):
+    raw = load_raw(DATA_PATH)
+    path = tmp_path / "datos.csv"
+    raw[raw["AÑO"] <= 2020].to_csv(path, index=False)
+    before = store.source_hash(path)
+
+    build = store.build_dataset
+    def replace_then_build(src, *args, **kwargs):
+        raw.to_csv(path, index=False)                 # llega otra versión a mitad de la carga
+        return build(src, *args, **kwargs)
+    monkeypatch.setattr(store, "build_dataset", replace_then_build)
+
+    digest, df_hist, _ = store.load_shared(path, str(tmp_path / "cache"))
+    assert digest == before
+    assert int(df_hist["AÑO"].max()) == 2020
+    assert store.source_hash(path) != before
+
+
+def test_snapshot_version_is_the_loaded_digest(tmp_path):
+    path = tmp_path / "datos.csv"
+    load_raw(DATA_PATH).to_csv(path, index=False)
+    watcher = DatasetWatcher(str(path), str(tmp_path / "cache"))
+    digest, df_hist, _ = store.load_shared(path, str(tmp_path / "cache"))
+    snap = watcher.current()
+    assert snap.version == digest == store.source_hash(path)
+    assert len(snap.df_hist) == len(df_hist)
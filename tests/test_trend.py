@@ -0,0 +1,35 @@
+"""Contratos numéricos de trend.py: ajuste cerrado e intervalos por bootstrap."""
+
+import numpy as np
+
+from trend import bootstrap_intervals, fit_trends
+
+
+def test_fit_trends_matches_polyfit_with_nan():
+    rng = np.random.default_rng(1)
+    x = np.arange(1995, 2026, dtype=float)
+    Y = 3.0 + 0.5 * (x - 1995)[:, None] + rng.normal(0, 1, (len(x), 4))
+    Y[:5, 2] = np.nan
+    slope, intercept = fit_trends(x, Y)
+    for k in range(Y.shape[1]):
+        ok = ~np.isnan(Y[:, k])
+        b, a = np.polyfit(x[ok], Y[ok, k], 1)
+        assert np.isclose(slope[k], b) and np.isclose(intercept[k], a)
+
+
+def test_bootstrap_intervals_cover_nominal_level():
+    """Series lineales con ruido gaussiano: la cobertura empírica ronda el nivel nominal."""
+    rng = np.random.default_rng(7)
+    n, h, k = 31, 6, 400
+    x, x_new = np.arange(n, dtype=float), np.arange(n, n + h, dtype=float)
+    a, b = rng.uniform(50, 150, k), rng.uniform(-1, 3, k)
+    Y = a + np.outer(x, b) + rng.normal(0, 5, (n, k))
+    future = a + np.outer(x_new, b) + rng.normal(0, 5, (h, k))
+
+    _, bands = bootstrap_intervals(x, Y, x_new, levels=(0.8, 0.95), n_boot=1000, floor=None, seed=3)
+    coverage = {lv: ((lo <= future) & (future <= hi)).mean() for lv, (lo, hi) in bands.items()}
+    assert abs(coverage[0.8] - 0.8) < 0.05
+    assert abs(coverage[0.95] - 0.95) < 0.04
+    lo80, hi80 = bands[0.8]
+    lo95, hi95 = bands[0.95]
+    assert (lo95 <= lo80).all() and (hi80 <= hi95).all()
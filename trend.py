@@ -0,0 +1,175 @@
+"""
+======================================================
+ TREND — Regresión lineal por lotes (forma cerrada)
+ Ajusta todas las series de una matriz año × serie en
+ una sola pasada NumPy, con máscara de NaN por serie.
+ TrendStats guarda las sumas para actualizar por filas.
+======================================================
+"""
+
+import numpy as np
+
+
+class TrendStats:
+    """Estadísticos suficientes de y = a + b·x por serie: n, Σx, Σy, Σx², Σxy.
+
+    Se actualizan sumando filas nuevas (o restándolas con sign=-1) sin
+    volver a recorrer el histórico. x se desplaza por un origen fijo x0
+    para que las sumas no pierdan precisión con años del orden de 2000.
+    """
+
+    def __init__(self, k, x0=0.0):
+        self.x0  = float(x0)
+        self.n   = np.zeros(k)
+        self.sx  = np.zeros(k)
+        self.sy  = np.zeros(k)
+        self.sxx = np.zeros(k)
+        self.sxy = np.zeros(k)
+
+    @classmethod
+    def from_data(cls, x, Y, x0=None):
+        x = np.asarray(x, dtype=float)
+        Y = np.asarray(Y, dtype=float)
+        if Y.ndim == 1:
+            Y = Y[:, None]
+        stats = cls(Y.shape[1], x.mean() if x0 is None else x0)
+        stats.update(x, Y)
+        return stats
+
+    def update(self, x, Y, sign=1.0):
+        """Suma (o resta) filas; devuelve la máscara (k,) de series con algún dato nuevo."""
+        x = np.asarray(x, dtype=float)
+        Y = np.asarray(Y, dtype=float)
+        if Y.ndim == 1:
+            Y = Y[:, None]
+        mask = ~np.isnan(Y)
+        w    = mask.astype(float)
+        Yz   = np.where(mask, Y, 0.0)
+        xc   = x - self.x0
+        self.n   += sign * w.sum(axis=0)
+        self.sx  += sign * (xc @ w)
+        self.sy  += sign * Yz.sum(axis=0)
+        self.sxx += sign * ((xc * xc) @ w)
+        self.sxy += sign * (xc @ Yz)
+        return mask.any(axis=0)
+
+    def solve(self):
+        """(slope, intercept) de cada serie; NaN con menos de dos puntos o x constante."""
+        n, sx, sy, sxx, sxy = self.n, self.sx, self.sy, self.sxx, self.sxy
+        with np.errstate(invalid="ignore", divide="ignore"):
+            den       = n * sxx - sx * sx
+            slope     = np.where(den > 0, (n * sxy - sx * sy) / den, np.nan)
+            intercept = (sy - slope * sx) / n - slope * self.x0
+        return slope, intercept
+
+
+def fit_trends(x, Y):
+    """Ajusta y = a + b·x por mínimos cuadrados para cada columna de Y.
+
+    x : (n,)    eje común (años).
+    Y : (n, k)  una serie por columna; los NaN se excluyen sólo de su serie.
+
+    Devuelve (slope, intercept), cada uno de forma (k,). Las series con
+    menos de dos puntos válidos, o con x constante, quedan en NaN.
+    """
+    return TrendStats.from_data(x, Y).solve()      # centrado en la media de x
+
+
+def predict_trends(slope, intercept, x_new, floor=0.0):
+    """Evalúa las rectas en x_new → matriz (m, k), recortada en `floor` (None = sin recorte)."""
+    x_new = np.asarray(x_new, dtype=float)
+    pred  = intercept[None, :] + x_new[:, None] * slope[None, :]
+    if floor is not None:
+        pred = np.maximum(pred, floor)
+    return pred
+
+
+def project_trends(x, Y, x_new, floor=0.0):
+    slope, intercept = fit_trends(x, Y)
+    return predict_trends(slope, intercept, x_new, floor)
+
+
+# ─────────────────────────────────────────
+# INTERVALOS DE PREDICCIÓN POR BOOTSTRAP
+# ─────────────────────────────────────────
+def bootstrap_intervals(x, Y, x_new, levels=(0.8, 0.95), n_boot=2000, block=1, floor=0.0,
+                        seed=0, max_elems=4_000_000):
+    """Intervalos de predicción de las rectas de Y por bootstrap de residuos.
+
+    Cada réplica remuestrea los residuos del ajuste (en bloques móviles de
+    `block` años si block > 1, para respetar la autocorrelación), reajusta
+    la recta y le suma un residuo remuestreado en cada x_new. Como el ajuste
+    es lineal en y, el reajuste de las n_boot réplicas de todas las series
+    es un producto de arrays, sin bucles por réplica; las series se procesan
+    en bloques de a lo sumo max_elems elementos.
+
+    Devuelve (center (m, k), {nivel: (lower (m, k), upper (m, k))}).
+    """
+    x     = np.asarray(x, dtype=float)
+    Y     = np.asarray(Y, dtype=float)
+    x_new = np.asarray(x_new, dtype=float)
+    if Y.ndim == 1:
+        Y = Y[:, None]
+    n, k  = Y.shape
+    slope, intercept = fit_trends(x, Y)
+    center = predict_trends(slope, intercept, x_new, floor=None)
+
+    probs = np.array([p for lv in levels for p in ((1 - lv) / 2, (1 + lv) / 2)])
+    q = np.full((len(probs), len(x_new), k), np.nan)
+    rng = np.random.default_rng(seed)
+    step = max(1, max_elems // (n_boot * max(n, len(x_new))))
+    for j in range(0, k, step):
+        sl = slice(j, j + step)
+        paths = center[None, :, sl] + _bootstrap_deltas(x, Y[:, sl], slope[sl], intercept[sl],
+                                                          x_new, n_boot, block, rng)
+        if floor is not None:
+            paths = np.maximum(paths, floor)
+        with np.errstate(invalid="ignore"):
+            q[:, :, sl] = np.quantile(paths, probs, axis=0)
+
+    if floor is not None:
+        center = np.maximum(center, floor)
+    bands = {lv: (q[2 * i], q[2 * i + 1]) for i, lv in enumerate(levels)}
+    return center, bands
+
+
+def _bootstrap_deltas(x, Y, slope, intercept, x_new, n_boot, block, rng):
+    """(B, m, k): desvío de cada réplica respecto de la recta central en x_new."""
+    n, k  = Y.shape
+    mask  = ~np.isnan(Y)
+    n_k   = mask.sum(axis=0)
+    resid = np.where(mask, Y - (intercept[None, :] + x[:, None] * slope[None, :]), np.nan)
+
+    # Residuos válidos compactados al inicio de cada columna, centrados y
+    # reescalados por √(n/(n-2)) (los residuos de MCO subestiman la varianza)
+    order = np.argsort(~mask, axis=0, kind="stable")
+    valid = np.arange(n)[:, None] < n_k[None, :]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        R  = np.take_along_axis(resid, order, axis=0) * np.sqrt(n_k / np.maximum(n_k - 2, 1))
+        R -= np.nanmean(np.where(valid, R, np.nan), axis=0)
+    R = np.where(valid, R, 0.0)
+    xc  = x - x.mean()
+    xcs = np.where(valid, xc[order], 0.0)                      # x de cada residuo compactado
+
+    # Posiciones remuestreadas en bloques móviles: (B, n, k), dentro de [0, n_k)
+    L   = max(int(block), 1)
+    nb  = -(-n // L)
+    top = np.maximum(n_k - L + 1, 1)
+    start = np.floor(rng.random((n_boot, nb, k)) * top).astype(int)
+    pos = (start[:, :, None, :] + np.arange(L)[None, None, :, None]).reshape(n_boot, nb * L, k)[:, :n]
+    pos = np.minimum(pos, np.maximum(n_k - 1, 0))
+    E = np.take_along_axis(R[None], pos, axis=1) * valid[None]
+
+    # Reajuste cerrado: la recta de (ŷ + e*) es la central más la recta de e*
+    sx, sxx = xcs.sum(axis=0), (xcs * xcs).sum(axis=0)
+    se  = E.sum(axis=1)
+    sxe = np.einsum("bnk,nk->bk", E, xcs)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        den    = n_k * sxx - sx * sx
+        dslope = np.where(den > 0, (n_k * sxe - sx * se) / den, np.nan)
+        dint   = (se - dslope * sx) / n_k
+
+    # Ruido de predicción: un residuo remuestreado por año futuro
+    fut = np.floor(rng.random((n_boot, len(x_new), k)) * np.maximum(n_k, 1)).astype(int)
+    eps = np.take_along_axis(R[None], fut, axis=1)
+    return dint[:, None, :] + dslope[:, None, :] * (x_new - x.mean())[None, :, None] + eps
@@ -0,0 +1,251 @@
+"""
+======================================================
+ WARMUP — Calentamiento de cachés en segundo plano
+ Cada versión del dataset precalcula, en un pool de
+ hilos, lo que pide la primera visita: proyecciones,
+ figuras con los filtros por defecto y descargas.
+======================================================
+
+    python serve.py                        # streamlit run dashboard.py, calentando desde el arranque
+    curl -f localhost:8501/app/static/ready.json     # 404 hasta que las cachés estén calientes
+
+process_watcher() es el DatasetWatcher único del proceso (dataset, cubo,
+caché de figuras). Tras la primera carga y tras cada recarga
+del CSV, Warmup.start(snapshot) encola por prioridad:
+
+    1. bandas de predicción y backtesting de pronósticos del capítulo 5
+    2. figuras de los seis capítulos con los filtros por defecto (y el
+       escenario Monte Carlo con los supuestos por defecto)
+    3. fig2c para cada año del selector, fig3a por medio, fig5d por serie
+    4. dataset completo y filtrado en cada formato de descarga
+
+Las figuras entran en la FigureCache del snapshot con las mismas claves
+que show_chart en dashboard.py, así que la primera sesión sólo acierta.
+Un snapshot nuevo cancela lo pendiente del anterior.
+
+Disponibilidad: al terminar se escribe READY_PATH (por defecto
+static/ready.json, servido en app/static/ready.json) con la versión y los
+tiempos. Un health check que exija 200 en esa URL sólo enruta tráfico a
+réplicas calientes; mientras se recalienta una versión nueva el archivo
+anterior se conserva, porque la versión vieja sigue sirviendo.
+
+    AD_READY_FILE        ruta del archivo de disponibilidad
+    AD_WARMUP_WORKERS    hilos del pool (por defecto 2)
+"""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import charts
+import content
+from assets import STATIC_DIR
+from downsample import render_options
+from engine import (
+    INTERNET, MEDIOS, PROJ_COLS, describe_media, internet_tv_correlation,
+    projection_intervals, year_range,
+)
+from exports import FORMATS, content_hash, export_bytes
+from figcache import FigureCache
+from forecast import MODEL_LABELS, forecast_frame
+from markets import DEFAULT_MARKET, load_markets
+from scenario import default_assumptions, simulate
+from telemetry import count, gauge, span
+from watcher import DatasetWatcher
+
+READY_PATH      = os.environ.get("AD_READY_FILE") or os.path.join(STATIC_DIR, "ready.json")
+WARMUP_WORKERS  = int(os.environ.get("AD_WARMUP_WORKERS") or 2)
+DEFAULT_RENDER  = "Auto"
+
+# Artefactos de cada versión del dataset (ver watcher.py)
+ARTIFACTS = {
+    # Mercados precalculados (Colombia + markets_long.csv) y un cubo de sumas
+    # acumuladas para todos: rangos, medias, shares y cortes sin recorrer df_hist
+    "markets": load_markets,
+    # Figuras ya construidas, compartidas por todas las sesiones del proceso
+    "figures": lambda df_hist, df_full: FigureCache(maxsize=256),
+    # El backtesting de pronósticos no va aquí: bloquearía la carga. Lo calcula
+    # el trabajo "forecasts" de jobs() en segundo plano (y queda en .cache/)
+}
+
+
+# ─────────────────────────────────────────
+# TRABAJOS DE UN SNAPSHOT
+# ─────────────────────────────────────────
+def jobs(snap, market=DEFAULT_MARKET, yr=None):
+    """[(nombre, fn)] en orden de prioridad; las figuras replican las claves de dashboard.py.
+
+    yr=None: el valor inicial del slider "Rango de años", todos los años del mercado.
+    """
+    markets = snap.artifacts["markets"]
+    figs, cube = snap.artifacts["figures"], markets.cube
+    df_hist, df_full = markets.get(market)
+    yr = yr or (int(df_hist["AÑO"].min()), int(df_hist["AÑO"].max()))
+    df_v = year_range(df_hist, yr)
+    webgl, full_opts, half_opts = render_options(DEFAULT_RENDER, len(df_hist))
+    proj_slice = df_full[df_full["PROYECCION"] == True]
+    future = proj_slice["AÑO"]
+    medios = [m for m in MEDIOS if m in df_v.columns]
+    df_stat = df_v[MEDIOS].dropna()
+
+    def fig(name, key, build):
+        return f"figure.{name}", lambda: figs.get(name, (market, key), build)
+
+    def bands():
+        return projection_intervals(df_hist, future_idx=future) if len(proj_slice) else None
+
+    def fc():
+        return forecast_frame(df_hist, future_idx=future)
+
+    corr, corr_window = markets.correlations, next(iter(content.CORR_WINDOWS))     # "Toda la muestra"
+    corr_rng = (int(df_hist["AÑO"].min()), int(df_hist["AÑO"].max()))
+
+    assumptions = default_assumptions(df_hist)
+    sc_key = (tuple(sorted(assumptions.items())), webgl)
+
+    def sc():
+        return simulate(df_hist, assumptions, future_idx=future)
+
+    out = []
+    if len(proj_slice):
+        out += [("projection_intervals", bands), ("forecasts", fc)]
+    if medios:
+        out.append(fig("fig1a", (yr, tuple(medios), webgl), lambda: charts.fig_history_area(df_v, medios, **full_opts)))
+    out += [
+        fig("fig1b", (yr, webgl), lambda: charts.fig_market_lines(df_v, **full_opts)),
+        fig("fig2a", (yr, webgl), lambda: charts.fig_share_normalized(cube.normalized_shares(yr, market=market), **half_opts)),
+        fig("fig2b", (yr, webgl), lambda: charts.fig_share_duel(df_v, **half_opts)),
+        fig("fig3b", yr, lambda: charts.fig_boxplot(describe_media(df_stat, MEDIOS), df_stat)),
+        fig("fig3c", yr, lambda: charts.fig_means(cube.means_table(yr, market=market))),
+        fig("fig4a", yr, lambda: charts.fig_yoy(df_v.dropna(subset=["VAR_YOY"]))),
+        fig("fig4b", yr, lambda: charts.fig_tv_waterfall(cube.period_slice(yr).tolist(), cube.increments(yr, market=market).tolist())),
+        fig("fig5c", (), lambda: charts.fig_correlation(*internet_tv_correlation(df_hist)[:3])),
+        fig("fig5g", (corr_window, 0), lambda: charts.fig_corr_matrix(corr.matrix(corr_rng, 0, market), corr_rng)),
+        fig("fig5h", (corr_window, 0, INTERNET), lambda: charts.fig_corr_rolling(corr.rolling(None, INTERNET, 0, market), INTERNET)),
+        fig("fig6", (), lambda: charts.fig_pib(df_hist.dropna(subset=["PIB_PCT"]), market)),
+    ]
+    if len(proj_slice):
+        out += [
+            fig("fig5a", (webgl,), lambda: charts.fig_projection_total(df_hist, proj_slice, bands=bands(), **full_opts)),
+            fig("fig5b", (webgl,), lambda: charts.fig_projection_series(df_hist, proj_slice, bands=bands(), **full_opts)),
+            fig("fig5e", sc_key, lambda: charts.fig_scenario_total(df_hist, sc(), **full_opts)),
+            fig("fig5f", sc_key, lambda: charts.fig_scenario_shares(df_hist, sc(), **full_opts)),
+        ]
+
+    # Especulativas: lo que un solo clic de widget pide después
+    for year in sorted(df_v["AÑO"].unique().tolist()):
+        snap_data = cube.snapshot(year, market=market)
+        if snap_data is not None:
+            out.append(fig("fig2c", year, lambda d=snap_data, y=year: charts.fig_snapshot(d, y)))
+    for var in MEDIOS:
+        out.append(fig("fig3a", (yr, var), lambda v=var: charts.fig_histogram(df_stat, v)))
+    if len(proj_slice):
+        for col in PROJ_COLS:
+            out.append(fig("fig5d", (col, webgl), lambda c=col: charts.fig_forecast_models(
+                df_hist, fc().forecasts, c, fc().best[c], MODEL_LABELS, **full_opts)))
+
+    for df in (df_full, df_v):
+        digest = content_hash(df)
+        for fmt in FORMATS:
+            out.append((f"export.{fmt}", lambda d=df, f=fmt, h=digest: export_bytes(d, f, h)))
+    return out
+
+
+# ─────────────────────────────────────────
+# POOL DE CALENTAMIENTO
+# ─────────────────────────────────────────
+class Warmup:
+    def __init__(self, workers=WARMUP_WORKERS, ready_path=READY_PATH):
+        self.ready_path = ready_path
+        self._pool  = ThreadPoolExecutor(workers, thread_name_prefix="warmup")
+        self._lock  = threading.Lock()
+        self._gen   = 0
+        self._state = {"version": None, "total": 0, "done": 0, "failed": 0,
+                       "started": None, "seconds": None, "ready_version": None}
+
+    @property
+    def ready(self):
+        return self._state["ready_version"] is not None
+
+    def status(self):
+        with self._lock:
+            return {**self._state, "ready": self.ready}
+
+    def start(self, snap):
+        """Encola los trabajos de `snap`; descarta lo pendiente de un snapshot anterior."""
+        with span("warmup.plan"):
+            todo = jobs(snap)
+        with self._lock:
+            self._gen += 1
+            gen = self._gen
+            self._state.update(version=snap.version, total=len(todo), done=0, failed=0,
+                               started=time.perf_counter(), seconds=None)
+        for name, fn in todo:
+            self._pool.submit(self._run, gen, name, fn)
+
+    def _run(self, gen, name, fn):
+        if gen != self._gen:                 # llegó otra versión: no vale la pena
+            return
+        try:
+            with span(f"warmup.{name}"):
+                fn()
+            failed = 0
+        except Exception:
+            count("warmup_errors", job=name)
+            failed = 1
+        with self._lock:
+            if gen != self._gen:
+                return
+            self._state["done"] += 1 - failed
+            self._state["failed"] += failed
+            finished = self._state["done"] + self._state["failed"] == self._state["total"]
+            if finished:
+                self._state["seconds"] = time.perf_counter() - self._state["started"]
+                self._state["ready_version"] = self._state["version"]
+                status = dict(self._state)
+        if finished:
+            gauge("warmup_seconds", status["seconds"])
+            self._write_ready(status)
+
+    def _write_ready(self, status):
+        """JSON de disponibilidad, atómico y legible por otros usuarios (umask, no mkstemp).
+
+        Sin disco escribible sólo queda status().
+        """
+        body = {"ready": True, "version": status["version"], "jobs": status["total"],
+                "failed": status["failed"], "seconds": round(status["seconds"], 3),
+                "at": time.time()}
+        try:
+            directory = os.path.dirname(self.ready_path)
+            os.makedirs(directory, exist_ok=True)
+            tmp = f"{self.ready_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(body, f)
+            os.replace(tmp, self.ready_path)
+        except OSError:
+            count("warmup_ready_write_errors")
+
+    def clear_ready(self):
+        try:
+            os.remove(self.ready_path)
+        except FileNotFoundError:
+            pass
+
+
+WARMUP = Warmup()
+
+_watcher = None
+_lock    = threading.Lock()
+
+
+def process_watcher():
+    """DatasetWatcher del proceso, creado en el primer uso con el calentamiento enganchado."""
+    global _watcher
+    if _watcher is None:
+        with _lock:
+            if _watcher is None:
+                WARMUP.clear_ready()         # un ready.json de un proceso anterior no cuenta
+                _watcher = DatasetWatcher(artifacts=ARTIFACTS, on_load=WARMUP.start).start()
+    return _watcher
@@ -0,0 +1,137 @@
+"""
+======================================================
+ WATCHER — Recarga en caliente de la fuente de datos
+ Vigila mtime/tamaño del CSV, confirma el cambio por
+ hash de contenido y reconstruye en segundo plano.
+======================================================
+
+    watcher = DatasetWatcher(artifacts={"cube": lambda h, f: MediaCube.from_frame(h)})
+    watcher.start()                       # hilo de sondeo (daemon)
+    snap = watcher.current()              # una vez por rerun
+    snap.version, snap.df_hist, snap.df_full, snap.artifacts["cube"]
+
+Cada Snapshot es inmutable y completo: dataset y artefactos derivados
+(cubo, caché de figuras …) se construyen antes del intercambio, que es
+una sola asignación de referencia. Las sesiones en curso terminan su
+rerun con el snapshot que tomaron y nunca esperan la reconstrucción.
+
+Un archivo a medio copiar no dispara nada: el cambio de (mtime, tamaño)
+debe repetirse en dos sondeos seguidos. Si sólo cambió el mtime (touch,
+checkout idéntico) el hash coincide y no se reconstruye. Los datos de
+cada versión quedan en la caché mmap de store.py, así que reiniciar el
+servidor no obliga a reconstruir.
+
+on_load(snapshot) se llama tras la primera carga y tras cada intercambio
+(ver warmup.py, que calienta las cachés del snapshot nuevo en segundo
+plano); sus errores no afectan al snapshot publicado.
+"""
+
+import os
+import threading
+import time
+from typing import NamedTuple
+
+import pandas as pd
+
+import store
+from engine import DATA_PATH
+from telemetry import count, span
+
+
+class Snapshot(NamedTuple):
+    version: str            # digest de los bytes cargados (store.load_shared)
+    df_hist: pd.DataFrame
+    df_full: pd.DataFrame
+    artifacts: dict         # nombre → objeto derivado de esta versión
+    loaded_at: float
+
+
+class DatasetWatcher:
+    def __init__(self, path=DATA_PATH, cache_dir=store.CACHE_DIR, artifacts=None, interval=2.0,
+                 on_load=None):
+        self.path       = path
+        self.cache_dir  = cache_dir
+        self.interval   = interval
+        self.last_error = None
+        self._artifacts = dict(artifacts or {})
+        self._on_load   = on_load
+        self._stat      = self._file_stat()
+        self._pending   = None
+        self._building  = threading.Lock()
+        self._thread    = None
+        self._stop      = threading.Event()
+        self._current   = self._load()                           # primera carga, bloqueante
+        self._notify(self._current)
+
+    def current(self):
+        return self._current
+
+    # ── construcción ──
+    def _file_stat(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _load(self):
+        """Snapshot con la versión de los bytes que se cargaron, no la de un hash previo."""
+        version, df_hist, df_full = store.load_shared(self.path, self.cache_dir)
+        artifacts = {name: build(df_hist, df_full) for name, build in self._artifacts.items()}
+        return Snapshot(version, df_hist, df_full, artifacts, time.time())
+
+    def _notify(self, snap):
+        if self._on_load is not None:
+            try:
+                self._on_load(snap)
+            except Exception:
+                count("dataset_on_load_errors")
+
+    def _rebuild(self, stat):
+        try:
+            if store.source_hash(self.path) != self._current.version:
+                with span("reload.build"):
+                    snap = self._load()
+                if snap.version != self._current.version:     # pudo volver al contenido anterior
+                    self._current = snap                       # intercambio atómico
+                    count("dataset_reloads")
+                    self._notify(snap)
+            self.last_error = None
+        except Exception as e:                        # CSV inválido: se sigue sirviendo la versión anterior
+            self.last_error = e
+            count("dataset_reload_errors")
+        finally:
+            self._stat = stat                         # no reintentar hasta el próximo cambio
+            self._building.release()
+
+    # ── sondeo ──
+    def poll(self, wait=False):
+        """Revisa la fuente; si cambió y está estable, reconstruye en un hilo. True si lo lanzó."""
+        stat = self._file_stat()
+        if stat == self._stat:
+            self._pending = None
+            return False
+        if stat != self._pending:                     # esperar un sondeo estable
+            self._pending = stat
+            return False
+        if not self._building.acquire(blocking=False):
+            return False
+        self._pending = None
+        worker = threading.Thread(target=self._rebuild, args=(stat,), name="dataset-rebuild", daemon=True)
+        worker.start()
+        if wait:
+            worker.join()
+        return True
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="dataset-watcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.poll()